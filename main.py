@@ -9,6 +9,7 @@ Streamlit 산·등산로 개인화 추천 시스템 (멀티페이지)
 """
 
 import streamlit as st
+from utils.perf import timed
 
 # =============================================================================
 # 앱 전체 설정
@@ -93,6 +94,7 @@ with st.sidebar:
     st.caption("© 2025 내일배움캠프 여행갈4람")
 
 # =============================================================================
-# 페이지 실행
+# 페이지 실행 (페이지 전체 재실행 시간 측정, 프래그먼트 재실행은 별도 라벨로 기록됨)
 # =============================================================================
-pg.run()
+with timed(f"page:{pg.title}"):
+    pg.run()
@@ -1,10 +1,12 @@
 import streamlit as st
 import pandas as pd
 import os
+from functools import partial
 import gpxpy
 import folium
 from streamlit_folium import st_folium
 from utils.trail_detail import show_trail_detail #-------------------------‼️‼️‼️‼️‼️‼️‼️‼️‼️‼️‼️‼️‼️‼️‼️‼️‼️‼️
+from utils.trail_facets import TrailFacetIndex
 
 # -----------------------------------------------------------------------------
 # 0. 데이터 로드 및 초기 설정 (기존과 동일하되 Cluster 컬럼 처리 확인)
@@ -45,6 +47,9 @@ def load_mountain_path():
         for col in str_cols:
             if col in df.columns:
                 df[col] = df[col].fillna("-")
+        
+        # 결과 테이블 정렬 기준(매력도 내림차순)으로 미리 정렬해 두면 재실행마다 정렬할 필요가 없음
+        df = df.sort_values('매력종합점수', ascending=False, kind='stable').reset_index(drop=True)
             
         return df
         
@@ -76,6 +81,13 @@ st.header("🔍 맞춤 등산로 조회")
 
 difficulty_levels = ['입문', '초급', '중급', '상급', '최상급', '초인', '신']
 
+# 패싯 인덱스는 데이터가 바뀌지 않는 한 한 번만 생성
+@st.cache_resource
+def load_facet_index(df):
+    return TrailFacetIndex(df, difficulty_levels)
+
+facet_index = load_facet_index(df)
+
 # -----------------------------------------------------------------------------
 # [변경] 클러스터 매핑 정의 ("전체 보기" 제거, 순수 데이터만 남김)
 # -----------------------------------------------------------------------------
@@ -125,8 +137,29 @@ def set_search_condition():
     # elif target_cluster == 5: # 오지/숨은명소
     #     st.session_state['infra_slider'] = (0.0, 4.0) # 인프라 적은 곳
 
+def get_selected_levels(diff_range):
+    start_idx = difficulty_levels.index(diff_range[0])
+    end_idx = difficulty_levels.index(diff_range[1])
+    return difficulty_levels[start_idx : end_idx + 1]
+
+# -----------------------------------------------------------------------------
+# 3. 패싯 카운트 (현재 세션 선택값 기준, 위젯 라벨에 실시간 개수 표시)
+# -----------------------------------------------------------------------------
+facets = facet_index.facet_counts(
+    get_selected_levels(st.session_state['diff_slider']),
+    st.session_state['infra_slider'],
+    st.session_state['park_dist_slider'],
+    cluster=cluster_map.get(st.session_state.get('type_selection')),
+)
+
+def format_cluster_option(option):
+    return f"{option} ({facets['cluster'].get(cluster_map[option], 0)})"
+
+def format_difficulty_option(level):
+    return f"{level} ({facets['difficulty'].get(level, 0)})"
+
 # -----------------------------------------------------------------------------
-# 3. UI 구성
+# 4. UI 구성
 # -----------------------------------------------------------------------------
 st.markdown("##### 선호하는 등산 테마를 선택해주세요")
 
@@ -137,6 +170,7 @@ st.pills(
     key="type_selection",
     on_change=set_search_condition,
     default=None,
+    format_func=format_cluster_option,
     help="사용자의 정성적 경험(리뷰 텍스트)과 정량적 환경 지표(관광 인프라, 주차장 거리)를 분석하여 도출한 5가지 테마입니다."
 )
 
@@ -152,6 +186,7 @@ with col1:
         options=difficulty_levels,
         value=st.session_state['diff_slider'],
         key="diff_slider" ,
+        format_func=format_difficulty_option,
         help="""거리와 누적 상승 고도를 기반으로 산출한 점수에 경사도 가중치를 적용했습니다.
         ※ 같은 등급 내에서는 숫자가 클수록 더 어렵습니다. (예: 초급1 < 초급3)
 
@@ -172,6 +207,12 @@ with col2:
         key="infra_slider",
         help="등산로 반경 5km 내의 식당, 카페, 숙소, 관광지 수를 집계한 점수입니다.\n\n거리가 가까울수록 높은 가중치(1km 이내: 1.0, 3km 이내: 0.8, 5km 이내: 0.5)를 부여하고, 로그(ln) 함수를 적용하여 0~10점 척도로 환산했습니다."
     )
+    # 점수 구간별 코스 수 (인프라 조건을 제외한 나머지 조건 기준)
+    st.bar_chart(
+        pd.Series(facets['infra'], name="코스 수").rename(lambda b: f"{b}~{b + 1}"),
+        height=90,
+        color="#759a4c",
+    )
 
 with col3:
     park_dist_val = st.slider(
@@ -184,52 +225,74 @@ with col3:
     )
 
 # -----------------------------------------------------------------------------
-# 4. 데이터 필터링 [핵심 변경 구간]
+# 5. 데이터 필터링 (패싯 인덱스 마스크 사용)
 # -----------------------------------------------------------------------------
 try:
-    # 1) 공통 필터 조건
-    start_idx = difficulty_levels.index(diff_val[0])
-    end_idx = difficulty_levels.index(diff_val[1])
-    selected_levels = difficulty_levels[start_idx : end_idx + 1]
-
-    common_condition = (
-        (df['난이도'].isin(selected_levels)) &
-        (df['관광인프라점수'] >= infra_val[0]) & (df['관광인프라점수'] <= infra_val[1]) &
-        (df['주차장거리_m'] != -1) &            # [변경] -1(데이터 없음)인 경우만 제외
-        (df['주차장거리_m'] <= park_dist_val)   # 0m(바로 앞)인 경우는 여기에 포함되어 살아남음
-    )
-
-    # 2) 테마(Cluster) 필터링 로직
     current_selection = st.session_state.get('type_selection')
-    
-    if current_selection is None:
-        filtered_df = df[common_condition]
-    else:
-        target_cluster_id = cluster_map.get(current_selection)
-        filtered_df = df[
-            (df['Cluster'] == target_cluster_id) & 
-            common_condition
-        ]
+
+    filter_mask = facet_index.mask(
+        get_selected_levels(diff_val),
+        infra_val,
+        park_dist_val,                          # 주차장거리 -1(데이터 없음)은 자동 제외
+        cluster=cluster_map.get(current_selection),
+    )
+    filtered_df = df[filter_mask]
         
 except Exception as e:
     st.error(f"필터링 오류 발생: {e}")
     filtered_df = pd.DataFrame()
 
 # -----------------------------------------------------------------------------
-# 5. 결과 출력
+# 6. 결과 출력
 # -----------------------------------------------------------------------------
 st.write(f"검색 결과: **{len(filtered_df)}**개의 코스를 찾았습니다.")
 
 display_cols = ['코스명', '위치', '총거리_km', '최고고도_m', '세부난이도', '관광인프라점수', '매력종합점수', '주차장거리_m']
 
+PAGE_SIZE_OPTIONS = [20, 50, 100]
+
+if 'trail_page' not in st.session_state:
+    st.session_state.trail_page = 1
+if 'selected_trail_id' not in st.session_state:
+    st.session_state.selected_trail_id = None
+
+def on_trail_select(table_key, page_ids):
+    """테이블 선택(페이지 내 위치)을 고유 코스명(ID)으로 변환해 저장"""
+    rows = st.session_state[table_key]['selection']['rows']
+    st.session_state.selected_trail_id = page_ids[rows[0]] if rows else None
+
 if not filtered_df.empty:
-    sorted_df = filtered_df.sort_values('매력종합점수', ascending=False)
-    
-    event = st.dataframe(
-        sorted_df[display_cols],
+    # df는 로드 시 매력종합점수 순으로 정렬되어 있으므로 필터 결과도 정렬 상태 유지
+    sorted_df = filtered_df
+
+    # 현재 페이지 구간만 프론트엔드로 전송
+    page_col, size_col = st.columns([4, 1])
+    with size_col:
+        page_size = st.selectbox("페이지당 코스 수", PAGE_SIZE_OPTIONS, key="trail_page_size")
+    total_pages = max(1, -(-len(sorted_df) // page_size))
+    if st.session_state.trail_page > total_pages:
+        st.session_state.trail_page = total_pages
+    with page_col:
+        page = st.number_input(
+            f"페이지 (총 {total_pages}쪽)",
+            min_value=1, max_value=total_pages,
+            step=1,
+            key="trail_page",
+        )
+
+    start = (page - 1) * page_size
+    page_df = sorted_df.iloc[start : start + page_size]
+    page_ids = page_df['코스명'].tolist()
+
+    # 페이지·필터 결과가 바뀌면 테이블 선택 상태도 새로 시작
+    table_key = f"trail_table_{page}_{page_size}_{hash(tuple(page_ids))}"
+
+    st.dataframe(
+        page_df[display_cols],
+        key=table_key,
         hide_index=True,
         width='stretch',
-        on_select="rerun",
+        on_select=partial(on_trail_select, table_key, page_ids),
         selection_mode="single-row",
         column_config={
             "관광인프라점수": st.column_config.ProgressColumn("인프라", format="%.1f", min_value=0, max_value=10),
@@ -241,14 +304,17 @@ if not filtered_df.empty:
     )
 
     # -------------------------------------------------------------------------
-    # 6. 선택된 코스 상세 정보 & 지도 & 인프라
+    # 7. 선택된 코스 상세 정보 & 지도 & 인프라
     # -------------------------------------------------------------------------
-    if len(event.selection.rows) > 0:
+    # 선택은 코스명(고유 ID)으로 추적하므로 페이지를 넘겨도 유지됨
+    selected_id = st.session_state.selected_trail_id
+    selected_rows = sorted_df[sorted_df['코스명'] == selected_id] if selected_id else sorted_df.iloc[0:0]
+
+    if not selected_rows.empty:
         st.divider()
         
         # 1) 선택된 등산로 데이터 가져오기
-        selected_index = event.selection.rows[0]
-        selected_row = sorted_df.iloc[selected_index]
+        selected_row = selected_rows.iloc[0]
         
         show_trail_detail(selected_row, df_infra)
 
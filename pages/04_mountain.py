@@ -3,16 +3,18 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from pathlib import Path
-import json
 import os
-import numpy as np
-from PIL import Image
-from wordcloud import WordCloud
-import plotly.express as px
-import platform
-import folium
 from streamlit_folium import st_folium
 from utils.trail_detail import show_trail_detail
+from utils.perf import timed
+from utils.geo import NearestPointIndex
+from utils.mountain_map import MAP_ZOOM_START, build_highlight_layer, map_for_render
+from utils.mountain_map import build_base_map as build_mountain_base_map
+from utils.wordcloud_cache import get_wordcloud_image
+from utils.image_variants import get_image_variant
+from utils.keywords import load_keyword_index
+from utils.search import MountainSearchIndex
+from utils.trail_context import data_version
 
 
 # -------------------------
@@ -101,110 +103,34 @@ def load_infra_data():
     except Exception:
         return pd.DataFrame()
 
-@st.cache_data
-def load_mountain_keywords():
-    """산별 키워드 JSON 로드"""
-    try:
-        json_path = (Path(__file__).resolve().parent.parent / "data" / "mountain_keywords.json").resolve()
-        
-        if not json_path.exists():
-            return {}
-        
-        if json_path.stat().st_size == 0:
-            return {}
-        
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        if not data:
-            return {}
-            
-        return data
-        
-    except json.JSONDecodeError as e:
-        return {}
-    except Exception as e:
-        return {}
-
-@st.cache_data
-def load_mask_image():
-    """워드클라우드 마스크 이미지 로드"""
-    mask_path = (Path(__file__).resolve().parent.parent / "images" / "mountain_mask_back.png").resolve()
-    return np.array(Image.open(mask_path).convert("RGB"))
-
 df_m = load_mountain_csv()
 df_trails = load_trail_data()
 df_infra = load_infra_data()
-keywords_dict = load_mountain_keywords()
-mask_img = load_mask_image()
+keyword_index = load_keyword_index()
+
+@st.cache_resource
+def build_search_index(_df_m, _df_trails, data_version):
+    """산 이름·영문명·코스명·위치 검색 인덱스 (초성/로마자/오타 허용)"""
+    return MountainSearchIndex(_df_m, _df_trails)
+
+# 데이터 파일 내용 기준 버전 (행 수가 같아도 내용이 바뀌면 다시 생성)
+search_index = build_search_index(df_m, df_trails, data_version())
 
 # -------------------------
-# 워드클라우드 생성 함수
+# 워드클라우드 (사전 생성 캐시 사용)
 # -------------------------
 def generate_wordcloud(mountain_name, top_n=65):
-    """선택된 산의 워드클라우드 생성"""
-    if mountain_name not in keywords_dict:
+    """선택된 산의 워드클라우드 이미지(WebP 바이트) 반환"""
+    if mountain_name not in keyword_index:
         return None
     
-    freq = keywords_dict[mountain_name]
-    if not freq:
-        return None
-    
-    freq_top = dict(sorted(freq.items(), key=lambda x: x[1], reverse=True)[:top_n])
-    
-    # -----------------------------------------------------------
-    # [수정] 변수명을 font_path로 통일했습니다.
-    # -----------------------------------------------------------
-    if platform.system() == 'Windows':
-        font_path = 'C:/Windows/Fonts/malgun.ttf'
-    
-    elif platform.system() == 'Darwin': # Mac
-        font_path = "/System/Library/Fonts/AppleSDGothicNeo.ttc"
-    
-    else: # Linux (Streamlit Cloud)
-        # packages.txt에 fonts-nanum을 적었다면 이 경로에 설치됩니다.
-        font_path = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
-
-    # 폰트가 없는 경우를 대비한 체크
-    if not os.path.exists(font_path):
-        # 폰트가 없으면 에러 로그를 남기고 기본 폰트(깨질 수 있음)라도 시도하거나 None 반환
-        print(f"⚠️ 폰트 경로를 찾을 수 없음: {font_path}")
-        # 리눅스라면 여기서 return None을 해서 앱이 죽는 걸 방지하는 게 좋습니다.
-        if platform.system() != 'Windows' and platform.system() != 'Darwin':
-             return None 
-
     try:
-        wc = WordCloud(
-            font_path=font_path,  # 👈 여기가 'path'가 아니라 'font_path'여야 합니다!
-            background_color="#ffffff",
-            mask=mask_img,
-            width=1000,
-            height=800,
-            max_words=top_n,
-            prefer_horizontal=0.9,
-            collocations=False,
-            colormap='gist_earth',
-            relative_scaling=0.5,
-            min_font_size=12
-        ).generate_from_frequencies(freq_top)
-        
-        img = wc.to_array()
-        
-        fig = px.imshow(img)
-        fig.update_layout(
-            margin=dict(l=0, r=0, t=0, b=0),
-            xaxis=dict(visible=False),
-            yaxis=dict(visible=False),
-            height=400
-        )
-        fig.update_xaxes(showticklabels=False)
-        fig.update_yaxes(showticklabels=False)
-        
-        return fig
-
+        # 인덱스에 빈도순으로 미리 정렬된 상위 키워드 사용
+        return get_wordcloud_image(mountain_name, keyword_index.top_items(mountain_name, top_n), top_n)
     except Exception as e:
         st.error(f"워드클라우드 생성 중 오류: {e}")
         return None
+
 # -------------------------
 # 세션 상태 초기화
 # -------------------------
@@ -264,6 +190,38 @@ new_selection = st.selectbox(
     label_visibility="collapsed"
 )
 
+# 빠른 검색 (초성 "ㅂㅎㅅ", 로마자 "bukhan", 오타 "붇한산", 코스명·지역명)
+search_query = st.text_input(
+    "산 검색",
+    placeholder="🔍 산 이름·초성·영문·지역으로 검색 (예: ㅅㅇㅅ, jiri, 홍천)",
+    label_visibility="collapsed",
+    key="mountain_search_query",
+)
+def on_search_pick(pills_key):
+    """검색 결과 선택 시 산 변경 (변경될 때만 호출되므로 이후 드롭다운/지도 선택을 덮어쓰지 않음)"""
+    picked = st.session_state.get(pills_key)
+    if picked and picked != st.session_state.selected_mountain:
+        st.session_state.selected_mountain = picked
+        st.session_state.view_mode = None
+        st.session_state.selected_course = None
+        st.session_state.selected_trail_data = None
+
+if search_query.strip():
+    search_results = search_index.search_mountains(search_query, limit=8)
+    if search_results:
+        pills_key = f"mountain_search_pick_{search_query.strip()}"
+        st.pills(
+            "검색 결과",
+            search_results,
+            selection_mode="single",
+            label_visibility="collapsed",
+            key=pills_key,
+            on_change=on_search_pick,
+            args=(pills_key,),
+        )
+    else:
+        st.caption("검색 결과가 없습니다.")
+
 # 드롭다운 선택 변경 감지
 if new_selection == "선택 안 함":
     if st.session_state.selected_mountain is not None:
@@ -285,97 +243,61 @@ st.write("")
 # -------------------------
 # 지도 영역 (folium + 마커)
 # -------------------------
-center_lat = float(df_m["lat"].mean())
-center_lon = float(df_m["lon"].mean())
-
-m = folium.Map(
-    location=[center_lat, center_lon], 
-    zoom_start=7, 
-    control_scale=True,
-    prefer_canvas=True
-)
+CLICK_TOLERANCE_PX = 15  # 마커 클릭으로 인정할 화면상 반경
 
-for _, r in df_m.iterrows():
-    name = r["mountain_name"]
-    lat = float(r["lat"])
-    lon = float(r["lon"])
+@st.cache_data
+def get_map_data_version(df):
+    """지도에 쓰이는 컬럼(이름/좌표) 기준 데이터 버전 해시"""
+    cols = df[["mountain_name", "lat", "lon"]]
+    return str(pd.util.hash_pandas_object(cols, index=False).sum())
+
+@st.cache_resource
+def build_base_map(data_version, _df):
+    """
+    전체 산 CircleMarker가 올라간 기본 지도 (데이터 버전별 1회 생성)
     
-    if name == st.session_state.selected_mountain:
-        folium.Marker(
-            location=[lat, lon],
-            popup=folium.Popup(name, max_width=200),
-            tooltip=folium.Tooltip(name, permanent=False),
-            icon=folium.DivIcon(html=f'''
-                <div style="
-                    position: relative;
-                    width: 20px;
-                    height: 20px;
-                ">
-                    <div style="
-                        position: absolute;
-                        width: 20px;
-                        height: 20px;
-                        background-color: #ff0066;
-                        border-radius: 50%;
-                        animation: pulse 1.5s infinite;
-                    "></div>
-                    <div style="
-                        position: absolute;
-                        width: 20px;
-                        height: 20px;
-                        background-color: #ff0066;
-                        border-radius: 50%;
-                        box-shadow: 0 0 0 0 rgba(255, 0, 102, 1);
-                    "></div>
-                </div>
-                <style>
-                    @keyframes pulse {{
-                        0% {{ transform: scale(1); opacity: 1; }}
-                        50% {{ transform: scale(1.5); opacity: 0.5; }}
-                        100% {{ transform: scale(1); opacity: 1; }}
-                    }}
-                </style>
-            ''')
-        ).add_to(m)
-    else:
-        folium.CircleMarker(
-            location=[lat, lon],
-            radius=6,
-            color="#689634",
-            fill=True,
-            fill_color="#689634",
-            fill_opacity=0.6,
-            weight=2,
-            popup=folium.Popup(name, max_width=200),
-            tooltip=folium.Tooltip(name, permanent=False),
-        ).add_to(m)
-
-# 지도 렌더링
-map_output = st_folium(
-    m, 
-    width="stretch", 
-    height=500,
-    key="mountain_map",
-    returned_objects=["last_object_clicked"]
-)
+    선택된 산 강조 마커는 build_highlight_layer()의 FeatureGroup으로 따로 전달하고,
+    st_folium에는 map_for_render() 복사본을 넘기므로 캐시된 지도는 변경되지 않습니다.
+    """
+    return build_mountain_base_map(_df)
+
+@st.cache_resource
+def build_mountain_point_index(data_version, _df):
+    """지도 클릭 → 최근접 산 검색용 좌표 인덱스 (데이터 버전별 1회 생성)"""
+    return NearestPointIndex(_df["mountain_name"].tolist(), _df["lat"], _df["lon"])
+
+map_data_version = get_map_data_version(df_m)
+m = build_base_map(map_data_version, df_m)
+mountain_point_index = build_mountain_point_index(map_data_version, df_m)
+
+# 지도 렌더링 (기본 지도는 그대로, 강조 레이어만 교체)
+with timed("mountain_map"):
+    map_output = st_folium(
+        map_for_render(m), 
+        width="stretch", 
+        height=500,
+        key="mountain_map",
+        feature_group_to_add=build_highlight_layer(get_selected_row()),
+        # 클릭 허용 반경을 현재 확대 수준으로 환산하려면 zoom도 받아야 함
+        returned_objects=["last_object_clicked", "zoom"],
+        render=False
+    )
 
 # 클릭 이벤트 처리
 if map_output and map_output.get("last_object_clicked"):
     clicked_obj = map_output["last_object_clicked"]
     
     if clicked_obj and "lat" in clicked_obj and "lng" in clicked_obj:
-        clicked_lat = clicked_obj["lat"]
-        clicked_lon = clicked_obj["lng"]
-        
-        distances = []
-        for idx, r in df_m.iterrows():
-            dist = (r["lat"] - clicked_lat) ** 2 + (r["lon"] - clicked_lon) ** 2
-            distances.append((dist, r["mountain_name"]))
-        
-        distances.sort()
-        nearest_mountain = distances[0][1]
+        # 실제 거리(m) 기준 최근접 산, 허용 반경은 현재 확대 수준의 픽셀 단위로 환산
+        hit = mountain_point_index.nearest_within(
+            clicked_obj["lat"],
+            clicked_obj["lng"],
+            zoom=map_output.get("zoom") or MAP_ZOOM_START,
+            tolerance_px=CLICK_TOLERANCE_PX,
+        )
+        nearest_mountain = hit[0] if hit else None
         
-        if nearest_mountain != st.session_state.selected_mountain and distances[0][0] < 1.0:
+        if nearest_mountain and nearest_mountain != st.session_state.selected_mountain:
             st.session_state.selected_mountain = nearest_mountain
             st.session_state.view_mode = None  # ✅ 새로운 산 선택 시 view_mode 초기화
             st.session_state.selected_course = None
@@ -399,6 +321,7 @@ st.write("")
 # -------------------------
 # 산 상세 기본 정보 카드
 # -------------------------
+MOUNTAIN_IMAGE_WIDTH = 480    # wide 레이아웃 반쪽 컬럼의 일반적인 렌더링 폭 (CSS px)
 left, right = st.columns([1, 1], gap="small")
 
 with left:
@@ -434,9 +357,11 @@ with left:
 
 with right:
     image_path = (Path(__file__).resolve().parent.parent / "images" / f"{mountain_name}.jpg").resolve()
+    # 원본 대신 반쪽 컬럼 렌더링 폭에 맞춘 WebP 파생본 사용
+    image_variant = get_image_variant(image_path, display_width=MOUNTAIN_IMAGE_WIDTH)
     
-    if image_path.exists():
-        st.image(str(image_path), width="stretch")
+    if image_variant is not None:
+        st.image(str(image_variant), width="stretch")
     else:
         st.markdown(
             f"""
@@ -545,10 +470,10 @@ if st.session_state.view_mode == "attraction":
         st.plotly_chart(fig, width='stretch')
 
     with c2:
-        wc_fig = generate_wordcloud(st.session_state.selected_mountain)
+        wc_image = generate_wordcloud(st.session_state.selected_mountain)
         
-        if wc_fig:
-            st.plotly_chart(wc_fig, width='stretch')
+        if wc_image:
+            st.image(wc_image, width='stretch')
         else:
             st.markdown(
                 """
@@ -1,9 +1,17 @@
+import logging
 import streamlit as st
 from google import genai
 from google.genai import types
 import pandas as pd
-import json
-import os  # 경로 설정을 위해 추가
+from pathlib import Path
+from utils.chat_history import ChatHistory
+from utils.llm_client import get_backend_name
+from utils.perf import timed, timed_stream
+from utils.prompt_encoding import fit_to_budget
+from utils.retrieval import BM25Retriever, embed_texts, load_embeddings
+from utils.trail_context import data_version, load_trail_context
+
+logger = logging.getLogger(__name__)
 
 # =========================
 # Page config
@@ -61,90 +69,58 @@ st.markdown(
 # =========================
 # 1. 데이터 로드 및 전처리 (경로 수정됨)
 # =========================
+# 현재 파일(chat.py)의 상위 폴더(대시보드)의 data 폴더
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
 @st.cache_resource
-def load_and_process_data():
+def load_and_process_data(version):
     """
-    CSV와 JSON 파일을 읽어서 LLM에게 넘겨줄 텍스트 문자열(Context)로 변환합니다.
+    등산로별 정보 블록(LLM에게 넘겨줄 텍스트)을 만들어 둡니다.
+    질문마다 관련 블록만 골라 넣으므로 전체를 한 프롬프트로 합치지 않습니다.
     pages 폴더 밖의 data 폴더를 참조하도록 경로를 설정합니다.
+
+    version(데이터 파일 내용 해시)이 캐시 키라서 파일이 바뀌면 다시 만듭니다.
     """
+    data_dir = DATA_DIR
     try:
-        # ---------------------------------------------------------
-        # [경로 설정 로직]
-        # 현재 파일(chat.py)의 절대 경로를 구합니다.
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        # 상위 폴더(대시보드)로 이동 후 data 폴더로 들어갑니다.
-        data_dir = os.path.join(current_dir, "..", "data")
-        
-        # 실제 파일 경로 완성
-        path_trails = os.path.join(data_dir, "100mountains_dashboard.csv")
-        path_mountains = os.path.join(data_dir, "mountain.csv")
-        path_keywords = os.path.join(data_dir, "mountain_keywords.json")
-        # ---------------------------------------------------------
-
-        # 데이터 읽기
-        df_trails = pd.read_csv(path_trails)
-        df_mountains = pd.read_csv(path_mountains)
-        
-        with open(path_keywords, "r", encoding="utf-8") as f:
-            keywords_data = json.load(f)
-            
-        # 클러스터 설명 매핑
-        cluster_map = {
-            0: "계절매력(꽃, 단풍, 설경 등)",
-            2: "탁 트인 전망, 사진 명소",
-            3: "가족 동반, 편안한 인프라",
-            4: "숲길, 힐링, 피톤치드",
-            5: "오지, 숨은 명소, 한적함"
-        }
-
-        # LLM에게 주입할 데이터 텍스트 생성
-        context_text = "아래는 네가 참고해야 할 **대한민국 100대 명산 등산로 데이터베이스**야. 이 정보에 기반해서만 답변해.\n\n"
-        
-        # 등산로 정보를 하나씩 텍스트로 변환
-        for _, row in df_trails.iterrows():
-            m_name = row['산이름']
-            c_name = row['코스명']
-            
-            # 산 기본 정보
-            m_info = df_mountains[df_mountains['mountain_name'] == m_name]
-            desc = m_info.iloc[0]['description'] if not m_info.empty else "설명 없음"
-            loc = m_info.iloc[0]['location'] if not m_info.empty else ""
-            
-            # 키워드 정보 (Top 5)
-            m_keywords = keywords_data.get(m_name, {})
-            sorted_keys = sorted(m_keywords, key=m_keywords.get, reverse=True)[:5]
-            keywords_str = ", ".join(sorted_keys)
-            
-            # 클러스터 해석
-            cluster_desc = cluster_map.get(row['Cluster'], "복합 매력")
-
-            # 정보 블록 구성
-            course_info = f"""
-            ================================================================
-            [데이터 ID]: {m_name}_{c_name}
-            [산 이름]: {m_name}   <-- 이 이름을 정확히 확인하세요.
-            [코스명]: {c_name}
-            [위치]: {loc}
-            [특징/테마]: {cluster_desc} (특출매력: {row['특출매력']})
-            [난이도]: {row['난이도']} (세부: {row['세부난이도']})
-            [소요시간]: {row['예상시간']} (왕복/편도 확인 필요, 총거리: {row['총거리_km']}km)
-            [대중교통 접근성 점수]: {row['정류장_접근성점수']}점 (정류장명: {row['정류장명']})
-            [주차 접근성 점수]: {row['주차장_접근성점수']}점 (주차장명: {row['주차장명']})
-            [주요 키워드]: {keywords_str}
-            [산 설명]: {desc}
-            ================================================================
-            """
-            context_text += course_info
-            
-        return context_text
-
+        return load_trail_context(data_dir)
     except Exception as e:
         # 에러 발생 시 화면에 경로와 에러 메시지 출력 (디버깅용)
         st.error(f"데이터 로딩 실패! 경로를 확인해주세요.\n참조하려던 경로: {data_dir}\n에러: {e}")
-        return ""
+        return None
+
+@st.cache_resource
+def build_retriever(_trail_ctx, data_version):
+    """블록 검색기 (오프라인 임베딩이 있으면 함께 사용)"""
+    embeddings = load_embeddings(_trail_ctx.search_texts)
+    return BM25Retriever(
+        _trail_ctx.search_texts,
+        _trail_ctx.features,
+        embeddings=embeddings,
+        groups=_trail_ctx.mountains,
+    )
+
+def current_data_version():
+    """데이터 파일 내용 해시 (파일을 읽지 못하면 None, 오류는 load_and_process_data에서 표시)"""
+    try:
+        return data_version(DATA_DIR)
+    except OSError:
+        return None
+
+# 데이터 로드 실행 (실행마다 파일 내용 해시를 확인해 바뀐 데이터를 반영)
+trail_ctx = load_and_process_data(current_data_version())
+# 블록 수가 아니라 데이터 내용 버전으로 캐시 (내용이 바뀌면 검색 인덱스도 다시 생성)
+retriever = build_retriever(trail_ctx, trail_ctx.version) if trail_ctx else None
 
-# 데이터 로드 실행
-data_context = load_and_process_data()
+# 질문당 프롬프트에 넣을 블록 수 (산 이름이 없으면 한 산에서 최대 3개)
+RETRIEVAL_K = 15
+RETRIEVAL_MAX_PER_MOUNTAIN = 3
+# 질문 하나에 붙일 데이터베이스의 추정 토큰 상한 (넘으면 순위가 낮은 코스부터 제외)
+CONTEXT_TOKEN_BUDGET = 4000
+# 원문으로 다시 보내는 최근 턴 수 (그 이전 턴은 요약으로 접음)
+HISTORY_KEEP_TURNS = 4
+# 화면에 다시 그리는 최근 메시지 수
+DISPLAY_MESSAGES = 30
 
 # =========================
 # Secrets & Client
@@ -157,45 +133,52 @@ def load_gemini_secrets():
     except Exception:
         return None, None
 
+backend_name = get_backend_name()
 api_key, gemini_model = load_gemini_secrets()
 
-if not api_key:
+if backend_name == "stub":
+    # 오프라인 대역 (API 키 불필요)
+    api_key, gemini_model = "stub", "stub"
+elif not api_key:
     st.error("API 키 설정이 필요합니다. .streamlit/secrets.toml 파일을 확인해주세요.")
     st.stop()
 
 @st.cache_resource
-def get_client(_api_key: str):
+def get_client(_api_key: str, backend_name: str = "gemini"):
+    if backend_name == "stub":
+        from utils.llm_stub import StubChatClient
+
+        return StubChatClient()
     return genai.Client(api_key=_api_key)
 
-client = get_client(api_key)
+client = get_client(api_key, backend_name)
 
 # =========================
 # 2. System Instruction 구성
 # =========================
-if data_context: # 데이터가 정상적으로 로드되었을 때만 프롬프트 구성
+if trail_ctx: # 데이터가 정상적으로 로드되었을 때만 프롬프트 구성
     system_prompt = f"""
     너는 '대한민국 100대 명산 등산로 추천 봇'이야.
 
     🚨 **[매우 중요 주의사항]** 🚨
     1. **산 이름 혼동 금지**: '가리산'과 '가리왕산', '덕유산'과 '덕숭산' 같이 이름이 비슷한 산들이 있다.
-    2. 사용자가 '가리산'을 물어봤다면, 반드시 **[산 이름]: 가리산** 이라고 적힌 구역의 정보만 가져와야 한다.
+    2. 사용자가 '가리산'을 물어봤다면, 반드시 '산' 열이 **가리산**인 행의 정보만 가져와야 한다.
     3. 절대로 이름이 비슷한 다른 산의 코스명이나 설명을 섞어서 답변하지 마라.
     4. 답변하기 전에 코스명이 해당 산의 코스가 맞는지 한 번 더 검증해라.
 
-    반드시 아래 제공된 **[데이터베이스]**에 있는 내용에 기반해서 답변해야 해.
+    매 질문 앞에 **[데이터베이스 시작]** ~ **[데이터베이스 끝]** 사이로 질문과 관련된 등산로 정보가 함께 주어진다.
+    데이터베이스는 '산 정보' 표(산마다 한 줄)와 '코스' 표(코스마다 한 줄)로 되어 있고, 두 표는 '산' 열로 연결된다.
+    반드시 그 **[데이터베이스]**와 앞선 대화에 나온 데이터에 기반해서 답변해야 해.
+    오래된 대화는 **[이전 대화 요약]**으로 주어지니, 거기 적힌 선호 조건과 제외한 산을 계속 반영해.
     데이터에 없는 내용은 지어내지 말고 "해당 조건에 맞는 정보가 데이터에 없습니다"라고 말해.
 
     **답변 가이드라인:**
     1. 사용자의 질문에서 조건(난이도, 시간, 이동수단, 테마 등)을 파악해.
     2. [데이터베이스]에서 가장 적합한 코스 1~3개를 찾아서 추천해.
     3. 추천할 때는 **산 이름, 코스명, 추천 이유(키워드/테마 활용), 예상 시간, 난이도**를 명시해.
-    4. '대중교통'을 물어보면 '정류장_접근성점수'가 높거나(8점 이상 등) 정류장명이 명시된 곳을 우선 추천해.
-    5. '주차'를 물어보면 '주차장_접근성점수'가 높은 곳을 추천해.
+    4. '대중교통'을 물어보면 '교통' 점수가 높거나(8점 이상 등) 정류장이 명시된 곳을 우선 추천해.
+    5. '주차'를 물어보면 '주차' 점수가 높은 곳을 추천해.
     6. 톤앤매너: 친절하고 이모지를 적절히 사용해서 등산을 권유하는 느낌으로.
-
-    **[데이터베이스 시작]**
-    {data_context}
-    **[데이터베이스 끝]**
     """
 else:
     system_prompt = "데이터 로딩에 실패했습니다. 관리자에게 문의하세요."
@@ -208,8 +191,15 @@ generation_config = types.GenerateContentConfig(
 # =========================
 # Session State & Chat Setup
 # =========================
-if "chat" not in st.session_state:
-    st.session_state.chat = client.chats.create(model=gemini_model, config=generation_config)
+def new_history():
+    return ChatHistory(
+        keep_turns=HISTORY_KEEP_TURNS,
+        known_mountains=trail_ctx.mountains if trail_ctx else None,
+    )
+
+# 대화 세션 객체 대신 히스토리를 직접 관리 (턴마다 최근 턴 + 요약만 보냄)
+if "chat_history" not in st.session_state:
+    st.session_state.chat_history = new_history()
 
 if "messages" not in st.session_state:
     st.session_state.messages = [
@@ -225,7 +215,7 @@ if "messages" not in st.session_state:
 col_a, col_b = st.columns([1, 5])
 with col_a:
     if st.button("🔄 대화 초기화", use_container_width=True):
-        st.session_state.chat = client.chats.create(model=gemini_model, config=generation_config)
+        st.session_state.chat_history = new_history()
         st.session_state.messages = [
             {"role": "assistant", "content": "대화를 새로 시작합니다! 원하시는 조건을 말씀해주세요. 😊"}
         ]
@@ -237,10 +227,49 @@ with col_a:
 chat_container = st.container(height=600)
 
 with chat_container:
-    for msg in st.session_state.messages:
+    hidden = len(st.session_state.messages) - DISPLAY_MESSAGES
+    if hidden > 0:
+        st.caption(f"이전 메시지 {hidden}개는 생략했습니다.")
+    for msg in st.session_state.messages[-DISPLAY_MESSAGES:]:
         with st.chat_message(msg["role"]):
             st.markdown(msg["content"])
 
+def embed_query(text):
+    """오프라인 임베딩을 쓰는 경우에만 질문 임베딩 계산 (실패하면 BM25만 사용)"""
+    if retriever is None or retriever.embeddings is None:
+        return None
+    try:
+        return embed_texts(client, [text])[0]
+    except Exception as e:
+        logger.warning("질문 임베딩 실패: %s", e)
+        return None
+
+def build_grounded_message(question):
+    """질문과 관련된 등산로만 골라 표 형식으로 질문 앞에 붙임 (토큰 예산 안에서)"""
+    if retriever is None:
+        return question
+    mask = trail_ctx.mountain_mask(question)
+    ids = retriever.search(
+        question,
+        k=RETRIEVAL_K,
+        mask=mask,
+        query_embedding=embed_query(question),
+        max_per_group=None if mask is not None else RETRIEVAL_MAX_PER_MOUNTAIN,
+    )
+    ids = fit_to_budget(ids, trail_ctx.render, CONTEXT_TOKEN_BUDGET)
+    context = trail_ctx.render(ids)
+    return f"""**[데이터베이스 시작]**
+{context}
+**[데이터베이스 끝]**
+
+질문: {question}"""
+
+def iter_chunk_text(stream):
+    """응답 스트림에서 텍스트 조각만 추출"""
+    for chunk in stream:
+        if getattr(chunk, "text", None):
+            yield chunk.text
+
 prompt = st.chat_input("질문을 입력하세요...")
 
 if prompt:
@@ -250,16 +279,21 @@ if prompt:
             st.markdown(prompt)
 
         with st.chat_message("assistant"):
-            placeholder = st.empty()
-            full_response = ""
             try:
-                for chunk in st.session_state.chat.send_message_stream(prompt):
-                    if getattr(chunk, "text", None):
-                        full_response += chunk.text
-                        placeholder.markdown(full_response)
-                
+                # 조각 단위로 이어 그리기 (전체 텍스트를 매번 다시 그리지 않음), TTFT 기록
+                with timed("chat_retrieval"):
+                    grounded = build_grounded_message(prompt)
+                history = st.session_state.chat_history
+                chat = client.chats.create(
+                    model=gemini_model, config=generation_config, history=history.contents()
+                )
+                stream = chat.send_message_stream(history.with_summary(grounded))
+                full_response = st.write_stream(timed_stream("chat_answer", iter_chunk_text(stream)))
+                # 데이터베이스 블록은 빼고 질문 원문만 히스토리에 남김
+                history.add_turn(prompt, full_response)
+
             except Exception as e:
                 full_response = f"⚠️ 오류 발생: {e}"
-                placeholder.markdown(full_response)
+                st.markdown(full_response)
 
     st.session_state.messages.append({"role": "assistant", "content": full_response})
\ No newline at end of file
@@ -7,9 +7,11 @@ import sys
 # 상위 디렉토리의 utils를 import하기 위해
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.intent_classifier import classify_intent_with_llm, extract_mountain_name
-from utils.llm_client import GeminiClient
-from utils.translator import translate_plan
+from utils.intent_classifier import extract_mountain_names
+from utils.llm_client import GeminiClient, get_backend_name, get_gemini_client, stream_with_fallback
+from utils.llm_guard import turn_budget
+from utils.perf import timed_stream
+from utils.translator import classify_and_translate
 from utils.recommender import run_recommender
 from utils.llm_prompts import (
     EXPLAIN_SYSTEM_PROMPT, 
@@ -19,6 +21,13 @@ from utils.llm_prompts import (
 )
 
 
+# 사용자 입력 1회에 대한 LLM 호출 전체의 지연 예산 (초)
+TURN_LATENCY_BUDGET_S = 20.0
+
+# rerun마다 다시 그리는 최근 메시지 수 (긴 대화에서도 화면 갱신 비용 일정)
+DISPLAY_MESSAGES = 30
+
+
 # -----------------------------------------------------------------------------
 # 데이터 로드
 # -----------------------------------------------------------------------------
@@ -71,8 +80,24 @@ def load_trails() -> pd.DataFrame:
 # -----------------------------------------------------------------------------
 # LLM 기반 자연스러운 응답 생성
 # -----------------------------------------------------------------------------
-def generate_conversational_recommendation(client: GeminiClient, user_input: str, plan: dict, results: pd.DataFrame) -> str:
-    """LLM을 사용하여 자연스러운 추천 응답 생성"""
+def render_response(content) -> str:
+    """문자열은 바로, 스트림은 조각 단위로 표시하고 전체 텍스트 반환 (세션 히스토리 저장용)"""
+    if isinstance(content, str):
+        st.markdown(content)
+        return content
+    return st.write_stream(content)
+
+
+def stream_answer(client: GeminiClient, system_prompt: str, user_prompt: str, temperature: float, fallback: str):
+    """LLM 답변 스트림 (TTFT 기록, 실패 시 fallback)"""
+    return stream_with_fallback(
+        timed_stream("chat_answer", client.stream_text(system_prompt, user_prompt, temperature=temperature)),
+        fallback
+    )
+
+
+def generate_conversational_recommendation(client: GeminiClient, user_input: str, plan: dict, results: pd.DataFrame):
+    """LLM을 사용하여 자연스러운 추천 응답 생성 (결과가 있으면 스트림 반환)"""
     
     if results.empty:
         return "죄송해요, 말씀하신 조건에 맞는 등산로를 찾지 못했습니다. 😅\n\n조건을 조금 완화해서 다시 말씀해주시겠어요?"
@@ -127,27 +152,24 @@ def generate_conversational_recommendation(client: GeminiClient, user_input: str
 위 정보를 바탕으로 자연스럽게 추천해주세요.
 제공된 등산로만 언급하고, 매번 다른 스타일로 답변하세요."""
 
-    try:
-        response = client.complete_text(system_prompt, user_prompt, temperature=1.0)
-        return response
-    except Exception as e:
-        fallback = f"""좋습니다! 사용자님의 조건에 맞는 등산로를 찾았어요.
+    fallback = f"""좋습니다! 사용자님의 조건에 맞는 등산로를 찾았어요.
 
 🏔️ 추천 등산로
 
 """
-        for idx, row in results.head(3).iterrows():
-            fallback += f"""**{row['산이름']} {row['코스명']}** ({row['위치']})
+    for idx, row in results.head(3).iterrows():
+        fallback += f"""**{row['산이름']} {row['코스명']}** ({row['위치']})
 추천 이유: 난이도 {row['세부난이도']}, {row['특출매력']} 점수가 높습니다.
 특징: 총 {row['총거리_km']:.1f}km, 예상 시간 {row['예상시간']}
 
 """
-        fallback += "\n어떠세요? 더 궁금한 점이나 다른 옵션이 필요하시면 말씀해주세요! 🌲"
-        return fallback
+    fallback += "\n어떠세요? 더 궁금한 점이나 다른 옵션이 필요하시면 말씀해주세요! 🌲"
+    
+    return stream_answer(client, system_prompt, user_prompt, 1.0, fallback)
 
 
-def generate_trail_detail_explanation(client: GeminiClient, trail_name: str, trail_data: pd.Series) -> str:
-    """특정 등산로에 대한 상세 설명 생성"""
+def trail_detail_prompts(trail_data: pd.Series):
+    """특정 등산로 상세 설명용 (system_prompt, user_prompt, fallback)"""
     
     trail_info = f"""
 등산로: {trail_data['산이름']} {trail_data['코스명']}
@@ -181,11 +203,7 @@ def generate_trail_detail_explanation(client: GeminiClient, trail_name: str, tra
 
 사용자가 이 코스를 선택하는 데 도움이 되도록 상세하게 안내해주세요."""
 
-    try:
-        response = client.complete_text(system_prompt, user_prompt, temperature=0.7)
-        return response
-    except Exception as e:
-        return f"""{trail_data['위치']}에 위치한 **{trail_data['산이름']} {trail_data['코스명']}**에 대해 설명해드릴게요.
+    fallback = f"""{trail_data['위치']}에 위치한 **{trail_data['산이름']} {trail_data['코스명']}**에 대해 설명해드릴게요.
 
 **기본 정보**
 - 난이도: {trail_data['세부난이도']}
@@ -201,6 +219,68 @@ def generate_trail_detail_explanation(client: GeminiClient, trail_name: str, tra
 이 코스의 가장 큰 매력은 **{trail_data['특출매력']}**입니다.
 
 더 궁금하신 점이 있으시면 말씀해주세요! 😊"""
+    
+    return system_prompt, user_prompt, fallback
+
+
+def generate_trail_detail_explanation(client: GeminiClient, trail_name: str, trail_data: pd.Series):
+    """특정 등산로에 대한 상세 설명 생성 (스트림)"""
+    system_prompt, user_prompt, fallback = trail_detail_prompts(trail_data)
+    return stream_answer(client, system_prompt, user_prompt, 0.7, fallback)
+
+
+def answer_in_parallel(client: GeminiClient, prompts: list, temperature: float) -> str:
+    """
+    서로 독립적인 (system_prompt, user_prompt, fallback) 여러 개를 동시에 호출해 순서대로 이어 붙임
+
+    항목마다 스트리밍하면 순서대로 기다려야 하므로, 여러 항목은 한꺼번에 생성해서 한 번에 보여줍니다.
+    """
+    with st.spinner("생각 중..."):
+        texts = client.complete_many([(system, user, temperature) for system, user, _ in prompts])
+    return "\n\n---\n\n".join(text or fallback for text, (_, _, fallback) in zip(texts, prompts))
+
+
+def mountain_question_prompts(user_input: str, mountain_name: str, mountain_trails: pd.DataFrame):
+    """특정 산 질문 답변용 (system_prompt, user_prompt, fallback)"""
+    trail_info = f"""
+{mountain_name}에 대한 정보:
+- 총 {len(mountain_trails)}개의 코스
+- 평균 난이도: {mountain_trails['세부난이도'].mode()[0] if not mountain_trails['세부난이도'].mode().empty else '중급'}
+- 평균 총 거리: {mountain_trails['총거리_km'].mean():.1f}km
+- 평균 고도: {mountain_trails['최고고도_m'].mean():.0f}m
+- 위치: {mountain_trails.iloc[0]['위치']}
+- 주요 매력: {mountain_trails.iloc[0]['특출매력']}
+
+코스 목록:
+"""
+    for idx, row in mountain_trails.iterrows():
+        trail_info += f"- {row['코스명']}: 난이도 {row['세부난이도']}, 거리 {row['총거리_km']:.1f}km\n"
+    
+    system_prompt = """친근한 등산로 안내 챗봇입니다.
+특정 산 질문 답변 시:
+1. 기본 정보 소개
+2. 코스들 간단히 설명
+3. 사용자 조건(난이도 등) 언급 시 맞는 코스 추천
+4. 더 자세한 추천 유도
+
+자연스럽고 친근한 말투로 작성하세요."""
+    
+    user_prompt = f"""사용자 질문: "{user_input}"
+
+{mountain_name} 데이터:
+{trail_info}
+
+위 정보로 자연스럽게 답변하고, 조건 언급 시 맞는 코스 추천해주세요."""
+    
+    fallback = f"""{mountain_name}에 대해 알려드릴게요!
+
+{mountain_name}는 {mountain_trails.iloc[0]['위치']}에 위치한 산으로, 총 {len(mountain_trails)}개의 코스가 있어요.
+
+주요 매력은 **{mountain_trails.iloc[0]['특출매력']}**이고, 평균적으로 {mountain_trails['총거리_km'].mean():.1f}km 정도입니다.
+
+어떤 스타일의 코스를 원하시는지 말씀해주시면 더 자세한 추천을 해드릴게요! 😊"""
+    
+    return system_prompt, user_prompt, fallback
 
 
 # -----------------------------------------------------------------------------
@@ -245,7 +325,11 @@ def main():
     
     # Gemini 클라이언트 초기화
     try:
-        if "gemini" in st.secrets:
+        backend_name = get_backend_name()
+        if backend_name == "stub":
+            # 오프라인 대역 (API 키 불필요)
+            api_key, model = None, "stub"
+        elif "gemini" in st.secrets:
             api_key = st.secrets["gemini"]["GEMINI_API_KEY"]
             model = st.secrets["gemini"].get("GEMINI_MODEL", "gemini-2.0-flash-exp")
         elif "GEMINI_API_KEY" in st.secrets:
@@ -255,14 +339,18 @@ def main():
             st.error("⚠️ Gemini API 키가 설정되지 않았습니다.")
             st.stop()
         
-        client = GeminiClient(api_key=api_key, model=model)
+        # 프로세스 전역 캐시: rerun마다 새로 만들지 않음
+        client = get_gemini_client(api_key, model, backend_name)
         
     except Exception as e:
         st.error(f"Gemini API 초기화 실패: {e}")
         st.stop()
     
-    # 채팅 히스토리 표시
-    for message in st.session_state.messages:
+    # 채팅 히스토리 표시 (최근 DISPLAY_MESSAGES개만)
+    hidden = len(st.session_state.messages) - DISPLAY_MESSAGES
+    if hidden > 0:
+        st.caption(f"이전 메시지 {hidden}개는 생략했습니다.")
+    for message in st.session_state.messages[-DISPLAY_MESSAGES:]:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
     
@@ -276,187 +364,159 @@ def main():
         with st.chat_message("user"):
             st.markdown(user_input)
         
-        # 의도 분류 (LLM 기반)
         has_previous = st.session_state.last_results is not None and not st.session_state.last_results.empty
-        intent = classify_intent_with_llm(client, user_input, has_previous_results=has_previous)
         
-        # Assistant 응답 생성
-        with st.chat_message("assistant"):
+        # Assistant 응답 생성 (이 턴의 LLM 호출은 TURN_LATENCY_BUDGET_S 안에서 처리)
+        with st.chat_message("assistant"), turn_budget(TURN_LATENCY_BUDGET_S):
+            if not client.is_available():
+                st.caption("⚠️ AI 응답이 잠시 불안정해서 간단한 방식으로 답변하고 있어요.")
             with st.spinner("생각 중..."):
+                # 의도 분류 + 파라미터 변환 (명확하면 규칙 + 변환 1회, 애매하면 통합 호출 1회)
+                intent, plan = classify_and_translate(
+                    client,
+                    user_input,
+                    has_previous_results=has_previous,
+                    last_plan=st.session_state.last_plan if has_previous else None
+                )
+            
+            # 스피너는 분류·변환까지만 (답변 스트림은 첫 조각부터 바로 보이도록 스피너 밖에서 표시)
+            if intent in ("recommend", "refine"):
+                # 특정 산이 언급되었는지 확인 (여러 산 동시 언급 가능)
+                all_mountains = trails_df['산이름'].unique().tolist()
+                mentioned_mountains = extract_mountain_names(user_input, all_mountains)
                 
-                if intent in ("recommend", "refine"):
-                    # 특정 산이 언급되었는지 확인
-                    all_mountains = trails_df['산이름'].unique().tolist()
-                    mentioned_mountain = extract_mountain_name(user_input, all_mountains)
-                    
-                    # LLM translation 수행
-                    plan = translate_plan(
-                        client, 
-                        user_input, 
-                        intent=intent,
-                        last_plan=st.session_state.last_plan if intent == "refine" else None
-                    )
-                    
-                    # 특정 산이 언급되었으면 필터링 추가
-                    if mentioned_mountain:
-                        if "exclude" not in plan:
-                            plan["exclude"] = {"mountains": [], "trails": []}
-                        all_mountains_set = set(trails_df['산이름'].unique())
-                        other_mountains = all_mountains_set - {mentioned_mountain}
-                        plan["exclude"]["mountains"] = list(other_mountains)
-                    
-                    # 추천 엔진 실행
-                    results = run_recommender(trails_df, plan, top_k=5)
-                    
-                    # LLM 기반 자연스러운 응답 생성
-                    response = generate_conversational_recommendation(
-                        client, user_input, plan, results
-                    )
-                    
+                # 특정 산이 언급되었으면 필터링 추가
+                if mentioned_mountains:
+                    if "exclude" not in plan:
+                        plan["exclude"] = {"mountains": [], "trails": []}
+                    all_mountains_set = set(trails_df['산이름'].unique())
+                    other_mountains = all_mountains_set - set(mentioned_mountains)
+                    plan["exclude"]["mountains"] = list(other_mountains)
+                
+                # 추천 엔진 실행
+                results = run_recommender(trails_df, plan, top_k=5)
+                
+                # LLM 기반 자연스러운 응답 생성
+                response = render_response(generate_conversational_recommendation(
+                    client, user_input, plan, results
+                ))
+                
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": response
+                })
+                
+                st.session_state.last_plan = plan
+                st.session_state.last_results = results
+            
+            elif intent == "explain":
+                if st.session_state.last_results is None or st.session_state.last_results.empty:
+                    response = "아직 추천 결과가 없어요. 먼저 등산로를 추천받아보세요! 😊"
                     st.markdown(response)
+                else:
+                    # 사용자가 언급한 산/코스 찾기 (코스명이 여러 개 언급되면 모두)
+                    mentioned_trails = []
+                    mountain_match = None
+                    user_clean = user_input.replace(" ", "").replace("번", "").replace("코스", "")
                     
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": response
-                    })
+                    for idx, row in st.session_state.last_results.iterrows():
+                        mountain_clean = row['산이름'].replace(" ", "")
+                        course_clean = row['코스명'].replace(" ", "").replace("_", "")
+                        
+                        if course_clean in user_clean or row['코스명'] in user_input:
+                            mentioned_trails.append(row)
+                        elif mountain_match is None and (mountain_clean in user_clean or row['산이름'] in user_input):
+                            mountain_match = row
                     
-                    st.session_state.last_plan = plan
-                    st.session_state.last_results = results
-                
-                elif intent == "explain":
-                    if st.session_state.last_results is None or st.session_state.last_results.empty:
-                        response = "아직 추천 결과가 없어요. 먼저 등산로를 추천받아보세요! 😊"
-                        st.markdown(response)
+                    if not mentioned_trails and mountain_match is not None:
+                        mentioned_trails = [mountain_match]
+                    
+                    if len(mentioned_trails) > 1:
+                        # 코스별 설명은 서로 독립적이므로 동시에 생성
+                        response = answer_in_parallel(
+                            client, [trail_detail_prompts(row) for row in mentioned_trails[:3]], 0.7
+                        )
+                    elif mentioned_trails:
+                        response = generate_trail_detail_explanation(
+                            client, user_input, mentioned_trails[0]
+                        )
                     else:
-                        # 사용자가 언급한 산/코스 찾기
-                        mentioned_trail = None
-                        user_clean = user_input.replace(" ", "").replace("번", "").replace("코스", "")
-                        
-                        for idx, row in st.session_state.last_results.iterrows():
-                            mountain_clean = row['산이름'].replace(" ", "")
-                            course_clean = row['코스명'].replace(" ", "").replace("_", "")
-                            
-                            if (mountain_clean in user_clean or 
-                                course_clean in user_clean or
-                                row['산이름'] in user_input or 
-                                row['코스명'] in user_input):
-                                mentioned_trail = row
-                                break
-                        
-                        if mentioned_trail is not None:
-                            response = generate_trail_detail_explanation(
-                                client, user_input, mentioned_trail
-                            )
-                        else:
-                            try:
-                                top_items = []
-                                for idx, row in st.session_state.last_results.head(3).iterrows():
-                                    top_items.append({
-                                        '산이름': row['산이름'],
-                                        '코스명': row['코스명'],
-                                        '세부난이도': row['세부난이도'],
-                                        '관광인프라점수': row['관광인프라점수'],
-                                        '매력종합점수': row['매력종합점수']
-                                    })
-                                
-                                response = client.complete_text(
-                                    system_prompt=EXPLAIN_SYSTEM_PROMPT,
-                                    user_prompt=make_explain_user_prompt(
-                                        user_input, 
-                                        st.session_state.last_plan, 
-                                        top_items
-                                    ),
-                                    temperature=0.7
-                                )
-                            except Exception:
-                                response = "이전에 추천해드린 등산로들은 사용자님의 조건에 가장 잘 맞는 곳들이에요! 😊"
+                        top_items = []
+                        for idx, row in st.session_state.last_results.head(3).iterrows():
+                            top_items.append({
+                                '산이름': row['산이름'],
+                                '코스명': row['코스명'],
+                                '세부난이도': row['세부난이도'],
+                                '관광인프라점수': row['관광인프라점수'],
+                                '매력종합점수': row['매력종합점수']
+                            })
                         
-                        st.markdown(response)
+                        response = stream_answer(
+                            client,
+                            EXPLAIN_SYSTEM_PROMPT,
+                            make_explain_user_prompt(
+                                user_input, 
+                                st.session_state.last_plan, 
+                                top_items
+                            ),
+                            0.7,
+                            "이전에 추천해드린 등산로들은 사용자님의 조건에 가장 잘 맞는 곳들이에요! 😊"
+                        )
                     
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": response
-                    })
+                    response = render_response(response)
+                
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": response
+                })
+            
+            elif intent == "question":
+                # 특정 산에 대한 질문인지 확인 (여러 산이 언급되면 산마다 답변)
+                all_mountains = trails_df['산이름'].unique().tolist()
+                mentioned_mountains = extract_mountain_names(user_input, all_mountains)
                 
-                elif intent == "question":
-                    # 특정 산에 대한 질문인지 확인
-                    all_mountains = trails_df['산이름'].unique().tolist()
-                    mentioned_mountain = extract_mountain_name(user_input, all_mountains)
+                if mentioned_mountains:
+                    mountain_groups = [
+                        (name, trails_df[trails_df['산이름'] == name]) for name in mentioned_mountains
+                    ]
+                    prompts = [
+                        mountain_question_prompts(user_input, name, mountain_trails)
+                        for name, mountain_trails in mountain_groups if not mountain_trails.empty
+                    ]
                     
-                    if mentioned_mountain:
-                        mountain_trails = trails_df[trails_df['산이름'] == mentioned_mountain]
-                        
-                        if not mountain_trails.empty:
-                            trail_info = f"""
-{mentioned_mountain}에 대한 정보:
-- 총 {len(mountain_trails)}개의 코스
-- 평균 난이도: {mountain_trails['세부난이도'].mode()[0] if not mountain_trails['세부난이도'].mode().empty else '중급'}
-- 평균 총 거리: {mountain_trails['총거리_km'].mean():.1f}km
-- 평균 고도: {mountain_trails['최고고도_m'].mean():.0f}m
-- 위치: {mountain_trails.iloc[0]['위치']}
-- 주요 매력: {mountain_trails.iloc[0]['특출매력']}
-
-코스 목록:
-"""
-                            for idx, row in mountain_trails.iterrows():
-                                trail_info += f"- {row['코스명']}: 난이도 {row['세부난이도']}, 거리 {row['총거리_km']:.1f}km\n"
-                            
-                            system_prompt = """친근한 등산로 안내 챗봇입니다.
-특정 산 질문 답변 시:
-1. 기본 정보 소개
-2. 코스들 간단히 설명
-3. 사용자 조건(난이도 등) 언급 시 맞는 코스 추천
-4. 더 자세한 추천 유도
-
-자연스럽고 친근한 말투로 작성하세요."""
-                            
-                            user_prompt = f"""사용자 질문: "{user_input}"
-
-{mentioned_mountain} 데이터:
-{trail_info}
-
-위 정보로 자연스럽게 답변하고, 조건 언급 시 맞는 코스 추천해주세요."""
-                            
-                            try:
-                                response = client.complete_text(system_prompt, user_prompt, temperature=0.8)
-                                st.markdown(response)
-                            except Exception:
-                                response = f"""{mentioned_mountain}에 대해 알려드릴게요!
-
-{mentioned_mountain}는 {mountain_trails.iloc[0]['위치']}에 위치한 산으로, 총 {len(mountain_trails)}개의 코스가 있어요.
-
-주요 매력은 **{mountain_trails.iloc[0]['특출매력']}**이고, 평균적으로 {mountain_trails['총거리_km'].mean():.1f}km 정도입니다.
-
-어떤 스타일의 코스를 원하시는지 말씀해주시면 더 자세한 추천을 해드릴게요! 😊"""
-                                st.markdown(response)
-                        else:
-                            response = f"죄송해요, {mentioned_mountain}에 대한 정보를 찾을 수 없네요. 😅"
-                            st.markdown(response)
+                    if len(prompts) > 1:
+                        # 산별 답변은 서로 독립적이므로 동시에 생성
+                        response = render_response(answer_in_parallel(client, prompts, 0.8))
+                    elif prompts:
+                        system_prompt, user_prompt, fallback = prompts[0]
+                        response = render_response(
+                            stream_answer(client, system_prompt, user_prompt, 0.8, fallback)
+                        )
                     else:
-                        data_summary = f"""전체 등산로 수: {len(trails_df)}개
+                        response = f"죄송해요, {mentioned_mountains[0]}에 대한 정보를 찾을 수 없네요. 😅"
+                        st.markdown(response)
+                else:
+                    data_summary = f"""전체 등산로 수: {len(trails_df)}개
 평균 매력도: {trails_df['매력종합점수'].mean():.1f}점
 평균 인프라 점수: {trails_df['관광인프라점수'].mean():.1f}점
 
 산 목록 (일부): {', '.join([str(m).strip() for m in trails_df['산이름'].unique()[:10]])}..."""
-                        
-                        try:
-                            response = client.complete_text(
-                                system_prompt=QA_SYSTEM_PROMPT,
-                                user_prompt=make_qa_user_prompt(user_input, data_summary),
-                                temperature=0.7
-                            )
-                            st.markdown(response)
-                        except Exception:
-                            response = "죄송해요, 그 질문에 대한 정확한 답변이 어렵네요. 😅\n\n원하시는 등산 스타일을 말씀해주시면 맞춤 추천을 도와드릴게요!"
-                            st.markdown(response)
                     
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": response
-                    })
+                    response = render_response(stream_answer(
+                        client,
+                        QA_SYSTEM_PROMPT,
+                        make_qa_user_prompt(user_input, data_summary),
+                        0.7,
+                        "죄송해요, 그 질문에 대한 정확한 답변이 어렵네요. 😅\n\n원하시는 등산 스타일을 말씀해주시면 맞춤 추천을 도와드릴게요!"
+                    ))
                 
-                else:  # other
-                    response = """죄송하지만 잘 이해하지 못했어요. 😅
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": response
+                })
+            
+            else:  # other
+                response = """죄송하지만 잘 이해하지 못했어요. 😅
 
 저는 등산로 추천 전문 챗봇이에요. 다음과 같이 말씀해주시면 도움을 드릴 수 있어요:
 
@@ -467,12 +527,12 @@ def main():
 • "가리산 01 코스에 대해 더 설명해줘"
 
 등산로나 산에 대해 궁금한 점이 있으시면 편하게 물어보세요! 😊"""
-                    
-                    st.markdown(response)
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": response
-                    })
+                
+                st.markdown(response)
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": response
+                })
 
 
 if __name__ == "__main__":
@@ -0,0 +1,171 @@
+# utils/chat_history.py
+"""
+긴 대화의 히스토리 관리
+
+최근 keep_turns턴은 원문 그대로 두고, 그보다 오래된 턴은 구조화된 요약
+(선호 조건, 제외한 산, 이미 추천·언급한 산, 이전 질문 몇 개)으로 접습니다.
+턴마다 보내는 히스토리 크기가 대화 길이와 상관없이 일정 범위 안에 머뭅니다.
+
+데이터베이스 블록은 그 턴에서만 쓰고 히스토리에는 사용자 질문 원문만 남깁니다.
+
+사용 예:
+    history = ChatHistory(keep_turns=4, known_mountains=trail_ctx.mountains)
+    chat = client.chats.create(model=model, config=config, history=history.contents())
+    answer = ... chat.send_message_stream(history.with_summary(grounded)) ...
+    history.add_turn(question, answer)
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.name_matcher import get_matcher
+from utils.plan_parser import LEVELS, parse_plan
+
+
+DEFAULT_KEEP_TURNS = 4
+MAX_ANSWER_CHARS = 2000          # 원문으로 남기는 답변 한 개의 최대 길이
+MAX_LISTED = 8                   # 요약의 산 목록 최대 개수
+MAX_RECENT_QUESTIONS = 3
+MAX_QUESTION_CHARS = 40
+
+CLUSTER_LABELS = {
+    "seasonal": "계절 풍경", "view": "조망", "family": "가족", "healing": "힐링", "hidden": "한적한 곳",
+}
+
+LEVEL_NAMES = {level: name for name, level in LEVELS.items()}
+
+# 산 이름 바로 뒤에 오면 그 산을 빼 달라는 뜻
+_EXCLUDE_AFTER = re.compile(r"^\s*(?:은|는|이|가|도)?\s*(?:말고|빼고|제외|싫|별로|가\s*봤|다녀왔)")
+
+
+def _format_constraints(constraints: Dict[str, Any]) -> List[str]:
+    """plan 제약조건 → 짧은 한국어 표현"""
+    c = constraints or {}
+    low, high = c.get("difficulty_min"), c.get("difficulty_max")
+    parts = []
+    if low is not None and high is not None:
+        parts.append(f"난이도 {LEVEL_NAMES.get(low, low)}~{LEVEL_NAMES.get(high, high)}")
+    elif high is not None:
+        parts.append(f"난이도 {LEVEL_NAMES.get(high, high)} 이하")
+    elif low is not None:
+        parts.append(f"난이도 {LEVEL_NAMES.get(low, low)} 이상")
+    if c.get("distance_max_km") is not None:
+        parts.append(f"거리 {c['distance_max_km']:g}km 이하")
+    if c.get("park_dist_max") is not None:
+        parts.append(f"주차장 {c['park_dist_max']}m 이내")
+    if c.get("altitude_min_m") is not None:
+        parts.append(f"고도 {c['altitude_min_m']}m 이상")
+    if c.get("altitude_max_m") is not None:
+        parts.append(f"고도 {c['altitude_max_m']}m 이하")
+    if c.get("infra_min") is not None:
+        parts.append("편의시설 많은 곳")
+    if c.get("infra_max") is not None:
+        parts.append("붐비지 않는 곳")
+    return parts
+
+
+def _add_unique(items: List[str], new: Iterable[str]) -> None:
+    """순서를 유지하며 추가 (최근 것이 뒤, MAX_LISTED개 유지)"""
+    for name in new:
+        if name in items:
+            items.remove(name)
+        items.append(name)
+    del items[:-MAX_LISTED]
+
+
+@dataclass
+class ConversationSummary:
+    """접힌 턴들의 구조화 요약"""
+    folded_turns: int = 0
+    plan: Optional[Dict[str, Any]] = None                       # 누적 선호 조건 (plan 스키마)
+    excluded_mountains: List[str] = field(default_factory=list)
+    mentioned_mountains: List[str] = field(default_factory=list)
+    recent_questions: List[str] = field(default_factory=list)
+
+    def render(self) -> str:
+        """프롬프트에 넣을 요약 (접힌 턴이 없으면 빈 문자열)"""
+        if not self.folded_turns:
+            return ""
+        lines = [f"[이전 대화 요약 - 앞선 {self.folded_turns}턴]"]
+        if self.plan:
+            prefs = []
+            cluster = self.plan.get("cluster_preference")
+            if cluster in CLUSTER_LABELS:
+                prefs.append(f"테마 {CLUSTER_LABELS[cluster]}")
+            prefs += _format_constraints(self.plan.get("constraints"))
+            if self.plan.get("keywords"):
+                prefs.append("키워드 " + "/".join(self.plan["keywords"]))
+            if prefs:
+                lines.append("- 선호 조건: " + ", ".join(prefs))
+        if self.excluded_mountains:
+            lines.append("- 제외한 산: " + ", ".join(self.excluded_mountains))
+        mentioned = [m for m in self.mentioned_mountains if m not in self.excluded_mountains]
+        if mentioned:
+            lines.append("- 이미 추천·언급한 산: " + ", ".join(mentioned))
+        if self.recent_questions:
+            lines.append("- 이전 질문: " + " / ".join(f'"{q}"' for q in self.recent_questions))
+        return "\n".join(lines)
+
+
+class ChatHistory:
+    """최근 턴은 원문, 오래된 턴은 ConversationSummary로 유지하는 대화 히스토리"""
+
+    def __init__(self, keep_turns: int = DEFAULT_KEEP_TURNS, known_mountains: Optional[Iterable[str]] = None):
+        """
+        Args:
+            keep_turns: 원문으로 남길 최근 턴 수
+            known_mountains: 요약에서 산 이름을 찾을 때 쓸 전체 산 이름 목록
+        """
+        self.keep_turns = keep_turns
+        self.turns: List[Dict[str, str]] = []       # {"user": 질문 원문, "assistant": 답변}
+        self.summary = ConversationSummary()
+        self._matcher = get_matcher(tuple(sorted(set(known_mountains)))) if known_mountains is not None else None
+
+    def add_turn(self, user: str, assistant: str) -> None:
+        """한 턴 추가 후 keep_turns를 넘는 오래된 턴은 요약으로 접음"""
+        if len(assistant) > MAX_ANSWER_CHARS:
+            assistant = assistant[:MAX_ANSWER_CHARS] + "…"
+        self.turns.append({"user": user, "assistant": assistant})
+        while len(self.turns) > self.keep_turns:
+            self._fold(self.turns.pop(0))
+
+    def _fold(self, turn: Dict[str, str]) -> None:
+        s = self.summary
+        s.folded_turns += 1
+
+        # 선호 조건: 이전 요약을 기준으로 새 표현을 덮어씀 (해석한 것이 없으면 유지)
+        plan, confidence = parse_plan(turn["user"], "refine" if s.plan else "recommend", s.plan)
+        if confidence > 0:
+            s.plan = plan
+
+        if self._matcher is not None:
+            question = turn["user"]
+            excluded = [
+                name
+                for _, end, names in self._matcher.find(question) if _EXCLUDE_AFTER.match(question[end:])
+                for name in names
+            ]
+            _add_unique(s.excluded_mountains, excluded)
+            _add_unique(s.mentioned_mountains, self._matcher.extract(turn["assistant"]))
+
+        question = " ".join(turn["user"].split())
+        if len(question) > MAX_QUESTION_CHARS:
+            question = question[:MAX_QUESTION_CHARS] + "…"
+        s.recent_questions.append(question)
+        del s.recent_questions[:-MAX_RECENT_QUESTIONS]
+
+    def contents(self) -> List[Dict[str, Any]]:
+        """원문으로 남은 최근 턴 (google.genai chats.create의 history 형식)"""
+        contents = []
+        for turn in self.turns:
+            contents.append({"role": "user", "parts": [{"text": turn["user"]}]})
+            contents.append({"role": "model", "parts": [{"text": turn["assistant"]}]})
+        return contents
+
+    def with_summary(self, message: str) -> str:
+        """이번 메시지 앞에 이전 대화 요약을 붙임 (요약이 없으면 그대로)"""
+        summary = self.summary.render()
+        return f"{summary}\n\n{message}" if summary else message
+
+    def __len__(self) -> int:
+        return self.summary.folded_turns + len(self.turns)
@@ -0,0 +1,101 @@
+# utils/geo.py
+"""
+좌표 기반 최근접 지점 검색
+
+산 정상 좌표나 등산로 들머리 좌표처럼 고정된 지점 집합을 한 번 색인해두고,
+지도 클릭 좌표에서 가장 가까운 지점과 실제 거리(m)를 벡터 연산(haversine)으로 계산합니다.
+클릭 허용 반경은 지도 확대 수준(zoom)과 화면 픽셀 기준으로 환산합니다.
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+EARTH_RADIUS_M = 6_371_008.8
+
+# Web Mercator 타일(256px) 기준 zoom 0, 적도에서의 1픽셀당 거리(m)
+_METERS_PER_PIXEL_Z0 = 156_543.03392
+
+
+def meters_per_pixel(lat: float, zoom: float) -> float:
+    """주어진 위도·확대 수준에서 화면 1픽셀이 나타내는 거리(m)"""
+    return _METERS_PER_PIXEL_Z0 * np.cos(np.radians(lat)) / (2 ** zoom)
+
+
+class NearestPointIndex:
+    """이름이 붙은 좌표 집합에 대한 최근접 지점 인덱스"""
+
+    def __init__(self, names: Sequence[str], lats: Sequence[float], lons: Sequence[float]):
+        """
+        Args:
+            names: 지점 이름 (산 이름, 코스명 등)
+            lats: 위도 목록
+            lons: 경도 목록
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+
+        self.names = [n for n, ok in zip(names, valid) if ok]
+        self._lat_rad = np.radians(lats[valid])
+        self._lon_rad = np.radians(lons[valid])
+        self._cos_lat = np.cos(self._lat_rad)
+
+    def __len__(self):
+        return len(self.names)
+
+    def distances_m(self, lat: float, lon: float) -> np.ndarray:
+        """모든 지점까지의 거리(m) 배열 (색인 순서)"""
+        lat1, lon1 = np.radians(lat), np.radians(lon)
+        a = (
+            np.sin((self._lat_rad - lat1) / 2) ** 2
+            + np.cos(lat1) * self._cos_lat * np.sin((self._lon_rad - lon1) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def nearest(self, lat: float, lon: float) -> Optional[Tuple[str, float]]:
+        """
+        가장 가까운 지점
+
+        Returns:
+            (이름, 거리 m) 또는 색인이 비어 있으면 None
+        """
+        if not self.names:
+            return None
+        dists = self.distances_m(lat, lon)
+        idx = int(np.argmin(dists))
+        return self.names[idx], float(dists[idx])
+
+    def nearest_within(
+        self,
+        lat: float,
+        lon: float,
+        zoom: Optional[float] = None,
+        tolerance_px: float = 15,
+        max_distance_m: Optional[float] = None,
+    ) -> Optional[Tuple[str, float]]:
+        """
+        허용 반경 안에 있는 가장 가까운 지점
+
+        Args:
+            lat, lon: 클릭 좌표
+            zoom: 지도 확대 수준 (주어지면 tolerance_px를 거리로 환산)
+            tolerance_px: 클릭 허용 반경 (화면 픽셀)
+            max_distance_m: 허용 반경 (m). zoom과 함께 주어지면 더 작은 값 사용
+
+        Returns:
+            (이름, 거리 m) 또는 반경 안에 지점이 없으면 None
+        """
+        hit = self.nearest(lat, lon)
+        if hit is None:
+            return None
+
+        limits = []
+        if zoom is not None:
+            limits.append(tolerance_px * meters_per_pixel(lat, zoom))
+        if max_distance_m is not None:
+            limits.append(max_distance_m)
+
+        if limits and hit[1] > min(limits):
+            return None
+        return hit
@@ -0,0 +1,152 @@
+# utils/image_variants.py
+"""
+산 사진(images/*.jpg) 리사이즈 파생본(WebP) 생성 및 선택
+
+원본 JPEG는 수 MB까지 되므로, 몇 가지 목표 폭으로 줄인 WebP 파생본을
+원본 내용 해시(content-addressed) 폴더에 저장해두고 페이지에서는
+표시 폭에 충분한 가장 작은 파생본을 사용합니다.
+원본이 바뀌면 해시가 바뀌므로 자동으로 새로 생성되고, 바뀌지 않은 이미지는 건너뜁니다.
+파일 이름에 WebP 품질이 들어가므로 품질을 바꿔도 새로 생성됩니다.
+
+미리 전체 생성 (코어 수만큼 병렬, 폭별 페이지당 평균 전송량도 출력):
+    python -m utils.image_variants
+"""
+import hashlib
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+IMAGES_DIR = ROOT_DIR / "images"
+CACHE_DIR = ROOT_DIR / ".cache" / "images"
+
+TARGET_WIDTHS = (480, 960, 1600)
+WEBP_QUALITY = 75
+IMAGE_EXTS = {".jpg", ".jpeg"}
+
+
+@lru_cache(maxsize=256)
+def _digest(path: str, size: int, mtime_ns: int) -> str:
+    """원본 파일 내용 해시 (크기·수정시각이 같으면 다시 읽지 않음)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:20]
+
+
+def source_digest(image_path: Path) -> str:
+    stat = image_path.stat()
+    return _digest(str(image_path), stat.st_size, stat.st_mtime_ns)
+
+
+def _variant_dir(digest: str) -> Path:
+    return CACHE_DIR / digest
+
+
+def _variant_path(digest: str, width: int) -> Path:
+    return _variant_dir(digest) / f"{width}_q{WEBP_QUALITY}.webp"
+
+
+def build_variants(image_path: Path, widths: Sequence[int] = TARGET_WIDTHS) -> Dict[int, Path]:
+    """
+    한 원본 이미지의 파생본 생성 (이미 있는 폭은 건너뜀)
+
+    Returns:
+        {목표 폭: 파생본 경로}
+    """
+    image_path = Path(image_path)
+    digest = source_digest(image_path)
+    targets = {w: _variant_path(digest, w) for w in widths}
+    missing = {w: p for w, p in targets.items() if not p.exists()}
+    if not missing:
+        return targets
+
+    with Image.open(image_path) as src:
+        img = ImageOps.exif_transpose(src).convert("RGB")
+
+    _variant_dir(digest).mkdir(parents=True, exist_ok=True)
+    for width, path in missing.items():
+        # 원본보다 큰 폭은 확대하지 않고 원본 폭 그대로 인코딩
+        if img.width > width:
+            height = round(img.height * width / img.width)
+            resized = img.resize((width, height), Image.Resampling.LANCZOS)
+        else:
+            resized = img
+        tmp_path = path.with_suffix(".tmp")
+        resized.save(tmp_path, format="WEBP", quality=WEBP_QUALITY, method=6)
+        tmp_path.replace(path)
+
+    return targets
+
+
+def pick_width(display_width: int, widths: Sequence[int] = TARGET_WIDTHS) -> int:
+    """표시 폭(px)을 채우는 가장 작은 파생본 폭"""
+    for width in sorted(widths):
+        if width >= display_width:
+            return width
+    return max(widths)
+
+
+def get_image_variant(image_path: Path, display_width: int = 960) -> Optional[Path]:
+    """
+    표시 폭에 맞는 파생본 경로 반환 (없으면 즉석 생성)
+
+    Args:
+        image_path: 원본 이미지 경로
+        display_width: 화면에 그려질 최대 폭(px, 고해상도 화면 배율 포함)
+
+    Returns:
+        파생본 경로, 원본이 없으면 None. 생성에 실패하면 원본 경로
+    """
+    image_path = Path(image_path)
+    if not image_path.exists():
+        return None
+
+    width = pick_width(display_width)
+    try:
+        path = _variant_path(source_digest(image_path), width)
+        if not path.exists():
+            path = build_variants(image_path)[width]
+        return path
+    except OSError as e:
+        # 캐시 폴더에 쓸 수 없는 환경에서는 원본 사용
+        logger.warning("이미지 파생본 생성 실패 (%s): %s", image_path.name, e)
+        return image_path
+
+
+def _build_one(path: Path) -> int:
+    before = sum(1 for w in TARGET_WIDTHS if _variant_path(source_digest(path), w).exists())
+    build_variants(path)
+    return len(TARGET_WIDTHS) - before
+
+
+def build_all(images_dir: Path = IMAGES_DIR, jobs: Optional[int] = None) -> None:
+    """이미지 폴더 전체 파생본 생성 (프로세스 병렬, 변경 없는 이미지는 건너뜀)"""
+    paths = sorted(p for p in images_dir.iterdir() if p.suffix.lower() in IMAGE_EXTS)
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        created = sum(pool.map(_build_one, paths))
+
+    src_bytes = sum(p.stat().st_size for p in paths)
+    out_bytes = {
+        w: sum(_variant_path(source_digest(p), w).stat().st_size for p in paths)
+        for w in TARGET_WIDTHS
+    }
+    # 산 상세 페이지는 사진을 한 장씩 보여주므로 이미지당 평균이 곧 페이지당 전송량
+    print(f"원본 {len(paths)}개 ({src_bytes / 1e6:.1f} MB, 페이지당 {src_bytes / len(paths) / 1e3:.0f} KB), "
+          f"새 파생본 {created}개 → {CACHE_DIR}")
+    for w, size in out_bytes.items():
+        print(f"  {w}px (q{WEBP_QUALITY}): {size / 1e6:.1f} MB, 페이지당 {size / len(paths) / 1e3:.0f} KB "
+              f"(원본 대비 1/{src_bytes / size:.1f})")
+
+
+if __name__ == "__main__":
+    build_all(jobs=int(sys.argv[1]) if len(sys.argv) > 1 else None)
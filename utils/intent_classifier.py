@@ -2,8 +2,18 @@
 """
 LLM 기반 의도 분류
 패턴 매칭 대신 LLM이 유연하게 의도를 파악
+명확한 입력은 규칙(router)으로 바로 분류하고, 애매한 입력만 LLM으로 넘기는 하이브리드 분류 지원
+(LLM 분류 결과는 INTENT_LABEL_LOG=1일 때 로컬 분류기 학습용 라벨로 수집, utils/intent_labels.py)
 """
-from utils.llm_client import GeminiClient
+import logging
+
+from utils.intent_labels import log_labeled
+from utils.llm_client import GeminiBackend, GeminiClient
+from utils.name_matcher import get_matcher
+from utils.perf import timed
+from utils.router import CONFIDENCE_THRESHOLD, route_intent_with_confidence
+
+logger = logging.getLogger(__name__)
 
 
 INTENT_SYSTEM_PROMPT = """당신은 등산로 추천 챗봇의 의도 분류 전문가입니다.
@@ -84,16 +94,50 @@ def classify_intent_with_llm(
         # 검증
         valid_intents = ["recommend", "refine", "explain", "question", "other"]
         if response in valid_intents:
+            log_llm_label(client, user_input, response, has_previous_results)
             return response
         else:
             # LLM이 이상한 답을 하면 recommend로 (안전장치)
-            print(f"Invalid intent from LLM: {response}, defaulting to recommend")
+            logger.warning("Invalid intent from LLM: %s, defaulting to recommend", response)
             return "recommend"
             
     except Exception as e:
-        print(f"Intent classification failed: {e}")
-        # 실패 시 기본값: recommend
-        return "recommend"
+        logger.warning("Intent classification failed: %s", e)
+        # 실패 시(타임아웃, 브레이커 열림 등) 규칙 분류 결과 사용
+        return route_intent_with_confidence(user_input, has_previous_results)[0]
+
+
+def log_llm_label(client: GeminiClient, user_input: str, intent: str, has_previous_results: bool) -> None:
+    """실제 Gemini가 분류한 질의만 학습용 라벨로 기록 (INTENT_LABEL_LOG=1일 때, 오프라인 대역 응답은 제외)"""
+    if isinstance(client.backend, GeminiBackend):
+        log_labeled(user_input, intent, has_previous_results)
+
+
+def classify_intent(
+    client: GeminiClient,
+    user_input: str,
+    has_previous_results: bool = False,
+    threshold: float = CONFIDENCE_THRESHOLD,
+) -> str:
+    """
+    하이브리드 의도 분류 (규칙 확신도가 threshold 이상이거나 LLM이 불안정하면 LLM 호출 생략)
+
+    Args:
+        client: Gemini API 클라이언트
+        user_input: 사용자 입력
+        has_previous_results: 이전 추천 결과가 있는지 여부
+        threshold: 규칙 결과를 그대로 쓸 최소 확신도
+
+    Returns:
+        "recommend", "refine", "explain", "question", "other" 중 하나
+    """
+    with timed("intent_rule"):
+        intent, confidence = route_intent_with_confidence(user_input, has_previous_results)
+    if confidence >= threshold or not client.is_available():
+        return intent
+
+    with timed("intent_llm"):
+        return classify_intent_with_llm(client, user_input, has_previous_results=has_previous_results)
 
 
 def extract_mountain_name(user_input: str, all_mountains: list) -> str:
@@ -107,15 +151,28 @@ def extract_mountain_name(user_input: str, all_mountains: list) -> str:
     Returns:
         찾은 산 이름 또는 None
     """
-    user_clean = user_input.replace(" ", "").replace("등산로", "").replace("추천", "").replace("코스", "")
-    
-    for mountain in all_mountains:
-        mountain_clean = str(mountain).strip().replace(" ", "")
-        
-        # 여러 방법으로 매칭
-        if (mountain_clean in user_clean or
-            mountain_clean in user_input or
-            str(mountain).strip() in user_input):
-            return mountain
-    
-    return None
+    names = extract_mountain_names(user_input, all_mountains)
+    return names[0] if names else None
+
+
+def extract_mountain_names(user_input: str, all_mountains: list) -> list:
+    """
+    사용자 입력에 언급된 모든 산 이름 추출 (언급 순서)
+
+    Aho–Corasick 오토마톤으로 한 번에 훑고, 겹치면 가장 긴 이름을 우선합니다.
+    예: "지리산(통영)이랑 설악산" → ["지리산(통영)", "설악산"]
+        "백운산" → ["백운산(광양)", "백운산(정선)", "백운산(포천)"]
+
+    Args:
+        user_input: 사용자 입력
+        all_mountains: 모든 산 이름 리스트
+
+    Returns:
+        산 이름 리스트 (없으면 빈 리스트)
+    """
+    matcher = get_matcher(tuple(str(m).strip() for m in all_mountains))
+    names = matcher.extract(user_input)
+    if not names:
+        # "북한 산"처럼 띄어 쓴 경우
+        names = matcher.extract(user_input.replace(" ", ""))
+    return names
@@ -0,0 +1,132 @@
+# utils/intent_eval.py
+"""
+하이브리드 의도 분류 오프라인 평가
+
+data/intent_queries.csv(query, intent, has_previous)의 라벨된 질의로
+- 규칙(router)만으로 처리되는 비율 (LLM 호출 생략률)
+- 규칙 처리분의 라벨 일치율
+- 규칙 분류 지연 시간과 절약되는 LLM 지연 시간
+을 보고합니다.
+
+    python -m utils.intent_eval                  # LLM 지연은 --llm-ms 값으로 가정
+    python -m utils.intent_eval --live           # GEMINI_API_KEY로 실제 LLM 호출, 하이브리드 vs LLM 단독 비교
+    python -m utils.intent_eval --threshold 0.6
+"""
+import argparse
+import csv
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.router import CONFIDENCE_THRESHOLD, route_intent_with_confidence
+
+
+QUERIES_PATH = Path(__file__).resolve().parent.parent / "data" / "intent_queries.csv"
+
+
+def load_queries(path: Path = QUERIES_PATH) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [
+            {"query": r["query"], "intent": r["intent"], "has_previous": r.get("has_previous") == "1"}
+            for r in csv.DictReader(f)
+        ]
+
+
+def evaluate(
+    queries: List[Dict],
+    threshold: float = CONFIDENCE_THRESHOLD,
+    client=None,
+    llm_ms: float = 800.0,
+) -> Dict:
+    """
+    Args:
+        queries: load_queries() 결과
+        threshold: 규칙 결과를 그대로 쓸 최소 확신도
+        client: GeminiClient (있으면 전 질의에 LLM을 실제 호출하여 비교)
+        llm_ms: client가 없을 때 가정할 LLM 1회 지연(ms)
+
+    Returns:
+        평가 지표 딕셔너리
+    """
+    from utils.intent_classifier import classify_intent_with_llm
+
+    rows = []
+    for q in queries:
+        start = time.perf_counter()
+        intent, confidence = route_intent_with_confidence(q["query"], q["has_previous"])
+        rule_ms = (time.perf_counter() - start) * 1000
+
+        llm_intent, call_ms = None, llm_ms
+        if client is not None:
+            start = time.perf_counter()
+            llm_intent = classify_intent_with_llm(client, q["query"], q["has_previous"])
+            call_ms = (time.perf_counter() - start) * 1000
+
+        fast = confidence >= threshold
+        rows.append({
+            **q,
+            "rule": intent,
+            "confidence": confidence,
+            "fast": fast,
+            "rule_ms": rule_ms,
+            "llm": llm_intent,
+            "llm_ms": call_ms,
+            "hybrid": intent if fast else llm_intent,
+        })
+
+    fast_rows = [r for r in rows if r["fast"]]
+    result = {
+        "queries": len(rows),
+        "threshold": threshold,
+        "fast_path": len(fast_rows),
+        "fast_path_rate": len(fast_rows) / len(rows) if rows else 0.0,
+        "fast_path_agreement": (
+            sum(r["rule"] == r["intent"] for r in fast_rows) / len(fast_rows) if fast_rows else 0.0
+        ),
+        "rule_ms_mean": sum(r["rule_ms"] for r in rows) / len(rows) if rows else 0.0,
+        "llm_ms_mean": sum(r["llm_ms"] for r in rows) / len(rows) if rows else 0.0,
+        "saved_ms_total": sum(r["llm_ms"] - r["rule_ms"] for r in fast_rows),
+        "mistakes": [(r["query"], r["intent"], r["rule"], r["confidence"]) for r in fast_rows if r["rule"] != r["intent"]],
+    }
+    if client is not None:
+        result["llm_accuracy"] = sum(r["llm"] == r["intent"] for r in rows) / len(rows)
+        result["hybrid_accuracy"] = sum(r["hybrid"] == r["intent"] for r in rows) / len(rows)
+        result["hybrid_llm_agreement"] = sum(r["hybrid"] == r["llm"] for r in rows) / len(rows)
+    return result
+
+
+def _make_live_client():
+    from utils.llm_client import GeminiClient
+
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise SystemExit("--live 사용 시 GEMINI_API_KEY 환경변수가 필요합니다.")
+    return GeminiClient(api_key=api_key, model=os.environ.get("GEMINI_MODEL", "gemini-2.0-flash-exp"))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="하이브리드 의도 분류 평가")
+    parser.add_argument("--threshold", type=float, default=CONFIDENCE_THRESHOLD)
+    parser.add_argument("--llm-ms", type=float, default=800.0, help="LLM 1회 지연 가정치 (ms)")
+    parser.add_argument("--live", action="store_true", help="실제 LLM 호출")
+    args = parser.parse_args(argv)
+
+    client = _make_live_client() if args.live else None
+    r = evaluate(load_queries(), threshold=args.threshold, client=client, llm_ms=args.llm_ms)
+
+    print(f"질의 {r['queries']}개, 임계값 {r['threshold']}")
+    print(f"규칙 처리 {r['fast_path']}개 ({r['fast_path_rate']:.0%}), 라벨 일치율 {r['fast_path_agreement']:.1%}")
+    print(f"규칙 분류 평균 {r['rule_ms_mean'] * 1000:.1f}µs, LLM 평균 {r['llm_ms_mean']:.0f}ms"
+          + ("" if args.live else " (가정치)"))
+    print(f"절약된 LLM 지연 합계 {r['saved_ms_total'] / 1000:.1f}s "
+          f"(질의당 평균 {r['saved_ms_total'] / max(r['queries'], 1):.0f}ms)")
+    if args.live:
+        print(f"정확도: LLM 단독 {r['llm_accuracy']:.1%}, 하이브리드 {r['hybrid_accuracy']:.1%}, "
+              f"하이브리드-LLM 일치율 {r['hybrid_llm_agreement']:.1%}")
+    for query, label, predicted, confidence in r["mistakes"]:
+        print(f"  오분류: {query!r} 라벨={label} 규칙={predicted} ({confidence})")
+
+
+if __name__ == "__main__":
+    main()
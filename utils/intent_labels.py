@@ -0,0 +1,67 @@
+# utils/intent_labels.py
+"""
+LLM 의도 분류 결과 수집 (로컬 분류기 학습용 라벨)
+
+규칙(router)이 애매해 LLM으로 넘어간 실제 질의와 LLM이 고른 의도를
+data/intent_queries.csv와 같은 형식(query, intent, has_previous)의 CSV로 남깁니다.
+라벨이 충분히 쌓이면 이를 학습·평가 데이터로 씁니다.
+
+사용자 질의 원문이 남으므로 INTENT_LABEL_LOG=1일 때만 기록하고,
+파일이 MAX_LOG_BYTES를 넘으면 더 쓰지 않습니다.
+"""
+import csv
+import logging
+import os
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+LOG_PATH = ROOT_DIR / ".cache" / "intent_labels.csv"
+
+LABEL_LOG_ENV = "INTENT_LABEL_LOG"      # "1"이면 기록 (기본은 꺼짐)
+MAX_LOG_BYTES = 1_000_000               # 로그 최대 크기 (넘으면 기록 중단)
+
+
+def label_logging_enabled() -> bool:
+    """LLM 분류 질의를 기록할지 (INTENT_LABEL_LOG)"""
+    return os.environ.get(LABEL_LOG_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+_log_lock = threading.Lock()
+_log_full_warned = False
+
+
+def log_labeled(query: str, intent: str, has_previous: bool, path: Path = LOG_PATH,
+                max_bytes: int = MAX_LOG_BYTES) -> None:
+    """
+    LLM이 분류한 질의를 CSV에 추가 (실패해도 대화에는 영향 없음)
+
+    Args:
+        query: 사용자 입력 원문
+        intent: LLM이 고른 의도
+        has_previous: 이전 추천 결과가 있었는지 여부
+        path: 기록할 CSV 경로
+        max_bytes: 파일이 이 크기 이상이면 기록하지 않음
+    """
+    global _log_full_warned
+    if not label_logging_enabled():
+        return
+    try:
+        with _log_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            new_file = not path.exists()
+            if not new_file and path.stat().st_size >= max_bytes:
+                if not _log_full_warned:
+                    logger.warning("Intent label log %s reached %d bytes; not logging further", path, max_bytes)
+                    _log_full_warned = True
+                return
+            with open(path, "a", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(["query", "intent", "has_previous"])
+                writer.writerow([query, intent, "1" if has_previous else "0"])
+    except OSError as e:
+        logger.warning("Failed to write intent label: %s", e)
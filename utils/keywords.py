@@ -0,0 +1,117 @@
+# utils/keywords.py
+"""
+산별 리뷰 키워드 인덱스
+
+mountain_keywords.json({산 이름: {키워드: 빈도}})을 한 번만 읽어
+- 산별 빈도 내림차순 키워드 배열 (top-N 조회 시 재정렬 없음)
+- 역색인: 키워드 → [(산 이름, 빈도), ...] (빈도 내림차순)
+을 미리 만들어 두고, "운해", "단풍", "계곡" 같은 단어로 산을 순위화합니다.
+"""
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+KEYWORDS_PATH = Path(__file__).resolve().parent.parent / "data" / "mountain_keywords.json"
+
+
+class KeywordIndex:
+    """산별 top-N 키워드 배열 + 키워드 역색인"""
+
+    def __init__(self, keywords: Dict[str, Dict[str, int]]):
+        """
+        Args:
+            keywords: {산 이름: {키워드: 빈도}}
+        """
+        # 산별 키워드를 빈도 내림차순으로 한 번만 정렬
+        self._sorted: Dict[str, List[Tuple[str, int]]] = {
+            name: sorted(freq.items(), key=lambda x: x[1], reverse=True)
+            for name, freq in keywords.items()
+            if freq
+        }
+
+        inverted: Dict[str, List[Tuple[str, int]]] = {}
+        for name, items in self._sorted.items():
+            for keyword, count in items:
+                inverted.setdefault(keyword, []).append((name, count))
+        for postings in inverted.values():
+            postings.sort(key=lambda x: x[1], reverse=True)
+        self._inverted = inverted
+        self._vocabulary = tuple(inverted)
+
+        # 질의어 → 부분 일치 키워드 확장 결과 캐시 (예: "단풍" → "가을단풍", "단풍길", ...)
+        self._expand = lru_cache(maxsize=1024)(self._expand_uncached)
+
+    def __contains__(self, mountain_name: str) -> bool:
+        return mountain_name in self._sorted
+
+    @property
+    def mountains(self) -> List[str]:
+        return list(self._sorted)
+
+    # -------------------------------------------------------------------------
+    # 산별 top-N
+    # -------------------------------------------------------------------------
+    def top_keywords(self, mountain_name: str, n: int = 5) -> List[str]:
+        """빈도 상위 n개 키워드 이름"""
+        return [k for k, _ in self._sorted.get(mountain_name, [])[:n]]
+
+    def top_items(self, mountain_name: str, n: int = 65) -> Dict[str, int]:
+        """빈도 상위 n개 {키워드: 빈도} (빈도 내림차순)"""
+        return dict(self._sorted.get(mountain_name, [])[:n])
+
+    # -------------------------------------------------------------------------
+    # 역색인
+    # -------------------------------------------------------------------------
+    def _expand_uncached(self, term: str) -> Tuple[str, ...]:
+        term = term.strip()
+        if not term:
+            return ()
+        return tuple(k for k in self._vocabulary if term in k)
+
+    def postings(self, keyword: str, partial: bool = True) -> Dict[str, int]:
+        """
+        키워드가 등장하는 산과 빈도
+
+        Args:
+            keyword: 질의 키워드
+            partial: True면 질의어를 포함하는 모든 키워드 빈도를 합산
+
+        Returns:
+            {산 이름: 빈도 합}
+        """
+        keys = self._expand(keyword) if partial else (keyword,)
+        result: Dict[str, int] = {}
+        for key in keys:
+            for name, count in self._inverted.get(key, ()):
+                result[name] = result.get(name, 0) + count
+        return result
+
+    def rank_mountains(self, keywords: Iterable[str], top_k: int = 10, partial: bool = True) -> List[Tuple[str, int]]:
+        """
+        키워드 근거(빈도 합) 기준 산 순위
+
+        Returns:
+            [(산 이름, 점수), ...] 점수 내림차순
+        """
+        scores: Dict[str, int] = {}
+        for keyword in keywords:
+            for name, count in self.postings(keyword, partial=partial).items():
+                scores[name] = scores.get(name, 0) + count
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        return ranked[:top_k] if top_k else ranked
+
+
+@lru_cache(maxsize=1)
+def load_keyword_index(path: str = str(KEYWORDS_PATH)) -> KeywordIndex:
+    """키워드 JSON을 읽어 인덱스 생성 (프로세스당 1회)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("키워드 데이터 로드 실패: %s", e)
+        data = {}
+    return KeywordIndex(data or {})
@@ -0,0 +1,172 @@
+# utils/llm_cache.py
+"""
+LLM 응답 캐시
+
+(모델, 시스템 프롬프트 해시, 정규화한 사용자 프롬프트, temperature)를 키로
+메모리 LRU → 로컬 SQLite(TTL) 순서로 조회합니다.
+의도 분류·파라미터 변환처럼 낮은 temperature 호출만 캐시하고,
+대화형 응답 같은 높은 temperature 생성은 캐시하지 않습니다.
+SQLite 파일은 프로세스·세션 간에 공유되므로 같은 질문은 재시작 후에도 API를 호출하지 않습니다.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DB_PATH = ROOT_DIR / ".cache" / "llm_cache.sqlite"
+
+MEMORY_SIZE = 512
+TTL_SECONDS = 7 * 24 * 3600
+# 이 값보다 높은 temperature 호출은 기본적으로 캐시하지 않음
+MAX_CACHE_TEMPERATURE = 0.3
+
+
+def normalize_prompt(text: str) -> str:
+    """캐시 키용 프롬프트 정규화 (유니코드 NFC, 앞뒤 공백 제거, 연속 공백 하나로)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+    system_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+    payload = json.dumps(
+        [model, system_hash, normalize_prompt(user_prompt), round(float(temperature), 2)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """메모리 LRU + SQLite(TTL) 2단 캐시"""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = DB_PATH,
+        memory_size: int = MEMORY_SIZE,
+        ttl_seconds: float = TTL_SECONDS,
+    ):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (None이면 메모리 캐시만 사용)
+            memory_size: 메모리 LRU 항목 수
+            ttl_seconds: 항목 유효 기간 (초)
+        """
+        self.memory_size = memory_size
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()   # key → (저장 시각, 응답)
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        self._conn = self._open(db_path) if db_path is not None else None
+
+    @staticmethod
+    def _open(db_path: Path) -> Optional[sqlite3.Connection]:
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.commit()
+            return conn
+        except (OSError, sqlite3.Error) as e:
+            # 읽기 전용 배포 환경에서는 메모리 캐시만 사용
+            logger.warning("LLM 캐시 DB 열기 실패: %s", e)
+            return None
+
+    def _remember(self, key: str, created_at: float, response: str) -> None:
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 (없거나 만료되면 None)"""
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None and now - item[0] < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return item[1]
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT response, created_at FROM llm_cache WHERE key = ? AND created_at > ?",
+                        (key, now - self.ttl_seconds),
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning("LLM 캐시 조회 실패: %s", e)
+                    row = None
+                if row is not None:
+                    self._remember(key, row[1], row[0])
+                    self._stats["disk_hits"] += 1
+                    return row[0]
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, response)
+            self._stats["writes"] += 1
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response, now),
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("LLM 캐시 저장 실패: %s", e)
+
+    def purge_expired(self) -> int:
+        """만료된 디스크 항목 삭제, 삭제 건수 반환"""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at <= ?", (time.time() - self.ttl_seconds,)
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+    def stats(self) -> Dict[str, float]:
+        """
+        적중률 통계
+
+        Returns:
+            {"memory_hits", "disk_hits", "misses", "writes", "lookups", "hit_rate"}
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["lookups"] = hits + stats["misses"]
+        stats["hit_rate"] = hits / stats["lookups"] if stats["lookups"] else 0.0
+        return stats
+
+
+_default_cache: Optional[LLMCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMCache:
+    """프로세스 전역 캐시 (처음 사용할 때 SQLite 파일 열기)"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = LLMCache()
+    return _default_cache
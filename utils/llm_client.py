@@ -1,26 +1,225 @@
+import contextvars
+import functools
 import json
+import logging
+import os
+import threading
+import time
 import streamlit as st
-from typing import Any, Dict, Optional
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 import google.generativeai as genai
 
+from utils.llm_cache import LLMCache, MAX_CACHE_TEMPERATURE, get_default_cache, make_key
+from utils.llm_concurrency import PriorityLimiter, SingleFlight, get_default_limiter, get_default_single_flight
+from utils.llm_guard import (
+    BudgetExhaustedError, CircuitBreaker, CircuitOpenError, RetryPolicy,
+    call_timeout, is_breaker_failure, is_transient, remaining_budget
+)
+from utils.perf import record, summary
+from utils.prompt_encoding import DEFAULT_TOKEN_BUDGET, check_budget
+
+logger = logging.getLogger(__name__)
+
+
+# genai.configure는 프로세스 전역 설정이므로 키가 바뀔 때만 다시 호출
+_configure_lock = threading.Lock()
+_configured_key: Optional[str] = None
+
+
+def _configure(api_key: str) -> None:
+    global _configured_key
+    with _configure_lock:
+        if _configured_key != api_key:
+            genai.configure(api_key=api_key)
+            _configured_key = api_key
+
+
+# (모델명, system_instruction)별 모델 객체 캐시 크기 (호출마다 달라지는 프롬프트가 있어도 메모리 상한 유지)
+MODEL_CACHE_SIZE = 32
+
+
+@functools.lru_cache(maxsize=MODEL_CACHE_SIZE)
+def _get_model(model_name: str, system_prompt: str) -> genai.GenerativeModel:
+    return genai.GenerativeModel(model_name=model_name, system_instruction=system_prompt)
+
+
+class LLMBackend(ABC):
+    """
+    LLM 호출 백엔드 인터페이스
+
+    GeminiClient는 캐시·토큰 예산 확인만 하고 실제 생성은 백엔드에 위임합니다.
+    실제 Gemini API(GeminiBackend)와 오프라인 대역(utils.llm_stub.StubBackend)이 있습니다.
+    """
+
+    @abstractmethod
+    def generate(
+        self, model: str, system_prompt: str, user_prompt: str, temperature: float, timeout: Optional[float] = None
+    ) -> str:
+        """응답 전체 텍스트"""
+
+    @abstractmethod
+    def stream(
+        self, model: str, system_prompt: str, user_prompt: str, temperature: float, timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        """응답 텍스트 조각"""
+
+
+class GeminiBackend(LLMBackend):
+    """google.generativeai SDK로 실제 API 호출"""
+
+    def __init__(self, api_key: str):
+        _configure(api_key)
+
+    def get_model(self, model_name: str, system_prompt: str) -> genai.GenerativeModel:
+        """system_instruction이 적용된 모델 (최근 MODEL_CACHE_SIZE개 조합만 재사용)"""
+        return _get_model(model_name, system_prompt)
+
+    def generate(
+        self, model: str, system_prompt: str, user_prompt: str, temperature: float, timeout: Optional[float] = None
+    ) -> str:
+        response = self.get_model(model, system_prompt).generate_content(
+            user_prompt,
+            generation_config=genai.types.GenerationConfig(temperature=temperature),
+            request_options={"timeout": timeout} if timeout else None
+        )
+        return response.text
+
+    def stream(
+        self, model: str, system_prompt: str, user_prompt: str, temperature: float, timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        response = self.get_model(model, system_prompt).generate_content(
+            user_prompt,
+            generation_config=genai.types.GenerationConfig(temperature=temperature),
+            stream=True,
+            request_options={"timeout": timeout} if timeout else None
+        )
+        for chunk in response:
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
 
 class GeminiClient:
-    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.0-flash-exp"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gemini-2.0-flash-exp",
+        cache: Optional[LLMCache] = None,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        backend: Optional[LLMBackend] = None,
+        timeout: float = 15.0,
+        retry: RetryPolicy = RetryPolicy(),
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[PriorityLimiter] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ):
         """
         Gemini API 클라이언트 초기화
         
         Args:
-            api_key: API 키 (없으면 secrets에서 가져옴)
+            api_key: API 키 (없으면 secrets에서 가져옴, backend를 주면 사용하지 않음)
             model: 사용할 모델명
+            cache: 응답 캐시 (없으면 프로세스 전역 캐시)
+            token_budget: 호출 한 번에 허용할 추정 입력 토큰 (초과하면 보내지 않고 PromptBudgetExceeded)
+            backend: 실제 생성을 맡을 백엔드 (없으면 GeminiBackend)
+            timeout: 호출 1회 최대 대기 시간 (초, turn_budget 안이면 남은 예산으로 더 줄어듦)
+            retry: 일시적 오류 재시도 정책
+            breaker: 서킷 브레이커 (없으면 새로 생성, 공유 클라이언트이므로 모든 세션이 같은 상태를 봄)
+            limiter: 동시 호출 제한기 (없으면 프로세스 전역 제한기)
+            single_flight: 동일 요청 합치기 (없으면 프로세스 전역)
         """
-        self.api_key = api_key or st.secrets["GEMINI_API_KEY"]
+        if backend is None:
+            self.api_key = api_key or st.secrets["GEMINI_API_KEY"]
+            backend = GeminiBackend(self.api_key)
+        else:
+            self.api_key = api_key
         self.model = model
-        
-        # Gemini SDK 초기화
-        genai.configure(api_key=self.api_key)
-        self._client = genai.GenerativeModel(model_name=self.model)
+        self.backend = backend
+
+        self.cache = cache or get_default_cache()
+        self.token_budget = token_budget
+        self.timeout = timeout
+        self.retry = retry
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter or get_default_limiter()
+        self.single_flight = single_flight or get_default_single_flight()
+
+    def is_available(self) -> bool:
+        """서킷 브레이커가 닫혀 있어 LLM을 호출할 수 있는지 (False면 규칙 기반 대체 경로 사용)"""
+        return not self.breaker.is_open()
+
+    def _call_with_retry(self, call):
+        """
+        call(timeout)을 재시도·브레이커 규칙에 따라 실행
+
+        일시적 오류만 남은 턴 예산 안에서 재시도하고, 최종 실패는 브레이커에 기록합니다.
+        시도마다 전역 제한기의 슬롯을 받아서 호출하며, 재시도 대기 중에는 슬롯을 내려놓습니다.
+        """
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            with self.limiter.slot(timeout=remaining_budget()):
+                try:
+                    timeout = call_timeout(self.timeout)   # 예산을 다 썼으면 호출 전에 BudgetExhaustedError
+                except BudgetExhaustedError:
+                    if attempt > 1:
+                        self.breaker.record_failure()
+                    raise
+                if attempt == 1 and not self.breaker.allow():
+                    raise CircuitOpenError("LLM 서킷 브레이커가 열려 있습니다.")
+                try:
+                    result, error = call(timeout), None
+                except Exception as e:
+                    error = e
+
+            if error is None:
+                self.breaker.record_success()
+                record("llm:call", (time.perf_counter() - start) * 1000)
+                return result
+
+            record("llm:error", (time.perf_counter() - start) * 1000)
+            if not is_transient(error):
+                # 재시도하지 않음 (키·권한 오류는 브레이커 실패로 세고, 요청 자체의 문제는 상태를 바꾸지 않음)
+                if is_breaker_failure(error):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_ignored()
+                raise error
+            delay = self.retry.backoff(attempt)
+            remaining = remaining_budget()
+            if attempt < self.retry.max_attempts and (remaining is None or delay < remaining):
+                logger.warning("LLM 호출 재시도 %d/%d (%.2f초 후): %s", attempt, self.retry.max_attempts - 1, delay, error)
+                time.sleep(delay)
+                continue
+            self.breaker.record_failure()
+            raise error
 
-    def complete_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> str:
+    def metrics(self) -> Dict[str, Any]:
+        """
+        지표 내보내기
+
+        Returns:
+            {"breaker": 브레이커 상태, "latency": llm:* 지연 통계(p50/p95), "cache": 응답 캐시 적중률,
+             "limiter": 동시 호출/대기 수, "single_flight": 합쳐진 요청 수}
+        """
+        return {
+            "breaker": self.breaker.snapshot(),
+            "latency": {k: v for k, v in summary().items() if k.startswith("llm:")},
+            "cache": self.cache.stats(),
+            "limiter": self.limiter.stats(),
+            "single_flight": self.single_flight.stats(),
+        }
+
+    def complete_text(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        use_cache: Optional[bool] = None,
+    ) -> str:
         """
         Gemini API를 사용하여 텍스트 생성
         
@@ -28,35 +227,178 @@ class GeminiClient:
             system_prompt: 시스템 프롬프트 (역할 정의)
             user_prompt: 사용자 프롬프트 (실제 요청)
             temperature: 응답 다양성 (0.0~1.0, 높을수록 창의적)
+            use_cache: 응답 캐시 사용 여부 (None이면 temperature가 낮을 때만 사용)
             
         Returns:
             생성된 텍스트 (translation의 경우 JSON 문자열)
+
+        같은 요청(모델·프롬프트·temperature)이 동시에 들어오면 API는 한 번만 호출하고 결과를 나눠 씁니다.
         """
-        try:
-            # system_instruction과 함께 모델 생성
-            model = genai.GenerativeModel(
-                model_name=self.model,
-                system_instruction=system_prompt
-            )
-            
-            # generation_config 설정
-            generation_config = genai.types.GenerationConfig(
-                temperature=temperature
-            )
-            
-            # 텍스트 생성
-            response = model.generate_content(
-                user_prompt,
-                generation_config=generation_config
+        check_budget(system_prompt, user_prompt, budget=self.token_budget)
+
+        if use_cache is None:
+            use_cache = temperature <= MAX_CACHE_TEMPERATURE
+
+        key = make_key(self.model, system_prompt, user_prompt, temperature)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        def call() -> str:
+            text = self._call_with_retry(
+                lambda timeout: self.backend.generate(self.model, system_prompt, user_prompt, temperature, timeout)
             )
-            
-            return response.text
+            if use_cache and text:
+                self.cache.set(key, text)
+            return text
+
+        try:
+            # 같은 요청이 이미 진행 중이면 새로 호출하지 않고 그 결과를 받음
+            start = time.perf_counter()
+            text, shared = self.single_flight.do(key, call, timeout=remaining_budget())
+            if shared:
+                record("llm:coalesced", (time.perf_counter() - start) * 1000)
+            return text
             
         except Exception as e:
-            st.error(f"Gemini API 호출 오류: {e}")
+            # 화면 표시는 호출한 쪽의 대체 경로가 담당 (매 턴 st.error를 띄우지 않음)
+            logger.warning("Gemini API 호출 오류: %s", e)
             raise
 
 
+    def complete_many(
+        self,
+        requests: Sequence[Tuple[str, str, float]],
+        max_parallel: int = 4,
+    ) -> List[Optional[str]]:
+        """
+        서로 독립적인 여러 프롬프트를 동시에 호출하고 입력 순서대로 결과 반환
+
+        작업 스레드에서는 Streamlit API를 쓰지 않으며, 턴 예산·우선순위(contextvars)는 그대로 이어받습니다.
+        전역 제한기(limiter)가 있으므로 max_parallel은 이 턴이 한꺼번에 차지할 슬롯 수의 상한입니다.
+
+        Args:
+            requests: (system_prompt, user_prompt, temperature) 목록
+            max_parallel: 동시에 실행할 최대 호출 수
+
+        Returns:
+            응답 텍스트 목록 (실패한 항목은 None, 호출한 쪽에서 대체 문구 사용)
+        """
+        def run(request: Tuple[str, str, float]) -> Optional[str]:
+            try:
+                return self.complete_text(*request)
+            except Exception as e:
+                logger.warning("병렬 호출 실패: %s", e)
+                return None
+
+        if len(requests) <= 1:
+            return [run(r) for r in requests]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(requests))) as pool:
+            # 작업마다 현재 컨텍스트를 복사해서 실행 (같은 Context는 여러 스레드에서 동시에 못 씀)
+            futures = [pool.submit(contextvars.copy_context().run, run, r) for r in requests]
+            results = [f.result() for f in futures]
+        record("llm:gather", (time.perf_counter() - start) * 1000)
+        return results
+
+    def stream_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> Iterator[str]:
+        """
+        complete_text의 스트리밍 버전 (생성되는 대로 텍스트 조각을 yield)
+
+        API 호출은 첫 조각을 요청할 때 시작되며, 실패하면 예외가 그대로 전파됩니다.
+        (화면 표시 중 오류 처리는 stream_with_fallback 사용)
+        이미 보여 준 조각을 되돌릴 수 없으므로 재시도하지 않고, 타임아웃·브레이커·동시성 제한만 적용합니다.
+        (대화형 답변은 temperature가 높아 동일 요청 합치기는 하지 않음)
+
+        Args:
+            system_prompt: 시스템 프롬프트 (역할 정의)
+            user_prompt: 사용자 프롬프트 (실제 요청)
+            temperature: 응답 다양성 (0.0~1.0, 높을수록 창의적)
+
+        Yields:
+            생성된 텍스트 조각
+        """
+        check_budget(system_prompt, user_prompt, budget=self.token_budget)
+        # 스트리밍이 끝날 때까지 전역 제한기 슬롯을 잡고 있음
+        with self.limiter.slot(timeout=remaining_budget()):
+            timeout = call_timeout(self.timeout)
+            if not self.breaker.allow():
+                raise CircuitOpenError("LLM 서킷 브레이커가 열려 있습니다.")
+
+            start = time.perf_counter()
+            try:
+                yield from self.backend.stream(self.model, system_prompt, user_prompt, temperature, timeout)
+            except Exception as e:
+                record("llm:error", (time.perf_counter() - start) * 1000)
+                if is_breaker_failure(e):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_ignored()
+                raise
+            self.breaker.record_success()
+            record("llm:stream", (time.perf_counter() - start) * 1000)
+
+
+def stream_with_fallback(chunks: Iterator[str], fallback: str) -> Iterator[str]:
+    """
+    스트림을 그대로 흘려보내되, 실패하면 대체 문구로 마무리
+
+    - 첫 조각 전에 실패: fallback 전체를 yield
+    - 도중에 실패: 지금까지의 내용 뒤에 안내 문구만 덧붙임
+    """
+    started = False
+    try:
+        for chunk in chunks:
+            started = True
+            yield chunk
+    except Exception as e:
+        logger.warning("Gemini 스트리밍 오류: %s", e)
+        yield "\n\n(응답이 중간에 끊겼어요. 다시 시도해 주세요. 😅)" if started else fallback
+
+
+def get_backend_name() -> str:
+    """
+    사용할 LLM 백엔드 이름 (환경변수 LLM_BACKEND → secrets의 LLM_BACKEND → "gemini")
+
+    "stub"이면 API 없이 utils.llm_stub의 오프라인 대역을 사용합니다.
+    """
+    name = os.environ.get("LLM_BACKEND")
+    if not name:
+        try:
+            name = st.secrets.get("LLM_BACKEND")
+        except Exception:
+            # secrets.toml이 없는 환경
+            name = None
+    return str(name or "gemini").strip().lower()
+
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_client(
+    api_key: Optional[str],
+    model: str = "gemini-2.0-flash-exp",
+    backend_name: str = "gemini",
+) -> GeminiClient:
+    """
+    프로세스 전역 클라이언트 (api_key, model, 백엔드 조합별 1개, 모든 세션·rerun에서 공유)
+
+    Args:
+        api_key: API 키 (stub 백엔드는 사용하지 않음)
+        model: 사용할 모델명
+        backend_name: "gemini" 또는 "stub"
+
+    Returns:
+        공유 GeminiClient
+    """
+    if backend_name == "stub":
+        from utils.llm_stub import StubBackend
+
+        # 대역 응답이 실제 응답 캐시(SQLite)에 섞이지 않도록 메모리 캐시만 사용
+        return GeminiClient(model=model, backend=StubBackend.from_env(), cache=LLMCache(db_path=None))
+    return GeminiClient(api_key=api_key, model=model)
+
+
 def parse_json_strict(text: str) -> Dict[str, Any]:
     """
     LLM 출력에서 JSON을 안전하게 파싱
@@ -0,0 +1,240 @@
+# utils/llm_concurrency.py
+"""
+LLM 호출 동시성 제어
+
+- SingleFlight: 같은 요청이 동시에 여러 번 들어오면 한 번만 호출하고 결과를 나눠 줌
+  (여러 세션이 같은 첫 질문을 동시에 보낼 때 API 요청이 하나로 합쳐짐)
+  GeminiClient.complete_text(분류·변환 등)에만 적용하고, stream_text 스트리밍 답변은 합치지 않음
+- PriorityLimiter: 프로세스 전역 동시 호출 수 / 분당 호출 수 상한 + 우선순위 대기열
+  (대화 턴(INTERACTIVE)이 미리 계산(BACKGROUND)보다 먼저 슬롯을 받음)
+
+우선순위는 llm_priority()로 with 블록 단위로 지정합니다.
+"""
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+INTERACTIVE = 0
+BACKGROUND = 10
+
+
+# -----------------------------------------------------------------------------
+# 우선순위
+# -----------------------------------------------------------------------------
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """
+    with 블록 안 LLM 호출의 우선순위 지정 (작을수록 먼저)
+
+    사용 예:
+        with llm_priority(BACKGROUND):
+            warm_up_cache(client)
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+# -----------------------------------------------------------------------------
+# Single-flight
+# -----------------------------------------------------------------------------
+class _Flight:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """키가 같은 동시 호출을 하나로 합침 (완료된 결과는 보관하지 않음, 보관은 LLMCache 담당)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {"leaders": 0, "shared": 0}
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        같은 key로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn()을 직접 실행
+
+        Args:
+            key: 요청 식별 키
+            fn: 실제 호출
+            timeout: 다른 호출 결과를 기다릴 최대 시간 (초)
+
+        Returns:
+            (결과, 다른 호출의 결과를 받았는지)
+
+        Raises:
+            fn이 던진 예외 (기다리던 호출도 같은 예외를 받음), 대기 시간 초과 시 TimeoutError
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._stats["leaders"] += 1
+            else:
+                flight.followers += 1
+                self._stats["shared"] += 1
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise TimeoutError("동일 요청의 응답을 기다리다 시간이 초과되었습니다.")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._flights)}
+
+
+# -----------------------------------------------------------------------------
+# 우선순위 동시성 제한
+# -----------------------------------------------------------------------------
+class PriorityLimiter:
+    """
+    동시 호출 수와 분당 호출 수 상한을 지키며, 대기 중인 요청은 (우선순위, 도착 순서)대로 허용
+    """
+
+    def __init__(self, max_concurrent: int = 8, max_per_minute: Optional[int] = None):
+        """
+        Args:
+            max_concurrent: 동시에 진행할 수 있는 호출 수
+            max_per_minute: 최근 60초 동안 시작할 수 있는 호출 수 (None이면 제한 없음)
+        """
+        self.max_concurrent = max_concurrent
+        self.max_per_minute = max_per_minute
+        self._cond = threading.Condition()
+        self._waiting: list = []                 # (우선순위, 도착 순서) 힙
+        self._seq = itertools.count()
+        self._active = 0
+        self._starts: deque = deque()            # 최근 60초 호출 시작 시각
+        self._stats = {"granted": 0, "timeouts": 0, "max_waiting": 0}
+
+    def _rate_wait(self, now: float) -> float:
+        """분당 상한 때문에 더 기다려야 하는 시간 (0이면 바로 가능)"""
+        if self.max_per_minute is None:
+            return 0.0
+        while self._starts and now - self._starts[0] >= 60.0:
+            self._starts.popleft()
+        if len(self._starts) < self.max_per_minute:
+            return 0.0
+        return 60.0 - (now - self._starts[0])
+
+    @contextmanager
+    def slot(self, priority: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        슬롯을 받아 with 블록 실행
+
+        Args:
+            priority: 우선순위 (None이면 llm_priority()로 지정된 값)
+            timeout: 슬롯을 기다릴 최대 시간 (초)
+
+        Raises:
+            TimeoutError: timeout 안에 슬롯을 받지 못함
+        """
+        me = (current_priority() if priority is None else priority, next(self._seq))
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            heapq.heappush(self._waiting, me)
+            self._stats["max_waiting"] = max(self._stats["max_waiting"], len(self._waiting))
+            while True:
+                now = time.monotonic()
+                rate_wait = self._rate_wait(now)
+                if self._waiting[0] == me and self._active < self.max_concurrent and rate_wait == 0:
+                    heapq.heappop(self._waiting)
+                    self._active += 1
+                    self._starts.append(now)
+                    self._stats["granted"] += 1
+                    # 다음 순서가 남은 슬롯을 받을 수 있도록
+                    self._cond.notify_all()
+                    break
+
+                wait = rate_wait or None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._waiting.remove(me)
+                        heapq.heapify(self._waiting)
+                        self._stats["timeouts"] += 1
+                        self._cond.notify_all()
+                        raise TimeoutError("LLM 호출 슬롯을 기다리다 시간이 초과되었습니다.")
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {**self._stats, "active": self._active, "waiting": len(self._waiting)}
+
+
+_default_limiter: Optional[PriorityLimiter] = None
+_default_flight: Optional[SingleFlight] = None
+_default_lock = threading.Lock()
+
+
+def get_default_limiter() -> PriorityLimiter:
+    """
+    프로세스 전역 제한기 (모든 세션·클라이언트가 공유)
+
+    환경변수 LLM_MAX_CONCURRENCY(기본 8), LLM_MAX_RPM(기본 제한 없음)으로 설정
+    """
+    global _default_limiter
+    if _default_limiter is None:
+        with _default_lock:
+            if _default_limiter is None:
+                rpm = os.environ.get("LLM_MAX_RPM")
+                _default_limiter = PriorityLimiter(
+                    max_concurrent=int(os.environ.get("LLM_MAX_CONCURRENCY", "8")),
+                    max_per_minute=int(rpm) if rpm else None,
+                )
+    return _default_limiter
+
+
+def get_default_single_flight() -> SingleFlight:
+    """프로세스 전역 single-flight"""
+    global _default_flight
+    if _default_flight is None:
+        with _default_lock:
+            if _default_flight is None:
+                _default_flight = SingleFlight()
+    return _default_flight
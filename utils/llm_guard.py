@@ -0,0 +1,218 @@
+# utils/llm_guard.py
+"""
+LLM 호출 보호 장치
+
+- 턴 예산: 한 턴(사용자 입력 1회)의 지연 예산을 정해 두고, 호출마다 남은 시간만큼만 기다림
+- 재시도: 일시적 오류(타임아웃, 5xx, 429)만 지터를 준 지수 백오프로 재시도 (남은 예산 안에서)
+- 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 호출을 막고 규칙 기반 대체 경로를 쓰게 함
+
+GeminiClient가 이 모듈을 사용하며, 상태는 GeminiClient.metrics()로 확인합니다.
+"""
+import contextvars
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+try:
+    from google.api_core import exceptions as google_exceptions
+    _TRANSIENT_GOOGLE = (
+        google_exceptions.ServerError,          # 500, 503 등
+        google_exceptions.TooManyRequests,      # 429
+        google_exceptions.ResourceExhausted,
+        google_exceptions.DeadlineExceeded,
+    )
+    _UNAVAILABLE_GOOGLE = (
+        google_exceptions.Unauthenticated,      # 401 (키 오류)
+        google_exceptions.PermissionDenied,     # 403 (키 폐기, 권한 없음)
+    )
+except ImportError:
+    _TRANSIENT_GOOGLE = ()
+    _UNAVAILABLE_GOOGLE = ()
+
+_TRANSIENT = (TimeoutError, ConnectionError) + _TRANSIENT_GOOGLE
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+class BudgetExhaustedError(TimeoutError):
+    """턴 지연 예산을 다 써서 호출하지 않음"""
+
+
+def is_transient(error: Exception) -> bool:
+    """재시도하면 나아질 수 있는 오류인지"""
+    return isinstance(error, _TRANSIENT)
+
+
+def is_breaker_failure(error: Exception) -> bool:
+    """
+    서킷 브레이커 실패로 셀 오류인지
+
+    일시적 오류와, 재시도해도 소용없지만 이후 모든 호출이 실패할 키·권한 오류가 해당합니다.
+    그 밖의 오류(잘못된 요청 등)는 그 요청만의 문제이므로 브레이커 상태를 바꾸지 않습니다.
+    """
+    return isinstance(error, _TRANSIENT + _UNAVAILABLE_GOOGLE)
+
+
+# -----------------------------------------------------------------------------
+# 턴 예산
+# -----------------------------------------------------------------------------
+_turn_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("llm_turn_deadline", default=None)
+
+
+@contextmanager
+def turn_budget(seconds: float):
+    """
+    with 블록 안의 LLM 호출들이 합쳐서 seconds 안에 끝나도록 마감 시각 설정
+
+    사용 예:
+        with turn_budget(20):
+            intent, plan = classify_and_translate(...)
+    """
+    token = _turn_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _turn_deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """남은 턴 예산 (초, 예산이 없으면 None)"""
+    deadline = _turn_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout(default: float) -> float:
+    """
+    이번 호출의 타임아웃 (기본값과 남은 턴 예산 중 작은 값)
+
+    Raises:
+        BudgetExhaustedError: 남은 예산이 없음
+    """
+    remaining = remaining_budget()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise BudgetExhaustedError("턴 지연 예산을 모두 사용했습니다.")
+    return min(default, remaining)
+
+
+# -----------------------------------------------------------------------------
+# 재시도
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class RetryPolicy:
+    """일시적 오류 재시도 정책 (full jitter 지수 백오프)"""
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 2.0
+
+    def backoff(self, attempt: int, rng: random.Random = random) -> float:
+        """attempt번째 실패 후 대기 시간 (초)"""
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+# -----------------------------------------------------------------------------
+# 서킷 브레이커
+# -----------------------------------------------------------------------------
+class CircuitBreaker:
+    """
+    closed → (연속 실패 failure_threshold회) → open → (reset_timeout 경과) → half_open
+    half_open에서는 한 번만 시험 호출을 허용하고, 성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: 열릴 때까지의 연속 실패 횟수
+            reset_timeout: 열린 뒤 시험 호출을 허용하기까지의 시간 (초)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._trips = 0
+
+    def _refresh(self) -> None:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def is_open(self) -> bool:
+        """호출이 막혀 있는지 (시험 호출 기회는 소비하지 않음)"""
+        return self.state == self.OPEN
+
+    def allow(self) -> bool:
+        """호출해도 되는지 (half_open이면 시험 호출 1회만 허용)"""
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            # 시험 호출이 결과 없이 끝난 경우(대기 시간 초과 등)를 대비해 오래되면 새 시험 호출 허용
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN and (not self._probing or now - self._probe_started >= self.reset_timeout):
+                self._probing = True
+                self._probe_started = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._refresh()
+            if self._state == self.OPEN:
+                # 열리기 전에 시작된 호출의 성공은 무시 (복구 판단은 half_open 시험 호출로)
+                return
+            if self._state == self.HALF_OPEN:
+                logger.info("LLM 서킷 브레이커 닫힘 (upstream 복구)")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_ignored(self) -> None:
+        """상태 판단에 쓰지 않을 결과 (실패 횟수는 그대로, half_open 시험 호출 기회만 돌려줌)"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._trips += 1
+                    logger.warning("LLM 서킷 브레이커 열림 (%.0f초 동안 규칙 기반 대체 경로 사용)", self.reset_timeout)
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def snapshot(self) -> Dict:
+        """지표용 상태 {"state", "consecutive_failures", "trips", "open_for_s"}"""
+        with self._lock:
+            self._refresh()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "trips": self._trips,
+                "open_for_s": time.monotonic() - self._opened_at if self._state == self.OPEN else 0.0,
+            }
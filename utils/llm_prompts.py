@@ -1,4 +1,5 @@
 # llm_prompts.py
+from utils.prompt_encoding import encode_table
 
 TRANSLATE_SYSTEM_PROMPT = """당신은 '등산로 추천 시스템'의 번역기입니다.
 
@@ -35,6 +36,7 @@ TRANSLATE_SYSTEM_PROMPT = """당신은 '등산로 추천 시스템'의 번역기
 - 짧게/가볍게 -> distance_max_km 낮게 (5km 이하)
 - 높은 산/고산/높이 -> altitude_min_m 높게 (1000m 이상)
 - 단풍/벚꽃/계절 -> seasonal 클러스터
+- 운해/단풍/계곡/철쭉/억새/설경 같은 구체적 경관 단어 -> keywords에 그대로 넣기 (리뷰 키워드 근거로 가산점)
 
 반드시 아래 스키마로만 출력하세요(키 이름/구조 고정):
 {
@@ -54,6 +56,7 @@ TRANSLATE_SYSTEM_PROMPT = """당신은 '등산로 추천 시스템'의 번역기
     "mountains": [string],
     "trails": [string]
   },
+  "keywords": [string],
   "unavailable_needs": [string],
   "clarifying_questions": [string],
   "notes_for_ui": string
@@ -80,6 +83,45 @@ def make_translate_user_prompt(user_message: str, intent: str, last_plan=None) -
     return prompt
 
 
+ROUTE_TRANSLATE_SYSTEM_PROMPT = """당신은 '등산로 추천 시스템'의 의도 분류기 겸 번역기입니다.
+한 번의 응답으로 (1) 사용자 입력의 의도를 분류하고 (2) 추천 관련 의도면 추천 엔진 파라미터로 변환합니다.
+
+의도(intent)는 다음 중 하나:
+- recommend: 새로운 등산로 추천 요청 (산 이름만, 스타일/난이도 키워드만 있어도 추천 요청)
+- refine: 이전 추천 수정 요청 ("더 쉬운 곳", "별로야", "다른 거")
+- explain: 추천 이유나 특정 코스 상세 설명 요청 ("왜 추천했어?", "가리산 01코스 설명해줘")
+- question: 산이나 등산에 대한 일반 정보 질문 ("북한산은 어떤 산이야?")
+- other: 인사, 잡담, 등산과 무관한 요청
+맥락이 애매하면 recommend로 분류합니다.
+
+intent가 recommend 또는 refine이면 plan에 아래 번역 규칙과 스키마를 따른 객체를,
+그 외 의도면 plan에 null을 넣습니다.
+
+""" + TRANSLATE_SYSTEM_PROMPT.split("\n", 1)[1] + """
+최종 출력은 반드시 아래 형태의 JSON 하나입니다(설명/마크다운/코드펜스 금지):
+{
+  "intent": "recommend" | "refine" | "explain" | "question" | "other",
+  "plan": { 위 스키마 } | null
+}
+"""
+
+
+def make_route_translate_user_prompt(user_message: str, has_previous_results: bool = False, last_plan=None) -> str:
+    """의도 분류 + Translation 통합 호출용 사용자 프롬프트 생성"""
+    prompt = f"""사용자 입력: "{user_message}"
+"""
+    if has_previous_results:
+        prompt += "\n참고: 이전에 추천 결과가 있습니다. 사용자가 그것에 대해 말하는 것일 수 있습니다.\n"
+    if last_plan:
+        prompt += f"""
+이전 추천 파라미터 (refine일 때 피드백을 반영하여 조정):
+- 클러스터: {last_plan.get('cluster_preference', 'any')}
+- 제약조건: {last_plan.get('constraints', {})}
+"""
+    prompt += "\nJSON만 출력하세요."
+    return prompt
+
+
 EXPLAIN_SYSTEM_PROMPT = """당신은 추천 결과를 간단하고 납득되게 설명하는 역할입니다.
 
 규칙:
@@ -91,11 +133,14 @@ EXPLAIN_SYSTEM_PROMPT = """당신은 추천 결과를 간단하고 납득되게
 
 
 def make_explain_user_prompt(user_message: str, plan: dict, top_items: list) -> str:
-    """Explain용 사용자 프롬프트 생성"""
-    items_str = "\n".join([
-        f"- {item['산이름']} {item['코스명']}: 난이도 {item['세부난이도']}, 인프라 {item['관광인프라점수']:.1f}, 매력도 {item['매력종합점수']:.1f}"
-        for item in top_items
-    ])
+    """Explain용 사용자 프롬프트 생성 (추천 목록은 표 형식)"""
+    items_str = encode_table(
+        ("산", "코스", "난이도", "인프라", "매력도"),
+        (
+            (item['산이름'], item['코스명'], item['세부난이도'], item['관광인프라점수'], item['매력종합점수'])
+            for item in top_items
+        ),
+    )
     
     return f"""사용자 메시지: {user_message}
 
@@ -104,7 +149,7 @@ def make_explain_user_prompt(user_message: str, plan: dict, top_items: list) ->
 - 제약조건: {plan.get('constraints', {})}
 - 해석 메모: {plan.get('notes_for_ui', '')}
 
-추천된 등산로 TOP 3:
+추천된 등산로 TOP 3 ('|' 구분 표, 인프라/매력도는 점수):
 {items_str}
 
 위 정보만으로 추천 이유를 설명하세요."""
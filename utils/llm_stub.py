@@ -0,0 +1,361 @@
+# utils/llm_stub.py
+"""
+오프라인 LLM 대역 (Gemini API 없이 지연 시간·동시성 측정용)
+
+프롬프트 종류를 보고 규칙으로 응답을 만듭니다.
+- 의도 분류: router 규칙 결과
+- 파라미터 변환 / 통합 분류·변환: plan_parser 규칙으로 만든 plan JSON
+- 그 외(설명·질의응답·05_chat 대화): 데이터베이스 표의 첫 코스를 쓰거나 고정 문구
+첫 토큰 지연과 조각당 지연은 로그정규 분포에서 뽑아 실제 API와 비슷한 분산을 흉내 냅니다.
+
+사용:
+    LLM_BACKEND=stub streamlit run main.py        # 챗봇 페이지를 API 없이 실행
+    python -m utils.llm_stub --sessions 8 --turns 6 # 동시 세션 부하 측정
+    python -m utils.llm_stub --sessions 8 --same-opening --background 4
+                                                  # 같은 첫 질문 동시 전송 + 낮은 우선순위 작업과 경쟁
+    (같은 첫 질문은 규칙으로 처리되지 않고 LLM 분류·변환까지 가는 질의로 고릅니다.
+     스트리밍 답변은 동일 요청 합치기 대상이 아니므로 합쳐지는 것은 분류·변환 호출입니다.)
+
+환경변수:
+    LLM_STUB_TTFT_MS="600:0.4"   첫 토큰 지연 중앙값(ms):로그정규 sigma
+    LLM_STUB_CHUNK_MS="40:0.5"   조각당 지연
+    LLM_STUB_CONCURRENCY=4       동시 처리 상한 (API 동시 요청 제한 흉내, 비우면 무제한)
+    LLM_STUB_FAILURE_RATE=0.1    호출이 일시적 오류(ConnectionError)로 실패할 확률 (재시도·브레이커 확인용)
+    LLM_STUB_SEED=0              지연 난수 시드
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+from utils.intent_classifier import INTENT_SYSTEM_PROMPT
+from utils.llm_client import LLMBackend
+from utils.llm_prompts import ROUTE_TRANSLATE_SYSTEM_PROMPT, TRANSLATE_SYSTEM_PROMPT
+from utils.plan_parser import parse_plan
+from utils.router import route_intent_with_confidence
+
+
+STUB_NOTE = "오프라인 대역 응답"
+
+_USER_MESSAGE = re.compile(r'사용자 입력: "(.*)"')
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """로그정규 지연 분포 (중앙값 median_ms, 퍼짐 sigma)"""
+    median_ms: float
+    sigma: float = 0.0
+    min_ms: float = 0.0
+
+    @classmethod
+    def parse(cls, text: str) -> "LatencyModel":
+        """"600" 또는 "600:0.4" 형식"""
+        median, _, sigma = str(text).partition(":")
+        return cls(float(median), float(sigma or 0.0))
+
+    def sample(self, rng: random.Random) -> float:
+        """지연 한 번 (초)"""
+        ms = self.median_ms * math.exp(self.sigma * rng.gauss(0.0, 1.0)) if self.sigma else self.median_ms
+        return max(self.min_ms, ms) / 1000
+
+
+def rule_plan(message: str, intent: str) -> Dict:
+    """규칙 변환기(plan_parser)로 추천 엔진 plan 생성 (번역기 스키마와 같은 키)"""
+    plan, _ = parse_plan(message, intent)
+    plan["notes_for_ui"] = STUB_NOTE
+    return plan
+
+
+def _first_course(user_prompt: str) -> Optional[Dict[str, str]]:
+    """05_chat 데이터베이스 표('## 코스')의 첫 행"""
+    _, found, rest = user_prompt.partition("## 코스\n")
+    lines = rest.split("\n")
+    if not found or len(lines) < 2 or "|" not in lines[1]:
+        return None
+    return dict(zip(lines[0].split("|"), lines[1].split("|")))
+
+
+class StubBackend(LLMBackend):
+    """규칙 응답 + 지연 분포를 흉내 내는 백엔드"""
+
+    def __init__(
+        self,
+        first_token: LatencyModel = LatencyModel(600, 0.4),
+        per_chunk: LatencyModel = LatencyModel(40, 0.5),
+        chunk_chars: int = 20,
+        answer_chars: int = 400,
+        max_concurrency: Optional[int] = None,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            first_token: 요청부터 첫 조각까지 지연
+            per_chunk: 이후 조각 사이 지연
+            chunk_chars: 조각당 글자 수
+            answer_chars: 고정 문구 답변 길이 (실제 답변과 비슷한 조각 수를 만들기 위함)
+            max_concurrency: 동시 처리 상한 (넘는 요청은 대기, None이면 무제한)
+            failure_rate: 첫 토큰 전에 일시적 오류로 실패할 확률
+            seed: 지연 난수 시드
+        """
+        self.first_token = first_token
+        self.per_chunk = per_chunk
+        self.chunk_chars = chunk_chars
+        self.answer_chars = answer_chars
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @classmethod
+    def from_env(cls) -> "StubBackend":
+        """LLM_STUB_* 환경변수로 설정"""
+        concurrency = os.environ.get("LLM_STUB_CONCURRENCY")
+        seed = os.environ.get("LLM_STUB_SEED")
+        return cls(
+            first_token=LatencyModel.parse(os.environ.get("LLM_STUB_TTFT_MS", "600:0.4")),
+            per_chunk=LatencyModel.parse(os.environ.get("LLM_STUB_CHUNK_MS", "40:0.5")),
+            max_concurrency=int(concurrency) if concurrency else None,
+            failure_rate=float(os.environ.get("LLM_STUB_FAILURE_RATE", "0")),
+            seed=int(seed) if seed else None,
+        )
+
+    def _sample(self, latency: LatencyModel) -> float:
+        with self._rng_lock:
+            return latency.sample(self._rng)
+
+    def _wait_first_token(self, timeout: Optional[float]) -> None:
+        """첫 토큰까지 대기 (실패 주입, 타임아웃 적용)"""
+        with self._rng_lock:
+            failed = self._rng.random() < self.failure_rate
+        seconds = self._sample(self.first_token)
+        if timeout is not None and seconds > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"stub: 첫 토큰 지연 {seconds:.2f}초가 타임아웃 {timeout:.2f}초 초과")
+        time.sleep(seconds)
+        if failed:
+            raise ConnectionError("stub: upstream 503")
+
+    def _enter(self) -> None:
+        if self._slots is not None:
+            self._slots.acquire()
+        with self._stats_lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _exit(self) -> None:
+        with self._stats_lock:
+            self.in_flight -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def respond(self, system_prompt: str, user_prompt: str) -> str:
+        """프롬프트 종류별 규칙 응답 (지연 없음)"""
+        m = _USER_MESSAGE.search(user_prompt)
+        message = m.group(1) if m else user_prompt
+        has_previous = "이전에 추천 결과가 있습니다" in user_prompt
+
+        if system_prompt in (INTENT_SYSTEM_PROMPT, ROUTE_TRANSLATE_SYSTEM_PROMPT):
+            intent, confidence = route_intent_with_confidence(message, has_previous)
+            # LLM 프롬프트 규칙: 애매하면 recommend
+            if intent == "other" and confidence < 0.5:
+                intent = "recommend"
+            if system_prompt == INTENT_SYSTEM_PROMPT:
+                return intent
+            plan = rule_plan(message, intent) if intent in ("recommend", "refine") else None
+            return json.dumps({"intent": intent, "plan": plan}, ensure_ascii=False)
+
+        if system_prompt == TRANSLATE_SYSTEM_PROMPT:
+            intent = "refine" if "의도(intent): refine" in user_prompt else "recommend"
+            return json.dumps(rule_plan(message, intent), ensure_ascii=False)
+
+        course = _first_course(user_prompt)
+        if course is not None:
+            return (
+                f"**{course.get('산', '-')} {course.get('코스', '-')}** 코스를 추천해요! 🏔️\n"
+                f"- 난이도: {course.get('난이도', '-')}\n"
+                f"- 예상 시간: {course.get('시간', '-')}\n"
+                f"- 특출 매력: {course.get('특출', '-')}\n\n({STUB_NOTE})"
+            )
+
+        head = f"({STUB_NOTE}) 테스트용 답변입니다. "
+        filler = "등산로 데이터에 기반한 설명이 이어집니다. "
+        return head + filler * max(0, (self.answer_chars - len(head)) // len(filler))
+
+    def _chunks(self, text: str) -> List[str]:
+        return [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)] or [""]
+
+    def generate(
+        self, model: str, system_prompt: str, user_prompt: str, temperature: float, timeout: Optional[float] = None
+    ) -> str:
+        text = self.respond(system_prompt, user_prompt)
+        self._enter()
+        try:
+            self._wait_first_token(timeout)
+            time.sleep(sum(self._sample(self.per_chunk) for _ in self._chunks(text)[1:]))
+        finally:
+            self._exit()
+        return text
+
+    def stream(
+        self, model: str, system_prompt: str, user_prompt: str, temperature: float, timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        text = self.respond(system_prompt, user_prompt)
+        self._enter()
+        try:
+            self._wait_first_token(timeout)
+            for i, chunk in enumerate(self._chunks(text)):
+                if i:
+                    time.sleep(self._sample(self.per_chunk))
+                yield chunk
+        finally:
+            self._exit()
+
+
+class _StubChat:
+    """google.genai chats 세션 대역 (send_message_stream만 지원)"""
+
+    def __init__(self, backend: StubBackend, model: str, system_instruction: str):
+        self._backend = backend
+        self._model = model
+        self._system = system_instruction
+
+    def send_message_stream(self, message: str):
+        for text in self._backend.stream(self._model, self._system, message, 0.7):
+            yield SimpleNamespace(text=text)
+
+
+class StubChatClient:
+    """05_chat이 쓰는 google.genai Client의 chats.create 대역"""
+
+    def __init__(self, backend: Optional[StubBackend] = None):
+        self.backend = backend or StubBackend.from_env()
+        self.chats = SimpleNamespace(create=self._create_chat)
+
+    def _create_chat(self, model: str, config=None, history=None) -> _StubChat:
+        return _StubChat(self.backend, model, getattr(config, "system_instruction", "") or "")
+
+
+def needs_llm(query: str, has_previous: bool = False) -> bool:
+    """classify_and_translate가 이 질의에 LLM을 부르는지 (의도 규칙·plan 규칙으로 끝나지 않는지)"""
+    from utils.plan_parser import PLAN_CONFIDENCE_THRESHOLD
+    from utils.router import CONFIDENCE_THRESHOLD, route_intent_with_confidence
+    from utils.translator import PLAN_INTENTS
+
+    intent, confidence = route_intent_with_confidence(query, has_previous)
+    if confidence < CONFIDENCE_THRESHOLD:
+        return True
+    return intent in PLAN_INTENTS and parse_plan(query, intent, None)[1] < PLAN_CONFIDENCE_THRESHOLD
+
+
+def run_load(
+    sessions: int,
+    turns: int,
+    backend: StubBackend,
+    turn_budget_s: float = 20.0,
+    same_opening: bool = False,
+    background: int = 0,
+) -> Dict:
+    """
+    세션 sessions개가 동시에 turns턴씩 (의도/plan 결정 → 스트리밍 답변) 수행
+
+    Args:
+        same_opening: 모든 세션의 첫 질문을 LLM까지 가는 같은 질의로 (동일 요청 합치기 확인,
+            스트리밍 답변은 합치지 않으므로 분류·변환 호출만 합쳐짐)
+        background: 함께 돌릴 BACKGROUND 우선순위 작업 수 (작업당 turns회 호출)
+
+    Returns:
+        {"turns", "elapsed_s", "turns_per_s", "peak_in_flight", "opening",
+         "metrics": client.metrics(), "perf": perf.summary()}
+    """
+    from utils import perf
+    from utils.intent_eval import load_queries
+    from utils.llm_cache import LLMCache
+    from utils.llm_client import GeminiClient, stream_with_fallback
+    from utils.llm_concurrency import BACKGROUND, llm_priority
+    from utils.llm_guard import turn_budget
+    from utils.llm_prompts import QA_SYSTEM_PROMPT
+    from utils.translator import classify_and_translate
+
+    client = GeminiClient(model="stub", backend=backend, cache=LLMCache(db_path=None))
+    queries = load_queries()
+    opening = next((q for q in queries if needs_llm(q["query"])), queries[0])
+
+    def session(n: int) -> None:
+        last_plan = None
+        for t in range(turns):
+            q = opening if same_opening and t == 0 else queries[(n * turns + t) % len(queries)]
+            # 05_chatbot과 같은 턴 구성 (턴 예산, 스트림 실패 시 대체 문구)
+            with perf.timed("load:turn"), turn_budget(turn_budget_s):
+                with perf.timed("load:classify_and_translate"):
+                    intent, plan = classify_and_translate(client, q["query"], last_plan is not None, last_plan)
+                last_plan = plan or last_plan
+                answer = perf.timed_stream("load:answer", client.stream_text(QA_SYSTEM_PROMPT, q["query"]))
+                for _ in stream_with_fallback(answer, "fallback"):
+                    pass
+
+    def background_job(n: int) -> None:
+        # 미리 계산 흉내: 캐시를 쓰지 않는 낮은 우선순위 호출
+        with llm_priority(BACKGROUND):
+            for t in range(turns):
+                with perf.timed("load:background"):
+                    client.complete_text(QA_SYSTEM_PROMPT, f"미리 계산 {n}-{t}", temperature=0.0, use_cache=False)
+
+    perf.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions + background) as pool:
+        jobs = [pool.submit(background_job, n) for n in range(background)]
+        jobs += [pool.submit(session, n) for n in range(sessions)]
+        for job in jobs:
+            job.result()
+    elapsed = time.perf_counter() - start
+    return {
+        "turns": sessions * turns,
+        "elapsed_s": elapsed,
+        "turns_per_s": sessions * turns / elapsed if elapsed else 0.0,
+        "peak_in_flight": backend.peak_in_flight,
+        "opening": opening["query"] if same_opening else None,
+        "metrics": client.metrics(),
+        "perf": perf.summary(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="오프라인 LLM 대역으로 챗봇 파이프라인 부하 측정")
+    parser.add_argument("--sessions", type=int, default=4, help="동시 세션 수")
+    parser.add_argument("--turns", type=int, default=5, help="세션당 턴 수")
+    parser.add_argument("--same-opening", action="store_true", help="모든 세션이 같은 첫 질문을 동시에 보냄")
+    parser.add_argument("--background", type=int, default=0, help="낮은 우선순위 작업 수")
+    args = parser.parse_args(argv)
+
+    r = run_load(
+        args.sessions, args.turns, StubBackend.from_env(),
+        same_opening=args.same_opening, background=args.background,
+    )
+    print(f"{r['turns']}턴 / {r['elapsed_s']:.2f}s = {r['turns_per_s']:.2f} 턴/s, 최대 동시 호출 {r['peak_in_flight']}")
+    breaker = r["metrics"]["breaker"]
+    print(f"서킷 브레이커 {breaker['state']} (열림 {breaker['trips']}회), 캐시 적중률 {r['metrics']['cache']['hit_rate']:.0%}")
+    flight, limiter = r["metrics"]["single_flight"], r["metrics"]["limiter"]
+    if args.same_opening:
+        print(f"같은 첫 질문: {r['opening']!r}")
+    print(f"동일 요청 합치기: 실제 호출 {flight['leaders']}회, 합쳐진 요청 {flight['shared']}회 / "
+          f"제한기 최대 대기 {limiter['max_waiting']}개, 시간 초과 {limiter['timeouts']}회")
+    for label, s in sorted(r["perf"].items()):
+        print(f"  {label:32s} n={s['count']:4d} p50={s['p50_ms']:7.0f}ms p95={s['p95_ms']:7.0f}ms max={s['max_ms']:7.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# utils/mountain_map.py
+"""
+04_mountain 지도 구성
+
+전체 산 마커가 올라간 기본 지도는 데이터 버전별로 한 번만 만들어 캐시하고,
+선택된 산 강조 마커는 별도 FeatureGroup으로 st_folium(feature_group_to_add=...)에 넘깁니다.
+
+streamlit-folium은 feature_group_to_add를 전달받은 지도에 add_to()로 붙이므로,
+캐시된 기본 지도를 그대로 넘기면 이전 선택(다른 세션 포함)의 강조 마커가 쌓입니다.
+그래서 렌더링할 때마다 map_for_render()로 복사본을 넘겨 캐시된 객체는 바꾸지 않습니다.
+(folium의 render()도 호출할 때마다 지도 스크립트를 덧붙이므로 캐시된 지도는 직접 렌더링하지 않음)
+
+    python -m utils.mountain_map --check     # 기본 지도 재사용, 확대 수준별 클릭 허용 반경 점검
+"""
+import argparse
+import copy
+from pathlib import Path
+from typing import List, Optional
+
+import folium
+import pandas as pd
+
+
+MAP_ZOOM_START = 7
+
+
+def build_base_map(df: pd.DataFrame) -> folium.Map:
+    """
+    전체 산 CircleMarker가 올라간 기본 지도
+
+    Args:
+        df: mountain_name, lat, lon 컬럼이 있는 산 목록
+    """
+    base_map = folium.Map(
+        location=[float(df["lat"].mean()), float(df["lon"].mean())],
+        zoom_start=MAP_ZOOM_START,
+        control_scale=True,
+        prefer_canvas=True
+    )
+
+    # 100개 마커를 개별 CircleMarker 대신 GeoJson 레이어 하나로 그려 렌더링 비용을 줄임
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [float(lon), float(lat)]},
+            "properties": {"name": name},
+        }
+        for name, lat, lon in zip(df["mountain_name"], df["lat"], df["lon"])
+    ]
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        name="mountains",
+        marker=folium.CircleMarker(
+            radius=6,
+            color="#689634",
+            fill=True,
+            fill_color="#689634",
+            fill_opacity=0.6,
+            weight=2,
+        ),
+        popup=folium.GeoJsonPopup(fields=["name"], labels=False, max_width=200),
+        tooltip=folium.GeoJsonTooltip(fields=["name"], labels=False),
+    ).add_to(base_map)
+    return base_map
+
+
+def map_for_render(base_map: folium.Map) -> folium.Map:
+    """
+    st_folium에 넘길 기본 지도 복사본
+
+    요소 id가 그대로 복사되므로 선택이 바뀌어도 기본 지도 스크립트는 같고,
+    강조 레이어는 복사본에만 붙습니다.
+    """
+    return copy.deepcopy(base_map)
+
+
+def build_highlight_layer(row) -> folium.FeatureGroup:
+    """선택된 산 강조(펄스) 마커만 담은 오버레이 레이어"""
+    layer = folium.FeatureGroup(name="selected_mountain")
+    if row is None:
+        return layer
+
+    name = row["mountain_name"]
+    folium.Marker(
+        location=[float(row["lat"]), float(row["lon"])],
+        popup=folium.Popup(name, max_width=200),
+        tooltip=folium.Tooltip(name, permanent=False),
+        icon=folium.DivIcon(html=f'''
+            <div style="
+                position: relative;
+                width: 20px;
+                height: 20px;
+            ">
+                <div style="
+                    position: absolute;
+                    width: 20px;
+                    height: 20px;
+                    background-color: #ff0066;
+                    border-radius: 50%;
+                    animation: pulse 1.5s infinite;
+                "></div>
+                <div style="
+                    position: absolute;
+                    width: 20px;
+                    height: 20px;
+                    background-color: #ff0066;
+                    border-radius: 50%;
+                    box-shadow: 0 0 0 0 rgba(255, 0, 102, 1);
+                "></div>
+            </div>
+            <style>
+                @keyframes pulse {{
+                    0% {{ transform: scale(1); opacity: 1; }}
+                    50% {{ transform: scale(1.5); opacity: 0.5; }}
+                    100% {{ transform: scale(1); opacity: 1; }}
+                }}
+            </style>
+        ''')
+    ).add_to(layer)
+    return layer
+
+
+# -----------------------------------------------------------------------------
+# 점검
+# -----------------------------------------------------------------------------
+def _render_like_st_folium(base_map: folium.Map, row) -> str:
+    """st_folium과 같은 순서로 렌더링하고 기본 지도 스크립트 반환 (강조 레이어는 그 뒤에 붙음)"""
+    from streamlit_folium import _get_feature_group_string, _get_map_string
+
+    m = map_for_render(base_map)
+    base_script = _get_map_string(m)
+    _get_feature_group_string(build_highlight_layer(row), m)
+    return base_script
+
+
+def check_base_map_unchanged(df: pd.DataFrame) -> List[str]:
+    """
+    선택을 바꿔 두 번 렌더링했을 때 기본 지도 출력이 같고 캐시된 지도가 바뀌지 않는지 확인
+
+    Returns:
+        발견한 문제 목록 (비어 있으면 통과)
+    """
+    problems = []
+    base_map = build_base_map(df)
+    # folium의 render()는 호출할 때마다 스크립트를 덧붙이므로 출력 대신 자식 요소로 비교
+    before = list(base_map._children)
+    first, second = df.iloc[0], df.iloc[1]
+
+    script_a = _render_like_st_folium(base_map, first)
+    script_b = _render_like_st_folium(base_map, second)
+    if script_a != script_b:
+        problems.append("선택에 따라 기본 지도 스크립트가 달라짐")
+    if first["mountain_name"] in script_b:
+        problems.append(f"두 번째 렌더링에 이전 선택({first['mountain_name']}) 강조 마커가 남음")
+    if list(base_map._children) != before:
+        problems.append("캐시된 기본 지도 객체가 변경됨")
+    return problems
+
+
+def check_click_tolerance(df: pd.DataFrame, tolerance_px: float = 15, offset_m: float = 2000) -> List[str]:
+    """
+    산에서 offset_m 떨어진 곳을 클릭했을 때 넓게 본 지도에서는 선택되고 확대한 지도에서는 선택되지 않는지 확인
+
+    Returns:
+        발견한 문제 목록 (비어 있으면 통과)
+    """
+    from utils.geo import NearestPointIndex, meters_per_pixel
+
+    index = NearestPointIndex(df["mountain_name"].tolist(), df["lat"], df["lon"])
+    row = df.iloc[0]
+    lat = float(row["lat"]) + offset_m / 111_320    # 북쪽으로 offset_m
+    lon = float(row["lon"])
+
+    problems = []
+    for zoom in (MAP_ZOOM_START, 14):
+        radius = tolerance_px * meters_per_pixel(lat, zoom)
+        expected = row["mountain_name"] if radius >= offset_m else None
+        hit = index.nearest_within(lat, lon, zoom=zoom, tolerance_px=tolerance_px)
+        got = hit[0] if hit else None
+        if got != expected:
+            problems.append(f"zoom {zoom} (허용 반경 {radius:.0f}m): {expected!r} 기대, {got!r} 선택")
+    return problems
+
+
+def _load_mountains() -> pd.DataFrame:
+    """04_mountain과 같은 산 목록 (data/mountain.csv)"""
+    df = pd.read_csv(Path(__file__).resolve().parent.parent / "data" / "mountain.csv")
+    df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
+    df["lon"] = pd.to_numeric(df["lon"], errors="coerce")
+    return df.dropna(subset=["mountain_name", "lat", "lon"]).reset_index(drop=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="04_mountain 지도 점검")
+    parser.add_argument("--check", action="store_true", help="기본 지도 재사용·클릭 허용 반경 점검")
+    args = parser.parse_args(argv)
+    if not args.check:
+        parser.print_help()
+        return
+
+    df = _load_mountains()
+    problems = check_base_map_unchanged(df) + check_click_tolerance(df)
+    for problem in problems:
+        print(f"  실패: {problem}")
+    print("통과" if not problems else f"문제 {len(problems)}개")
+    if problems:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# utils/name_matcher.py
+"""
+산 이름 다중 매칭 (Aho–Corasick)
+
+모든 산 이름과 별칭(예: "통영 지리산" → 지리산(통영), "백운산" → 백운산(광양/정선/포천))으로
+오토마톤을 한 번 만들어두고, 입력 문장을 한 번만 훑어 언급된 산을 모두 찾습니다.
+겹치는 매칭은 왼쪽부터 가장 긴 것을 우선합니다 ("지리산(통영)"은 지리산이 아니라 지리산(통영)).
+"""
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+# "백운산(포천)" → ("백운산", "포천")
+_QUALIFIED_NAME = re.compile(r"^(?P<base>[^()]+)\((?P<qualifier>[^()]+)\)$")
+
+
+class AhoCorasick:
+    """문자열 패턴 집합에 대한 Aho–Corasick 오토마톤"""
+
+    def __init__(self, patterns: Dict[str, object]):
+        """
+        Args:
+            patterns: {패턴 문자열: 매칭 시 돌려줄 값}
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, object]]] = [[]]   # 노드별 (패턴 길이, 값)
+
+        for pattern, value in patterns.items():
+            if pattern:
+                self._insert(pattern, value)
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, value: object) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), value))
+
+    def _build_failure_links(self) -> None:
+        # 루트의 자식은 실패 시 루트로, 나머지는 BFS 순서로 부모의 실패 링크를 따라감
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0) if node else 0
+                # 접미사로 끝나는 패턴도 함께 출력
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, object]]:
+        """모든 (겹치는 것 포함) 매칭 (시작, 끝, 값)"""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._out[node]:
+                yield i + 1 - length, i + 1, value
+
+    def find_longest(self, text: str) -> List[Tuple[int, int, object]]:
+        """겹치지 않는 매칭만 (왼쪽 우선, 같은 위치에서는 가장 긴 것)"""
+        matches = sorted(self.iter_matches(text), key=lambda m: (m[0], -(m[1] - m[0])))
+        result = []
+        last_end = 0
+        for start, end, value in matches:
+            if start >= last_end:
+                result.append((start, end, value))
+                last_end = end
+        return result
+
+
+def build_aliases(mountain_names: Sequence[str]) -> Dict[str, Tuple[str, ...]]:
+    """
+    산 이름 별칭 사전
+
+    Returns:
+        {별칭: (정식 산 이름, ...)}
+        - 정식 이름 자체
+        - "지역 산" / "지역산" / "산 지역" 표기 → 해당 산
+        - 지역 구분 없는 이름("백운산")이 따로 없으면 → 같은 이름의 모든 산
+    """
+    aliases: Dict[str, List[str]] = {}
+
+    def add(alias: str, name: str) -> None:
+        names = aliases.setdefault(alias, [])
+        if name not in names:
+            names.append(name)
+
+    canonical = {str(n).strip() for n in mountain_names if str(n).strip()}
+    for name in sorted(canonical):
+        add(name, name)
+        m = _QUALIFIED_NAME.match(name)
+        if not m:
+            continue
+        base, qualifier = m.group("base").strip(), m.group("qualifier").strip()
+        for alias in (f"{qualifier} {base}", f"{qualifier}{base}", f"{base} {qualifier}", f"{base} ({qualifier})"):
+            add(alias, name)
+        if base not in canonical:
+            add(base, name)
+
+    return {alias: tuple(names) for alias, names in aliases.items()}
+
+
+class MountainNameMatcher:
+    """문장에서 언급된 산 이름을 모두 찾는 매처"""
+
+    def __init__(self, mountain_names: Sequence[str]):
+        self.aliases = build_aliases(mountain_names)
+        self._automaton = AhoCorasick(self.aliases)
+
+    def find(self, text: str) -> List[Tuple[int, int, Tuple[str, ...]]]:
+        """겹침을 정리한 매칭 (시작, 끝, 정식 산 이름들)"""
+        return self._automaton.find_longest(text or "")
+
+    def extract(self, text: str) -> List[str]:
+        """언급 순서대로 정식 산 이름 목록 (중복 제거)"""
+        names: List[str] = []
+        for _, _, canonical in self.find(text):
+            for name in canonical:
+                if name not in names:
+                    names.append(name)
+        return names
+
+
+@lru_cache(maxsize=8)
+def get_matcher(mountain_names: Tuple[str, ...]) -> MountainNameMatcher:
+    """산 이름 목록별 매처 (프로세스당 1회 생성)"""
+    return MountainNameMatcher(mountain_names)
@@ -0,0 +1,105 @@
+# utils/perf.py
+"""
+구간별 소요 시간 측정 유틸리티
+
+페이지 전체 재실행, 프래그먼트 재실행, 지도 렌더링 등 구간의 소요 시간을
+라벨별로 최근 샘플만 메모리에 보관하고 통계(평균/p50/p95)를 제공합니다.
+환경변수 PERF_LOG=1 이면 측정할 때마다 콘솔에 출력합니다.
+"""
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional
+
+
+_MAX_SAMPLES = 500
+
+_samples = defaultdict(lambda: deque(maxlen=_MAX_SAMPLES))
+_lock = threading.Lock()
+
+
+def record(label: str, elapsed_ms: float) -> None:
+    """측정값(ms) 한 개 기록"""
+    with _lock:
+        _samples[label].append(elapsed_ms)
+    if os.environ.get("PERF_LOG") == "1":
+        print(f"[perf] {label}: {elapsed_ms:.1f}ms")
+
+
+@contextmanager
+def timed(label: str):
+    """
+    with 블록의 소요 시간을 측정하여 기록
+
+    사용 예:
+        with timed("trail_detail"):
+            show_trail_detail(...)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(label, (time.perf_counter() - start) * 1000)
+
+
+def timed_stream(label: str, chunks: Iterable[str]) -> Iterator[str]:
+    """
+    스트리밍 응답을 그대로 흘려보내며 첫 청크까지 시간(TTFT)과 전체 시간을 기록
+
+    "{label}:ttft", "{label}:total" 라벨로 기록됩니다.
+
+    사용 예:
+        st.write_stream(timed_stream("chat_answer", client.stream_text(...)))
+    """
+    start = time.perf_counter()
+    first = True
+    try:
+        for chunk in chunks:
+            if first:
+                record(f"{label}:ttft", (time.perf_counter() - start) * 1000)
+                first = False
+            yield chunk
+    finally:
+        if not first:
+            record(f"{label}:total", (time.perf_counter() - start) * 1000)
+
+
+def _percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def summary(label: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    라벨별 통계 반환
+
+    Returns:
+        {라벨: {"count", "mean_ms", "p50_ms", "p95_ms", "max_ms"}}
+    """
+    with _lock:
+        items = {k: list(v) for k, v in _samples.items() if label is None or k == label}
+
+    result = {}
+    for key, values in items.items():
+        values.sort()
+        result[key] = {
+            "count": len(values),
+            "mean_ms": sum(values) / len(values) if values else 0.0,
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "max_ms": values[-1] if values else 0.0,
+        }
+    return result
+
+
+def reset(label: Optional[str] = None) -> None:
+    """기록 초기화 (label이 없으면 전체)"""
+    with _lock:
+        if label is None:
+            _samples.clear()
+        else:
+            _samples.pop(label, None)
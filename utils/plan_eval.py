@@ -0,0 +1,179 @@
+# utils/plan_eval.py
+"""
+규칙 기반 plan 변환기 오프라인 평가
+
+data/intent_queries.csv의 recommend/refine 질의로
+- 규칙(plan_parser)만으로 plan을 만드는 비율 (LLM 호출 생략률)
+- 규칙 변환 지연 시간과 절약되는 LLM 지연 시간
+- 확신도가 낮아 LLM으로 넘어가는 질의 목록
+- 규칙이 잘못 읽기 쉬워 반드시 LLM으로 넘겨야 하는 질의(DEFER_CASES) 중 규칙이 처리해 버린 것
+을 보고합니다. refine 질의는 SAMPLE_LAST_PLAN을 이전 plan으로 사용합니다.
+
+    python -m utils.plan_eval                    # LLM 지연은 --llm-ms 값으로 가정
+    python -m utils.plan_eval --live             # GEMINI_API_KEY로 실제 LLM 변환과 비교
+    python -m utils.plan_eval --threshold 0.6
+"""
+import argparse
+import time
+from typing import Dict, List, Optional
+
+from utils.intent_eval import QUERIES_PATH, _make_live_client, load_queries as _load_intent_queries
+from utils.plan_parser import PLAN_CONFIDENCE_THRESHOLD, RANGE_KEYS, parse_plan
+
+
+# refine 질의의 이전 plan (힐링 · 중급 이하 추천을 받은 상황)
+SAMPLE_LAST_PLAN = {
+    "intent": "recommend",
+    "cluster_preference": "healing",
+    "constraints": {
+        "difficulty_min": None, "difficulty_max": 3, "infra_min": None, "infra_max": None,
+        "park_dist_max": None, "distance_max_km": 8.0, "altitude_min_m": None, "altitude_max_m": None,
+    },
+    "exclude": {"mountains": [], "trails": []},
+    "keywords": [],
+    "unavailable_needs": [],
+    "clarifying_questions": [],
+    "notes_for_ui": "",
+}
+
+# 규칙이 처리하면 틀린 조건이 붙는 질의 (질의, 의도, 이유) - 확신도가 임계값 미만이어야 함
+DEFER_CASES = [
+    ("서울에서 가까운 산 추천", "recommend", "'가까운'은 주차장이 아니라 출발지 기준"),
+    ("너무 멀어", "refine", "무엇이 먼지(이동 거리/코스 길이/주차장) 불분명"),
+    ("운동 삼아 가볍게", "recommend", "난이도 하한(운동)과 상한(가볍게)이 충돌"),
+]
+
+COMPARED_CONSTRAINTS = ("difficulty_min", "difficulty_max", "distance_max_km", "park_dist_max")
+
+
+def load_queries(path=QUERIES_PATH) -> List[Dict]:
+    """plan이 필요한 질의(recommend/refine)만"""
+    return [q for q in _load_intent_queries(path) if q["intent"] in ("recommend", "refine")]
+
+
+def _agrees(rule: Dict, llm: Dict) -> bool:
+    """클러스터와 주요 제약조건이 같은지"""
+    if rule["cluster_preference"] != llm.get("cluster_preference"):
+        return False
+    llm_constraints = llm.get("constraints") or {}
+    return all(rule["constraints"].get(k) == llm_constraints.get(k) for k in COMPARED_CONSTRAINTS)
+
+
+def check_defer_cases(threshold: float = PLAN_CONFIDENCE_THRESHOLD) -> List[tuple]:
+    """
+    DEFER_CASES 중 규칙 확신도가 threshold 이상인 것
+    (하한이 상한보다 큰 plan은 LLM이 없을 때의 대체 경로에서도 쓰이면 안 되므로 확신도가 0이어야 함)
+
+    Returns:
+        [(질의, 확신도, 이유), ...] (비어 있으면 통과)
+    """
+    violations = []
+    for query, intent, reason in DEFER_CASES:
+        plan, confidence = parse_plan(query, intent, SAMPLE_LAST_PLAN if intent == "refine" else None)
+        c = plan["constraints"]
+        conflicting = any(c.get(lo) is not None and c.get(hi) is not None and c[lo] > c[hi] for lo, hi in RANGE_KEYS)
+        if confidence >= threshold or (conflicting and confidence > 0):
+            violations.append((query, confidence, reason))
+    return violations
+
+
+def evaluate(
+    queries: List[Dict],
+    threshold: float = PLAN_CONFIDENCE_THRESHOLD,
+    client=None,
+    llm_ms: float = 800.0,
+) -> Dict:
+    """
+    Args:
+        queries: load_queries() 결과
+        threshold: 규칙 plan을 그대로 쓸 최소 확신도
+        client: GeminiClient (있으면 규칙 처리분을 LLM 변환 결과와 비교)
+        llm_ms: client가 없을 때 가정할 LLM 1회 지연(ms)
+
+    Returns:
+        평가 지표 딕셔너리
+    """
+    from utils.llm_prompts import TRANSLATE_SYSTEM_PROMPT, make_translate_user_prompt
+    from utils.llm_client import parse_json_strict
+
+    rows = []
+    for q in queries:
+        last_plan = SAMPLE_LAST_PLAN if q["intent"] == "refine" else None
+        start = time.perf_counter()
+        plan, confidence = parse_plan(q["query"], q["intent"], last_plan)
+        rule_ms = (time.perf_counter() - start) * 1000
+
+        fast = confidence >= threshold
+        llm_plan, call_ms = None, llm_ms
+        if client is not None and fast:
+            start = time.perf_counter()
+            try:
+                llm_plan = parse_json_strict(client.complete_text(
+                    system_prompt=TRANSLATE_SYSTEM_PROMPT,
+                    user_prompt=make_translate_user_prompt(q["query"], q["intent"], last_plan),
+                    temperature=0.0,
+                ))
+            except Exception as e:
+                print(f"LLM 변환 실패 ({q['query']!r}): {e}")
+            call_ms = (time.perf_counter() - start) * 1000
+
+        rows.append({
+            **q,
+            "plan": plan,
+            "confidence": confidence,
+            "fast": fast,
+            "rule_ms": rule_ms,
+            "llm": llm_plan,
+            "llm_ms": call_ms,
+        })
+
+    fast_rows = [r for r in rows if r["fast"]]
+    result = {
+        "queries": len(rows),
+        "threshold": threshold,
+        "fast_path": len(fast_rows),
+        "fast_path_rate": len(fast_rows) / len(rows) if rows else 0.0,
+        "rule_ms_mean": sum(r["rule_ms"] for r in rows) / len(rows) if rows else 0.0,
+        "saved_ms_total": sum(r["llm_ms"] - r["rule_ms"] for r in fast_rows),
+        "to_llm": [(r["query"], r["intent"], r["confidence"]) for r in rows if not r["fast"]],
+        "defer_violations": check_defer_cases(threshold),
+    }
+    if client is not None:
+        compared = [r for r in fast_rows if r["llm"] is not None]
+        result["llm_agreement"] = (
+            sum(_agrees(r["plan"], r["llm"]) for r in compared) / len(compared) if compared else 0.0
+        )
+        result["disagreements"] = [
+            (r["query"], r["plan"]["cluster_preference"], r["llm"].get("cluster_preference"))
+            for r in compared if not _agrees(r["plan"], r["llm"])
+        ]
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="규칙 기반 plan 변환 평가")
+    parser.add_argument("--threshold", type=float, default=PLAN_CONFIDENCE_THRESHOLD)
+    parser.add_argument("--llm-ms", type=float, default=800.0, help="LLM 1회 지연 가정치 (ms)")
+    parser.add_argument("--live", action="store_true", help="규칙 처리분을 실제 LLM 변환과 비교")
+    args = parser.parse_args(argv)
+
+    client = _make_live_client() if args.live else None
+    r = evaluate(load_queries(), threshold=args.threshold, client=client, llm_ms=args.llm_ms)
+
+    print(f"질의 {r['queries']}개 (recommend/refine), 임계값 {r['threshold']}")
+    print(f"규칙 처리 {r['fast_path']}개 ({r['fast_path_rate']:.0%}), 규칙 변환 평균 {r['rule_ms_mean'] * 1000:.1f}µs")
+    print(f"절약된 LLM 지연 합계 {r['saved_ms_total'] / 1000:.1f}s"
+          + ("" if args.live else " (가정치)"))
+    if args.live:
+        print(f"규칙 처리분의 LLM 일치율 (클러스터 + 난이도·거리·주차): {r['llm_agreement']:.1%}")
+        for query, rule_cluster, llm_cluster in r["disagreements"]:
+            print(f"  불일치: {query!r} 규칙={rule_cluster} LLM={llm_cluster}")
+    for query, intent, confidence in r["to_llm"]:
+        print(f"  LLM 처리: {query!r} ({intent}, 확신도 {confidence})")
+    print(f"LLM으로 넘겨야 하는 질의 {len(DEFER_CASES)}개 중 규칙 처리 {len(r['defer_violations'])}개")
+    for query, confidence, reason in r["defer_violations"]:
+        print(f"  실패: {query!r} 확신도 {confidence} ({reason})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# utils/plan_parser.py
+"""
+규칙 기반 plan 변환기
+
+자주 쓰이는 표현(초급/중급, 가족, 힐링, 단풍, "주차 가까운", "5km 이하", "더 쉬운" 등)을
+LLM 없이 추천 엔진 plan 스키마(cluster_preference / constraints / keywords)로 바꿉니다.
+해석하지 못한 단어가 많을수록 확신도가 낮아지며, translate_plan은 확신도가
+PLAN_CONFIDENCE_THRESHOLD 이상일 때만 LLM 호출을 생략합니다.
+
+refine은 이전 plan(last_plan)을 바탕으로 새 조건을 덮어쓰고,
+"더 쉬운", "더 짧은"처럼 상대적인 표현은 이전 값에서 한 단계씩 조정합니다.
+"""
+import copy
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+PLAN_CONFIDENCE_THRESHOLD = 0.7
+
+LEVELS = {"입문": 1, "초급": 2, "중급": 3, "상급": 4, "최상급": 5}
+
+# (패턴, 클러스터, 제약조건) - 클러스터는 앞에 있을수록 우선
+# 매핑은 TRANSLATE_SYSTEM_PROMPT의 해석 힌트와 같게 유지
+ABSOLUTE_RULES = [
+    (re.compile(r"가족|아이(?!젠)|애들|엄마|아빠|부모님|어르신"), "family", {"infra_min": 5.0, "difficulty_max": 2}),
+    (re.compile(r"한적|조용|사람\s*(?:이\s*)?적|붐비지"), "hidden", {"infra_max": 5.0}),
+    (re.compile(r"경치|전망|조망|뷰|인증샷|사진|SNS", re.I), "view", {}),
+    (re.compile(r"단풍|벚꽃|철쭉|설경|억새|봄꽃|계절|봄|가을|겨울"), "seasonal", {}),
+    (re.compile(r"힐링|산책|숲길|편안"), "healing", {"difficulty_max": 3}),
+    (re.compile(r"초보|쉬운|쉽게|가볍게|무난"), None, {"difficulty_max": 3}),
+    (re.compile(r"어려운|힘든|빡센|빡세|도전|체력|단련|운동|트레이닝"), None, {"difficulty_min": 4}),
+    (re.compile(r"짧은|짧게"), None, {"distance_max_km": 5.0}),
+    # "가까운/멀어"는 주차장 이야기일 때만 (그 밖의 "서울에서 가까운", "너무 멀어"는 LLM이 판단)
+    (re.compile(
+        r"주차장?(?:이|가|은|는|에서|까지)?\s*(?:너무\s*|좀\s*)?(?:편한|편리한|가까운|멀어|멀다|먼)?"
+        r"|(?:가까운|멀지\s*않은)\s*주차장?|접근성"
+    ), None, {"park_dist_max": 500}),
+    (re.compile(r"높은\s*산|고산"), None, {"altitude_min_m": 1000}),
+]
+
+# refine 전용 상대 표현 (이전 plan 기준으로 조정)
+EASIER = re.compile(r"(?:더|조금|좀)\s*(?:쉬운|쉽게|초보|가벼운)\S*|덜\s*힘든|덜\s*어려운")
+HARDER = re.compile(r"더\s*(?:어려운|힘든|빡센|빡세게)|난이도\s*(?:를\s*)?(?:높|올려)")
+SHORTER = re.compile(r"더\s*짧|덜\s*긴")
+
+# 바꿔 달라는 뜻은 분명하지만 무엇을 바꿀지는 없는 표현 (LLM 판단 필요)
+GENERIC_REFINE = re.compile(r"별로|다른|마음에\s*안|다시|말고")
+
+UNAVAILABLE_RULES = [
+    (re.compile(r"강아지|반려견|애견"), "반려견 동반 여부"),
+    (re.compile(r"화장실"), "화장실 위치"),
+    (re.compile(r"야간|밤에"), "야간 등산 가능 여부"),
+    (re.compile(r"통제|입산\s*금지"), "실시간 통제 정보"),
+    (re.compile(r"날씨"), "실시간 날씨"),
+]
+
+# (하한, 상한) 조건 쌍 - 하한이 상한보다 크면 충돌
+RANGE_KEYS = (
+    ("difficulty_min", "difficulty_max"),
+    ("infra_min", "infra_max"),
+    ("altitude_min_m", "altitude_max_m"),
+)
+
+SCENERY_KEYWORDS = ("운해", "단풍", "계곡", "철쭉", "억새", "설경", "일출", "암릉", "폭포")
+
+_LEVEL = re.compile(r"(최상급|상급|중급|초급|입문)\s*(이하|까지|이상|부터)?")
+_DISTANCE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:km|킬로(?:미터)?)\s*(이하|이내|미만|안쪽|까지|이상)?", re.I)
+_ALTITUDE = re.compile(r"(\d{3,4})\s*(?:m|미터)\s*(이상|넘는|이하|이내)", re.I)
+_PARK_DISTANCE = re.compile(r"주차장?\S*\s*(\d+)\s*(?:m|미터)", re.I)
+
+# 해석에 영향이 없는 단어 (조사를 뗀 형태)
+FILLER_WORDS = {
+    "곳", "데", "코스", "산", "등산", "등산로", "좀", "조금", "더", "너무", "같이", "갈", "수", "있는", "있어",
+    "좋은", "좋아", "어디", "걸", "거", "중", "명소", "보러", "보이는", "되는", "만한", "갈만한", "해줘", "줘",
+    "용", "위한", "하는", "할", "싶어", "정도", "쪽", "없어", "들어", "코스들",
+}
+FILLER_PREFIXES = ("추천", "알려", "찾아", "보여", "골라", "바꿔", "가고", "가보", "원해", "부탁")
+_JOSA = re.compile(r"(?:이랑|랑|으로|로|에서|에게|한테|에|은|는|이|가|을|를|와|과|도|만|의|야|요|이요)$")
+_MOUNTAIN = re.compile(r"[가-힣]{1,4}산(?:\([가-힣]+\))?")
+_TOKEN = re.compile(r"[^\s,.!?~]+")
+
+
+def _empty_constraints() -> Dict[str, Any]:
+    return {
+        "difficulty_min": None, "difficulty_max": None, "infra_min": None, "infra_max": None,
+        "park_dist_max": None, "distance_max_km": None, "altitude_min_m": None, "altitude_max_m": None,
+    }
+
+
+def _merge(constraints: Dict[str, Any], updates: Dict[str, Any]) -> None:
+    """같은 메시지 안의 조건끼리 합치기 (*_max는 작은 값, *_min은 큰 값)"""
+    for key, value in updates.items():
+        current = constraints.get(key)
+        if current is None:
+            constraints[key] = value
+        elif key.endswith("_max") or key == "park_dist_max":
+            constraints[key] = min(current, value)
+        else:
+            constraints[key] = max(current, value)
+
+
+def _known_token(token: str) -> bool:
+    stem = _JOSA.sub("", token)
+    return (
+        stem in FILLER_WORDS
+        or token in FILLER_WORDS
+        or token.startswith(FILLER_PREFIXES)
+    )
+
+
+def parse_plan(
+    message: str,
+    intent: str = "recommend",
+    last_plan: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], float]:
+    """
+    자연어 요청을 plan으로 변환하고 확신도 반환
+
+    Args:
+        message: 사용자 입력
+        intent: "recommend" 또는 "refine"
+        last_plan: 이전 plan (refine일 때 기준값)
+
+    Returns:
+        (plan, 확신도 0~1) - 확신도는 해석한 단어 비율에서 모호함(클러스터 충돌 등)을 뺀 값,
+        조건끼리 충돌하면(난이도 하한 > 상한 등) 0
+    """
+    text = message
+    spans: List[Tuple[int, int]] = []
+    notes: List[str] = []
+
+    def take(match: re.Match) -> None:
+        spans.append(match.span())
+
+    refine_base = intent == "refine" and last_plan is not None
+    base = copy.deepcopy(last_plan) if refine_base else {}
+    base_constraints = {**_empty_constraints(), **(base.get("constraints") or {})}
+
+    # 1) refine 상대 표현 (먼저 찾아서 절대 규칙과 겹치지 않게 지움)
+    deltas = []
+    for pattern, name in ((EASIER, "easier"), (HARDER, "harder"), (SHORTER, "shorter")):
+        for m in pattern.finditer(text):
+            take(m)
+            deltas.append(name)
+            text = text[:m.start()] + " " * (m.end() - m.start()) + text[m.end():]
+    generic_refine = bool(GENERIC_REFINE.search(text))
+    for m in GENERIC_REFINE.finditer(text):
+        take(m)
+
+    # 2) 절대 표현
+    constraints: Dict[str, Any] = {}
+    clusters: List[str] = []
+    for pattern, cluster, updates in ABSOLUTE_RULES:
+        matches = list(pattern.finditer(text))
+        if not matches:
+            continue
+        for m in matches:
+            take(m)
+        if cluster and cluster not in clusters:
+            clusters.append(cluster)
+        _merge(constraints, updates)
+
+    levels = [(LEVELS[m.group(1)], m.group(2)) for m in _LEVEL.finditer(text)]
+    for m in _LEVEL.finditer(text):
+        take(m)
+    if len(levels) >= 2 and not any(mod for _, mod in levels):
+        constraints["difficulty_min"] = min(l for l, _ in levels)
+        constraints["difficulty_max"] = max(l for l, _ in levels)
+    else:
+        for level, mod in levels:
+            if mod in ("이하", "까지"):
+                constraints["difficulty_max"] = level
+            elif mod in ("이상", "부터"):
+                constraints["difficulty_min"] = level
+            else:
+                constraints["difficulty_min"] = constraints["difficulty_max"] = level
+
+    for m in _DISTANCE.finditer(text):
+        take(m)
+        if m.group(2) != "이상":
+            constraints["distance_max_km"] = float(m.group(1))
+    for m in _PARK_DISTANCE.finditer(text):
+        take(m)
+        constraints["park_dist_max"] = int(m.group(1))
+    for m in _ALTITUDE.finditer(text):
+        if any(s < m.end() and m.start() < e for s, e in spans):
+            continue  # "주차장 300m 이내"의 거리
+        take(m)
+        key = "altitude_min_m" if m.group(2) in ("이상", "넘는") else "altitude_max_m"
+        constraints[key] = int(m.group(1))
+
+    keywords = [k for k in SCENERY_KEYWORDS if k in text]
+    for k in keywords:
+        for m in re.finditer(k, text):
+            take(m)
+
+    unavailable = []
+    for pattern, need in UNAVAILABLE_RULES:
+        for m in pattern.finditer(text):
+            take(m)
+            if need not in unavailable:
+                unavailable.append(need)
+
+    # 산 이름만 있는 요청("북한산 추천")도 해석 가능한 요청 (산 필터는 화면에서 처리)
+    for m in _MOUNTAIN.finditer(text):
+        if _JOSA.sub("", m.group(0)) not in FILLER_WORDS and not m.group(0).startswith("등산"):
+            take(m)
+
+    # 같은 메시지 안의 조건끼리 충돌("운동 삼아 가볍게")하면 규칙으로 정하지 않음
+    conflicting = any(
+        constraints.get(lo) is not None and constraints.get(hi) is not None and constraints[lo] > constraints[hi]
+        for lo, hi in RANGE_KEYS
+    )
+
+    # 3) 이전 plan에 덮어쓰기 + 상대 조정 (이전 조건과 충돌하면 이번 조건을 따름)
+    merged = {**base_constraints, **constraints}
+    for lo, hi in RANGE_KEYS:
+        if merged.get(lo) is not None and merged.get(hi) is not None and merged[lo] > merged[hi]:
+            if lo in constraints and hi not in constraints:
+                merged[hi] = None
+            elif hi in constraints and lo not in constraints:
+                merged[lo] = None
+    for delta in deltas:
+        if delta == "easier":
+            prev = base_constraints.get("difficulty_max")
+            merged["difficulty_max"] = max(1, prev - 1) if prev else 3
+            if merged.get("difficulty_min") and merged["difficulty_min"] > merged["difficulty_max"]:
+                merged["difficulty_min"] = None
+            notes.append("이전보다 쉬운 난이도")
+        elif delta == "harder":
+            prev = base_constraints.get("difficulty_min") or base_constraints.get("difficulty_max")
+            merged["difficulty_min"] = min(7, prev + 1) if prev else 4
+            if merged.get("difficulty_max") and merged["difficulty_max"] < merged["difficulty_min"]:
+                merged["difficulty_max"] = None
+            notes.append("이전보다 어려운 난이도")
+        elif delta == "shorter":
+            prev = base_constraints.get("distance_max_km")
+            merged["distance_max_km"] = round(prev * 0.7, 1) if prev else 5.0
+            notes.append("이전보다 짧은 거리")
+
+    exclude = base.get("exclude") or {"mountains": [], "trails": []}
+    plan = {
+        "intent": intent,
+        "cluster_preference": clusters[0] if clusters else base.get("cluster_preference", "any"),
+        "constraints": merged,
+        "exclude": exclude,
+        "keywords": keywords or list(base.get("keywords") or []),
+        "unavailable_needs": unavailable,
+        "clarifying_questions": [],
+        "notes_for_ui": ", ".join(notes),
+    }
+
+    # 4) 확신도: 해석한(또는 무의미한) 단어 비율
+    tokens = list(_TOKEN.finditer(message))
+    if not tokens or not spans or conflicting:
+        return plan, 0.0
+    known = sum(
+        any(s < t.end() and t.start() < e for s, e in spans) or _known_token(t.group(0))
+        for t in tokens
+    )
+    confidence = known / len(tokens)
+    if len(clusters) > 1:
+        confidence -= 0.15 * (len(clusters) - 1)
+    if intent == "refine" and not refine_base:
+        confidence -= 0.3
+    if generic_refine and not (deltas or constraints or clusters):
+        # 바꿔 달라는 말뿐이면 무엇을 바꿀지는 LLM이 판단
+        confidence = min(confidence, 0.5)
+    return plan, round(max(0.0, min(1.0, confidence)), 2)
@@ -0,0 +1,95 @@
+# utils/prompt_encoding.py
+"""
+LLM 프롬프트용 데이터 인코딩 및 크기 관리
+
+- 표 형식 인코딩: 열 이름은 한 번만, 행은 '|' 구분, 수치는 반올림
+  (레코드마다 라벨/구분선을 반복하는 서술형 블록보다 입력 토큰이 훨씬 적음)
+- 토큰 수 추정: 토크나이저 없이 문자 종류별 평균 비율로 근사
+  (한글은 음절 약 1.5자당 1토큰, 그 외 문자는 약 4자당 1토큰으로 계산하는 보수적 근사)
+- 예산 확인: 보내기 전에 추정 토큰이 예산을 넘는지 검사
+"""
+import math
+import re
+from typing import Iterable, List, Optional, Sequence
+
+
+_HANGUL = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+_SPACES = re.compile(r"\s+")
+
+HANGUL_CHARS_PER_TOKEN = 1.5
+OTHER_CHARS_PER_TOKEN = 4.0
+
+# 한 번의 호출(시스템 + 사용자 프롬프트)에 허용할 추정 입력 토큰
+DEFAULT_TOKEN_BUDGET = 30_000
+
+
+class PromptBudgetExceeded(ValueError):
+    """추정 입력 토큰이 예산을 넘음"""
+
+
+def estimate_tokens(text: str) -> int:
+    """입력 토큰 수 추정 (연속 공백은 한 글자로 계산)"""
+    if not text:
+        return 0
+    compact = _SPACES.sub(" ", text)
+    hangul = len(_HANGUL.findall(compact))
+    other = len(compact) - hangul
+    return int(round(hangul / HANGUL_CHARS_PER_TOKEN + other / OTHER_CHARS_PER_TOKEN))
+
+
+def check_budget(*parts: Optional[str], budget: int = DEFAULT_TOKEN_BUDGET) -> int:
+    """
+    프롬프트 조각들의 추정 토큰 합이 예산 이내인지 확인
+
+    Returns:
+        추정 토큰 수
+
+    Raises:
+        PromptBudgetExceeded: 예산 초과
+    """
+    tokens = sum(estimate_tokens(p or "") for p in parts)
+    if tokens > budget:
+        raise PromptBudgetExceeded(f"프롬프트 추정 {tokens:,} 토큰이 예산 {budget:,} 토큰을 넘습니다.")
+    return tokens
+
+
+def format_cell(value, decimals: int = 1) -> str:
+    """표 셀 값 (결측은 '-', 실수는 반올림, 구분자/줄바꿈 제거)"""
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "-"
+        value = round(value, decimals)
+        return str(int(value)) if value == int(value) else f"{value:.{decimals}f}"
+    if hasattr(value, "item"):  # numpy 스칼라
+        return format_cell(value.item(), decimals)
+    text = str(value).strip()
+    if text in ("", "nan", "None"):
+        return "-"
+    return _SPACES.sub(" ", text.replace("|", "/"))
+
+
+def encode_table(header: Sequence[str], rows: Iterable[Sequence], decimals: int = 1) -> str:
+    """열 이름 한 줄 + '|' 구분 행"""
+    lines = ["|".join(header)]
+    lines.extend("|".join(format_cell(v, decimals) for v in row) for row in rows)
+    return "\n".join(lines)
+
+
+def fit_to_budget(items: List, render, budget: int) -> List:
+    """
+    render(items)의 추정 토큰이 예산 이내가 될 때까지 뒤(낮은 순위)부터 제외
+
+    Args:
+        items: 순위순 항목
+        render: 항목 목록 → 프롬프트 문자열
+        budget: 추정 토큰 예산
+
+    Returns:
+        예산 안에 들어가는 앞쪽 항목들
+    """
+    items = list(items)
+    while items and estimate_tokens(render(items)) > budget:
+        items.pop()
+    return items
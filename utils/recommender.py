@@ -1,6 +1,7 @@
 # recommender.py
 from typing import Dict, Any
 import pandas as pd
+from utils.keywords import load_keyword_index
 
 
 # 클러스터 매핑
@@ -24,6 +25,9 @@ DIFFICULTY_MAP = {
     7: ["신", "신1", "신2", "신3"]
 }
 
+# 키워드 근거 가산점 최대치 (매력종합점수 10점 척도 기준)
+KEYWORD_BOOST = 2.0
+
 
 def get_difficulty_levels(min_level: int = None, max_level: int = None) -> list:
     """난이도 범위를 실제 난이도 레이블 리스트로 변환"""
@@ -39,6 +43,28 @@ def get_difficulty_levels(min_level: int = None, max_level: int = None) -> list:
     return levels
 
 
+def keyword_boost(mountain_names: pd.Series, keywords: list) -> pd.Series:
+    """
+    리뷰 키워드 근거에 따른 산별 가산점
+    
+    Args:
+        mountain_names: 각 행의 산 이름
+        keywords: 사용자가 원하는 경관/테마 키워드 (예: ["운해", "단풍"])
+        
+    Returns:
+        0 ~ KEYWORD_BOOST 사이 가산점 (키워드가 없으면 0)
+    """
+    if not keywords:
+        return pd.Series(0.0, index=mountain_names.index)
+    
+    evidence = dict(load_keyword_index().rank_mountains(keywords, top_k=None))
+    if not evidence:
+        return pd.Series(0.0, index=mountain_names.index)
+    
+    max_evidence = max(evidence.values())
+    return mountain_names.map(evidence).fillna(0).astype(float) / max_evidence * KEYWORD_BOOST
+
+
 def run_recommender(
     trails_df: pd.DataFrame, 
     plan: Dict[str, Any], 
@@ -110,16 +136,16 @@ def run_recommender(
     if exclude.get("trails"):
         df = df[~df["코스명"].isin(exclude["trails"])]
     
-    # 4) 매력종합점수 기준으로 정렬
+    # 4) 점수 계산 및 정렬 (매력종합점수 + 키워드 근거 가산점)
+    keywords = plan.get("keywords") or []
     if not df.empty:
-        df = df.sort_values("매력종합점수", ascending=False)
+        df["score"] = df["매력종합점수"] + keyword_boost(df["산이름"], keywords)
+        df = df.sort_values(["score", "매력종합점수"], ascending=False)
         df = df.head(top_k)
-        
-        # score 컬럼 추가 (매력종합점수를 그대로 사용)
-        df["score"] = df["매력종합점수"]
     
     # 메타 정보 저장
     df.attrs["cluster"] = cluster_pref
     df.attrs["constraints"] = constraints
+    df.attrs["keywords"] = keywords
     
     return df
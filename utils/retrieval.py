@@ -0,0 +1,292 @@
+# utils/retrieval.py
+"""
+등산로 정보 블록 검색 (RAG용)
+
+모든 등산로 정보를 시스템 프롬프트에 넣는 대신, 질문마다 관련 있는 블록만 골라 넣기 위한 검색기입니다.
+- 한글 문자 n-gram(2~3) BM25: 띄어쓰기/조사 차이에 강하고 형태소 분석기가 필요 없음
+  (term별 BM25 가중치를 색인 시 미리 계산해 두어 질의는 배열 덧셈만 수행)
+- 질의 속 조건어(대중교통, 주차, 초보, 짧게 …) → 해당 수치 특성(0~1) 가산
+- 산 이름이 언급되면 그 산의 코스로 한정
+- (선택) 오프라인으로 계산한 임베딩이 있으면 BM25 순위와 RRF로 결합
+
+임베딩 미리 계산 (GEMINI_API_KEY 필요):
+    python -m utils.retrieval --embed
+검색 결과 / 프롬프트 크기 비교:
+    python -m utils.retrieval "대중교통으로 갈 수 있는 힐링 코스"
+"""
+import hashlib
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+EMBEDDING_DIR = ROOT_DIR / ".cache" / "retrieval"
+EMBEDDING_MODEL = "text-embedding-004"
+
+NGRAM_SIZES = (2, 3)
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60
+
+# 질의 조건어 → 수치 특성 가산 (특성 값은 0~1, 높을수록 조건에 맞음)
+QUERY_FEATURE_HINTS = [
+    (re.compile(r"대중교통|버스|지하철|뚜벅|정류장"), "transit", 0.6),
+    (re.compile(r"주차|자차|차\s*(로|가지고)|드라이브"), "parking", 0.6),
+    (re.compile(r"초보|입문|쉬운|쉽게|가볍|가족|아이|부모님"), "easy", 0.5),
+    (re.compile(r"상급|어려운|빡세|힘든|도전|운동|체력"), "hard", 0.5),
+    (re.compile(r"짧|금방|\d+\s*시간\s*(이내|안|미만)|반나절"), "short", 0.4),
+    (re.compile(r"뷰|전망|경치|조망|사진|인증샷"), "view", 0.3),
+    (re.compile(r"힐링|조용|한적|숲"), "healing", 0.3),
+]
+
+
+def char_ngrams(text: str, sizes: Sequence[int] = NGRAM_SIZES) -> List[str]:
+    """공백 단위 어절별 문자 n-gram (어절이 n보다 짧으면 어절 자체)"""
+    grams = []
+    for word in re.findall(r"[0-9A-Za-z가-힣]+", str(text).lower()):
+        for n in sizes:
+            if len(word) < n:
+                if n == sizes[0]:
+                    grams.append(word)
+                continue
+            grams.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return grams
+
+
+def _minmax(values: pd.Series, invert: bool = False) -> np.ndarray:
+    v = pd.to_numeric(values, errors="coerce").astype(float)
+    v = v.fillna(v.median() if v.notna().any() else 0.0).to_numpy()
+    span = v.max() - v.min()
+    norm = (v - v.min()) / span if span > 0 else np.zeros_like(v)
+    return 1.0 - norm if invert else norm
+
+
+def trail_features(df_trails: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """등산로 데이터에서 QUERY_FEATURE_HINTS가 쓰는 0~1 특성 계산"""
+    difficulty = pd.to_numeric(df_trails.get("난이도점수"), errors="coerce")
+    return {
+        "transit": _minmax(df_trails["정류장_접근성점수"]),
+        "parking": _minmax(df_trails["주차장_접근성점수"]),
+        "easy": _minmax(difficulty, invert=True),
+        "hard": _minmax(difficulty),
+        "short": _minmax(df_trails["총거리_km"], invert=True),
+        "view": _minmax(df_trails["전망"]) if "전망" in df_trails else np.zeros(len(df_trails)),
+        "healing": _minmax(df_trails["힐링"]) if "힐링" in df_trails else np.zeros(len(df_trails)),
+    }
+
+
+class BM25Retriever:
+    """문자 n-gram BM25 + 조건 특성 가산 + (선택) 임베딩 RRF 검색기"""
+
+    def __init__(
+        self,
+        texts: Sequence[str],
+        features: Optional[Dict[str, np.ndarray]] = None,
+        embeddings: Optional[np.ndarray] = None,
+        groups: Optional[Sequence[str]] = None,
+    ):
+        """
+        Args:
+            texts: 문서별 검색용 텍스트
+            features: {특성 이름: 문서별 0~1 값} (QUERY_FEATURE_HINTS 참고)
+            embeddings: 문서별 임베딩 (N, d), 있으면 질의 임베딩과 코사인 유사도 순위를 결합
+            groups: 문서별 그룹 (예: 산 이름), search(max_per_group=...)에서 한 그룹 쏠림 방지에 사용
+        """
+        self.n_docs = len(texts)
+        self.features = features or {}
+        self.groups = list(groups) if groups is not None else None
+
+        doc_terms = [char_ngrams(t) for t in texts]
+        doc_len = np.array([len(t) for t in doc_terms], dtype=float)
+        avg_len = doc_len.mean() if self.n_docs else 0.0
+
+        postings: Dict[str, Dict[int, int]] = {}
+        for doc_id, terms in enumerate(doc_terms):
+            for term in terms:
+                tf = postings.setdefault(term, {})
+                tf[doc_id] = tf.get(doc_id, 0) + 1
+
+        # term → (문서 번호 배열, BM25 가중치 배열): 질의와 무관한 부분은 미리 계산
+        self._postings: Dict[str, tuple] = {}
+        for term, tf_map in postings.items():
+            docs = np.fromiter(tf_map.keys(), dtype=np.int32, count=len(tf_map))
+            tf = np.fromiter(tf_map.values(), dtype=float, count=len(tf_map))
+            df = len(tf_map)
+            idf = np.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[docs] / avg_len)
+            self._postings[term] = (docs, idf * tf * (BM25_K1 + 1) / (tf + norm))
+
+        self.embeddings = None
+        if embeddings is not None and len(embeddings) == self.n_docs:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            self.embeddings = embeddings / np.where(norms == 0, 1, norms)
+
+    def bm25_scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(self.n_docs)
+        for term in set(char_ngrams(query)):
+            posting = self._postings.get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+        return scores
+
+    def scores(
+        self,
+        query: str,
+        mask: Optional[np.ndarray] = None,
+        query_embedding: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        문서별 최종 점수
+
+        Args:
+            query: 질문
+            mask: 후보로 남길 문서 (bool 배열, 예: 언급된 산의 코스만)
+            query_embedding: 질의 임베딩 (임베딩이 있을 때만 사용)
+        """
+        bm25 = self.bm25_scores(query)
+        top = bm25.max()
+        scores = bm25 / top if top > 0 else bm25
+
+        if self.embeddings is not None and query_embedding is not None:
+            # 척도가 다른 두 점수는 순위로 결합 (Reciprocal Rank Fusion)
+            q = np.asarray(query_embedding, dtype=float)
+            q = q / (np.linalg.norm(q) or 1.0)
+            rrf = np.zeros(self.n_docs)
+            for s in (scores, self.embeddings @ q):
+                ranks = np.empty(self.n_docs)
+                ranks[np.argsort(-s)] = np.arange(1, self.n_docs + 1)
+                rrf += 1.0 / (RRF_K + ranks)
+            scores = rrf / rrf.max()
+
+        for pattern, feature, weight in QUERY_FEATURE_HINTS:
+            if feature in self.features and pattern.search(query):
+                scores = scores + weight * self.features[feature]
+
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+        return scores
+
+    def search(
+        self,
+        query: str,
+        k: int = 15,
+        mask: Optional[np.ndarray] = None,
+        query_embedding: Optional[np.ndarray] = None,
+        max_per_group: Optional[int] = None,
+    ) -> List[int]:
+        """
+        상위 k개 문서 번호 (점수 내림차순)
+
+        max_per_group이 주어지면 같은 그룹(산)은 그 수까지만 담아 여러 산이 섞이게 합니다.
+        """
+        scores = self.scores(query, mask=mask, query_embedding=query_embedding)
+        valid = np.flatnonzero(np.isfinite(scores))
+        if len(valid) == 0:
+            return []
+        if not max_per_group or self.groups is None:
+            k = min(k, len(valid))
+            top = valid[np.argpartition(-scores[valid], k - 1)[:k]]
+            return top[np.argsort(-scores[top], kind="stable")].tolist()
+
+        picked, per_group = [], {}
+        for i in valid[np.argsort(-scores[valid], kind="stable")]:
+            group = self.groups[i]
+            if per_group.get(group, 0) < max_per_group:
+                per_group[group] = per_group.get(group, 0) + 1
+                picked.append(int(i))
+                if len(picked) >= k:
+                    break
+        return picked
+
+
+# -----------------------------------------------------------------------------
+# 오프라인 임베딩 (선택)
+# -----------------------------------------------------------------------------
+def corpus_digest(texts: Sequence[str]) -> str:
+    h = hashlib.sha1(EMBEDDING_MODEL.encode("utf-8"))
+    for t in texts:
+        h.update(t.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def embedding_path(texts: Sequence[str]) -> Path:
+    return EMBEDDING_DIR / f"embeddings_{corpus_digest(texts)}.npy"
+
+
+def load_embeddings(texts: Sequence[str]) -> Optional[np.ndarray]:
+    """같은 문서 집합으로 미리 계산된 임베딩이 있으면 로드 (없으면 None)"""
+    path = embedding_path(texts)
+    if not path.exists():
+        return None
+    try:
+        return np.load(path)
+    except (OSError, ValueError) as e:
+        logger.warning("임베딩 로드 실패: %s", e)
+        return None
+
+
+def embed_texts(client, texts: Sequence[str], batch_size: int = 100) -> np.ndarray:
+    """google.genai Client로 텍스트 임베딩 계산"""
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        response = client.models.embed_content(model=EMBEDDING_MODEL, contents=list(texts[start:start + batch_size]))
+        vectors.extend(e.values for e in response.embeddings)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _main() -> None:
+    import argparse
+    import os
+
+    from utils.trail_context import load_trail_context
+
+    parser = argparse.ArgumentParser(description="등산로 블록 검색 / 임베딩 생성")
+    parser.add_argument("query", nargs="*", help="검색할 질문")
+    parser.add_argument("--embed", action="store_true", help="문서 임베딩 미리 계산 (GEMINI_API_KEY 필요)")
+    parser.add_argument("-k", type=int, default=15)
+    args = parser.parse_args()
+
+    ctx = load_trail_context()
+    if args.embed:
+        from google import genai
+
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            raise SystemExit("--embed 사용 시 GEMINI_API_KEY 환경변수가 필요합니다.")
+        vectors = embed_texts(genai.Client(api_key=api_key), ctx.search_texts)
+        EMBEDDING_DIR.mkdir(parents=True, exist_ok=True)
+        np.save(embedding_path(ctx.search_texts), vectors)
+        print(f"임베딩 {vectors.shape} → {embedding_path(ctx.search_texts)}")
+        return
+
+    retriever = BM25Retriever(ctx.search_texts, ctx.features, groups=ctx.mountains)
+    full_chars = len(ctx.render(list(range(len(ctx)))))
+    queries = [" ".join(args.query)] if args.query else [
+        "초보 2시간 이내 뷰 좋은 코스 추천해줘",
+        "가족이랑 가기 좋고 주차 편한 곳 어디야?",
+        "대중교통으로 갈 수 있는 힐링 코스",
+        "설악산 단풍 코스",
+    ]
+    print(f"전체 코스 {len(ctx)}개, 표 형식 {full_chars:,}자")
+    for q in queries:
+        start = time.perf_counter()
+        mask = ctx.mountain_mask(q)
+        ids = retriever.search(q, k=args.k, mask=mask, max_per_group=None if mask is not None else 3)
+        elapsed = (time.perf_counter() - start) * 1000
+        chars = len(ctx.render(ids))
+        print(f"\n[{q}] {elapsed:.2f}ms, {len(ids)}개 코스 {chars:,}자 ({chars / full_chars:.1%})")
+        for i in ids[:5]:
+            print(f"  - {ctx.names[i]}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -1,5 +1,6 @@
 # router.py
 import re
+from typing import Tuple
 
 
 REFINE_PATTERNS = [
@@ -39,6 +40,89 @@ QUESTION_PATTERNS = [
 ]
 
 
+# 인사·잡담 (LLM 없이 other로 처리해도 되는 경우)
+OTHER_PATTERNS = [
+    r"^(안녕|ㅎㅇ|하이|반가워)",
+    r"(고마워|고맙|감사)",
+    r"(잘\s*가|바이|수고)",
+]
+
+# 확신도 라우터(route_intent_with_confidence) 전용 추가 패턴 (기존 route_intent 분류는 그대로 유지)
+CONFIDENCE_EXTRA_PATTERNS = {
+    "explain": [
+        r"(이유|근거)(가|는|를)?\s*(뭐|알려)",  # "이유가 뭐야?", "근거 알려줘"
+    ],
+}
+
+# 우선순위 순서 (앞의 의도가 더 구체적)
+INTENT_PRIORITY = ["refine", "explain", "recommend", "question", "other"]
+
+# 한 번만 컴파일
+COMPILED_PATTERNS = {
+    intent: [re.compile(p) for p in patterns]
+    for intent, patterns in (
+        ("refine", REFINE_PATTERNS),
+        ("explain", EXPLAIN_PATTERNS),
+        ("recommend", RECOMMEND_PATTERNS),
+        ("question", QUESTION_PATTERNS),
+        ("other", OTHER_PATTERNS),
+    )
+}
+
+CONFIDENCE_PATTERNS = {
+    intent: patterns + [re.compile(p) for p in CONFIDENCE_EXTRA_PATTERNS.get(intent, [])]
+    for intent, patterns in COMPILED_PATTERNS.items()
+}
+
+# 구체적인 의도의 문장에 자연스럽게 섞이는 하위 의도 표현 (예: "다시 골라줘"의 골라줘, "이유가 뭐야"의 뭐야)
+# 이런 조합은 경쟁으로 보지 않고 조금만 감점
+EXPECTED_OVERLAP = {
+    ("refine", "recommend"),
+    ("refine", "question"),
+    ("explain", "recommend"),
+    ("explain", "question"),
+}
+
+# 이 값 이상이면 규칙 결과를 그대로 사용, 미만이면 LLM으로 넘김
+CONFIDENCE_THRESHOLD = 0.7
+
+
+def route_intent_with_confidence(msg: str, has_previous_results: bool = False) -> Tuple[str, float]:
+    """
+    규칙 기반 의도 분류 + 확신도
+
+    - 한 의도의 패턴만 맞으면 높음 (패턴 2개 이상이면 더 높음)
+    - 여러 의도의 패턴이 동시에 맞으면 우선순위로 고르되 경쟁 의도 수만큼 낮춤
+      (EXPECTED_OVERLAP 조합은 조금만 낮춤)
+    - 이전 추천 결과가 없는데 refine/explain이면 낮춤
+    - 아무 패턴도 안 맞으면 other, 낮은 확신도
+
+    Args:
+        msg: 사용자 입력 메시지
+        has_previous_results: 이전 추천 결과가 있는지 여부
+
+    Returns:
+        (의도, 확신도 0.0~1.0)
+    """
+    m = msg.strip()
+    hits = {
+        intent: sum(1 for p in patterns if p.search(m))
+        for intent, patterns in CONFIDENCE_PATTERNS.items()
+    }
+    matched = [intent for intent in INTENT_PRIORITY if hits[intent]]
+    if not matched:
+        return "other", 0.3
+
+    intent = matched[0]
+    confidence = 0.9 if hits[intent] >= 2 else 0.75
+    for other in matched[1:]:
+        confidence -= 0.05 if (intent, other) in EXPECTED_OVERLAP else 0.25
+    if intent in ("refine", "explain") and not has_previous_results:
+        confidence -= 0.3
+
+    return intent, round(min(1.0, max(0.0, confidence)), 2)
+
+
 def route_intent(msg: str) -> str:
     """
     사용자 메시지의 의도를 분류
@@ -54,19 +138,19 @@ def route_intent(msg: str) -> str:
     # 순서가 중요: 더 구체적인 패턴을 먼저 체크
     
     # 1. 추천 수정 (가장 먼저 체크)
-    if any(re.search(p, m) for p in REFINE_PATTERNS):
+    if any(p.search(m) for p in COMPILED_PATTERNS["refine"]):
         return "refine"
     
     # 2. 설명 요청 (특정 코스에 대한 질문)
-    if any(re.search(p, m) for p in EXPLAIN_PATTERNS):
+    if any(p.search(m) for p in COMPILED_PATTERNS["explain"]):
         return "explain"
     
     # 3. 추천 요청 (산 이름 + 추천/코스 키워드)
-    if any(re.search(p, m) for p in RECOMMEND_PATTERNS):
+    if any(p.search(m) for p in COMPILED_PATTERNS["recommend"]):
         return "recommend"
     
     # 4. 정보 질문 (산에 대한 일반 질문)
-    if any(re.search(p, m) for p in QUESTION_PATTERNS):
+    if any(p.search(m) for p in COMPILED_PATTERNS["question"]):
         return "question"
     
-    return "other"
\ No newline at end of file
+    return "other"
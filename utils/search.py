@@ -0,0 +1,326 @@
+# utils/search.py
+"""
+산·코스 검색 인덱스
+
+산 이름, 영문명(mountain_name_en), 코스명, 위치를 색인하여
+- 초성 검색:      "ㅂㅎㅅ" → 북한산
+- 자모 단위 검색: 입력 중인 글자("북하", "북한ㅅ")와 오타("붇한산") 허용
+- 로마자 입력:    "bukhan", "seorak" → 북한산, 설악산
+을 지원합니다. 키 입력마다 호출해도 되도록 자모 바이그램 역색인으로 후보를 좁힌 뒤에만
+편집 거리를 계산합니다.
+"""
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+import pandas as pd
+
+
+# -----------------------------------------------------------------------------
+# 한글 자모 분해 / 로마자 변환
+# -----------------------------------------------------------------------------
+_HANGUL_BASE = 0xAC00
+_HANGUL_END = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 겹모음·겹받침을 기본 자모로 분해 (오타 허용 비교를 자모 단위로 하기 위함)
+_COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+_ROMAN_CHO = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+_ROMAN_JUNG = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo", "we",
+               "wi", "yu", "eu", "ui", "i"]
+_ROMAN_JONG = ["", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "p", "l", "l", "p", "l",
+               "m", "p", "p", "t", "t", "ng", "t", "t", "k", "t", "p", "t"]
+
+_CHOSEONG_SET = set(CHOSEONG)
+
+
+def _is_syllable(ch: str) -> bool:
+    return _HANGUL_BASE <= ord(ch) <= _HANGUL_END
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 기본 자모열로 분해 (한글이 아닌 문자는 그대로)"""
+    out = []
+    for ch in text:
+        if _is_syllable(ch):
+            code = ord(ch) - _HANGUL_BASE
+            cho, jung, jong = code // 588, (code % 588) // 28, code % 28
+            for jamo in (CHOSEONG[cho], JUNGSEONG[jung], JONGSEONG[jong]):
+                out.append(_COMPOUND_JAMO.get(jamo, jamo))
+        else:
+            out.append(_COMPOUND_JAMO.get(ch, ch))
+    return "".join(out)
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절의 초성만 추출 (예: 북한산 → ㅂㅎㅅ)"""
+    return "".join(
+        CHOSEONG[(ord(ch) - _HANGUL_BASE) // 588] if _is_syllable(ch) else ch
+        for ch in text
+    )
+
+
+def romanize(text: str) -> str:
+    """국어의 로마자 표기법(음운 변화 제외) 기반 단순 로마자 변환"""
+    out = []
+    for ch in text:
+        if _is_syllable(ch):
+            code = ord(ch) - _HANGUL_BASE
+            out.append(_ROMAN_CHO[code // 588] + _ROMAN_JUNG[(code % 588) // 28] + _ROMAN_JONG[code % 28])
+        elif ch.isascii() and ch.isalnum():
+            out.append(ch.lower())
+    return "".join(out)
+
+
+def is_choseong_query(text: str) -> bool:
+    return bool(text) and all(ch in _CHOSEONG_SET for ch in text)
+
+
+def normalize(text: str) -> str:
+    """검색 비교용 정규화 (공백/구두점 제거, 소문자)"""
+    return "".join(ch for ch in str(text).lower() if ch.isalnum() or ch in _CHOSEONG_SET)
+
+
+def _bigrams(text: str) -> Set[str]:
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """편집 거리 (limit 초과가 확실하면 limit + 1 반환)"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            row_min = min(row_min, cur[j])
+        if row_min > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+# -----------------------------------------------------------------------------
+# 검색 인덱스
+# -----------------------------------------------------------------------------
+# 필드별 가중치 (같은 점수면 산 이름 > 영문명 > 코스명 > 위치)
+FIELD_WEIGHTS = {"name": 1.0, "name_en": 0.95, "course": 0.9, "location": 0.6}
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    kind: str             # "mountain" | "course"
+    key: str              # 산 이름 또는 코스명
+    mountain_name: str
+    field: str            # 매칭된 필드
+    score: float
+
+
+class MountainSearchIndex:
+    """산·코스 검색 인덱스"""
+
+    # 편집 거리 후보 계산에서 너무 흔한 바이그램(예: "산"의 ㅅㅏ, ㅏㄴ)은 건너뜀
+    _COMMON_GRAM_RATIO = 0.2
+    _MAX_FUZZY_CANDIDATES = 30
+
+    def __init__(self, df_mountains: pd.DataFrame, df_trails: Optional[pd.DataFrame] = None):
+        """
+        Args:
+            df_mountains: mountain.csv (mountain_name, mountain_name_en, location)
+            df_trails: 100mountains_dashboard.csv (코스명, 산이름, 위치), 없으면 산만 색인
+        """
+        self._docs: List[tuple] = []                    # 문서: (kind, key, mountain_name)
+        self._key_ids: Dict[tuple, int] = {}            # (field, 정규화 텍스트) → 키 번호
+        self._keys: List[tuple] = []                    # 키: (field, text, jamo, choseong, roman)
+        self._key_docs: List[List[int]] = []            # 키 → 문서 번호들
+
+        for row in df_mountains.itertuples(index=False):
+            name = str(row.mountain_name)
+            doc = self._add_doc("mountain", name, name)
+            self._add_key(doc, "name", name)
+            en = str(getattr(row, "mountain_name_en", "") or "")
+            if en and en != "nan":
+                self._add_key(doc, "name_en", en)
+            loc = str(getattr(row, "location", "") or "")
+            if loc and loc != "nan":
+                for token in loc.replace("ㆍ", " ").replace(",", " ").split():
+                    self._add_key(doc, "location", token)
+
+        if df_trails is not None and not df_trails.empty:
+            for course, mountain, loc in zip(df_trails["코스명"], df_trails["산이름"], df_trails["위치"]):
+                doc = self._add_doc("course", str(course), str(mountain))
+                self._add_key(doc, "course", str(course))
+                for token in str(loc).split():
+                    if token not in ("-", "nan"):
+                        self._add_key(doc, "location", token)
+
+        # 표현(원문/자모/초성/로마자)별 접미사 배열: 접두 검색 = 부분 문자열 검색
+        self._suffixes = {rep: self._build_suffix_array(i) for rep, i in
+                          (("text", 1), ("jamo", 2), ("choseong", 3), ("roman", 4))}
+
+        # 오타 허용 후보용 바이그램 역색인 (이름류 필드만)
+        self._grams = {"jamo": {}, "roman": {}}
+        for kid, (field, _, jamo, _, roman) in enumerate(self._keys):
+            if field == "location":
+                continue
+            for rep, value in (("jamo", jamo), ("roman", roman)):
+                for gram in _bigrams(value):
+                    self._grams[rep].setdefault(gram, []).append(kid)
+
+        # 키 입력마다 같은 접두어가 반복 조회되므로 질의 결과 캐시
+        self._cached_search = lru_cache(maxsize=1024)(self._search_uncached)
+
+    def _add_doc(self, kind: str, key: str, mountain_name: str) -> int:
+        self._docs.append((kind, key, mountain_name))
+        return len(self._docs) - 1
+
+    def _add_key(self, doc: int, field: str, raw: str) -> None:
+        text = normalize(raw)
+        if not text:
+            return
+        kid = self._key_ids.get((field, text))
+        if kid is None:
+            kid = len(self._keys)
+            self._key_ids[(field, text)] = kid
+            roman = text if field == "name_en" else romanize(text)
+            self._keys.append((field, text, to_jamo(text), to_choseong(text), roman))
+            self._key_docs.append([])
+        if doc not in self._key_docs[kid]:
+            self._key_docs[kid].append(doc)
+
+    def _build_suffix_array(self, pos: int) -> tuple:
+        items = sorted(
+            (value[start:], kid, start)
+            for kid, key in enumerate(self._keys)
+            for value in (key[pos],)
+            for start in range(len(value))
+        )
+        return [x[0] for x in items], [(x[1], x[2]) for x in items]
+
+    # -------------------------------------------------------------------------
+    # 매칭
+    # -------------------------------------------------------------------------
+    def _substring(self, rep: str, query: str, pos: int, penalty: float, out: Dict[int, float]) -> None:
+        """접미사 배열에서 query로 시작하는 구간을 찾아 키별 점수 기록"""
+        suffixes, refs = self._suffixes[rep]
+        lo = bisect_left(suffixes, query)
+        hi = bisect_left(suffixes, query + "\uffff", lo)
+        for i in range(lo, hi):
+            kid, start = refs[i]
+            value = self._keys[kid][pos]
+            if start == 0:
+                score = 100.0 if len(value) == len(query) else 90.0
+            else:
+                score = 75.0
+            score -= penalty
+            if score > out.get(kid, 0.0):
+                out[kid] = score
+
+    def _fuzzy(self, rep: str, query: str, pos: int, out: Dict[int, float]) -> None:
+        """바이그램 후보만 골라 편집 거리로 점수화 (앞부분/전체 중 가까운 쪽)"""
+        index = self._grams[rep]
+        common = self._COMMON_GRAM_RATIO * len(self._keys)
+        grams = [g for g in _bigrams(query) if g in index]
+        rare = [g for g in grams if len(index[g]) <= common] or grams
+        if not rare:
+            return
+
+        limit = 1 if len(query) <= 4 else 2
+        need = max(1, len(rare) - 2 * limit)
+        counts: Dict[int, int] = {}
+        for gram in rare:
+            for kid in index[gram]:
+                counts[kid] = counts.get(kid, 0) + 1
+        candidates = sorted((k for k, c in counts.items() if c >= need), key=lambda k: -counts[k])
+
+        for kid in candidates[:self._MAX_FUZZY_CANDIDATES]:
+            if kid in out:
+                continue
+            target = self._keys[kid][pos]
+            dist = min(
+                bounded_edit_distance(query, target[:len(query)], limit),
+                bounded_edit_distance(query, target, limit),
+            )
+            if dist <= limit:
+                out[kid] = 60.0 - 15.0 * dist
+
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """
+        검색어에 맞는 산·코스 목록
+
+        Args:
+            query: 검색어 (한글, 초성, 로마자, 입력 중인 자모 포함 가능)
+            limit: 최대 결과 수
+
+        Returns:
+            점수 내림차순 SearchHit 리스트 (문서당 최고 점수 필드 하나)
+        """
+        q = normalize(query)
+        if not q:
+            return []
+        return list(self._cached_search(q, limit))
+
+    def _search_uncached(self, q: str, limit: int) -> tuple:
+
+        key_scores: Dict[int, float] = {}
+        if is_choseong_query(q):
+            self._substring("choseong", q, 3, 5.0, key_scores)
+        elif q.isascii():
+            self._substring("roman", q, 4, 0.0, key_scores)
+            if len(key_scores) < limit and len(q) >= 3:
+                self._fuzzy("roman", q, 4, key_scores)
+        else:
+            # 완성 음절 일치 우선, 입력 중인 글자("북한ㅅ")는 자모 단위 일치
+            q_jamo = to_jamo(q)
+            self._substring("text", q, 1, 0.0, key_scores)
+            self._substring("jamo", q_jamo, 2, 5.0, key_scores)
+            if len(key_scores) < limit and len(q_jamo) >= 3:
+                self._fuzzy("jamo", q_jamo, 2, key_scores)
+
+        best: Dict[int, tuple] = {}
+        for kid, score in key_scores.items():
+            field = self._keys[kid][0]
+            weighted = score * FIELD_WEIGHTS.get(field, 0.5)
+            for doc in self._key_docs[kid]:
+                if doc not in best or weighted > best[doc][0]:
+                    best[doc] = (weighted, field)
+
+        # 같은 점수면 산 > 코스, 짧은 이름 우선
+        ranked = sorted(
+            best.items(),
+            key=lambda x: (-x[1][0], self._docs[x[0]][0] != "mountain", len(self._docs[x[0]][1])),
+        )
+        return tuple(
+            SearchHit(
+                kind=self._docs[doc][0],
+                key=self._docs[doc][1],
+                mountain_name=self._docs[doc][2],
+                field=field,
+                score=round(score, 1),
+            )
+            for doc, (score, field) in ranked[:limit]
+        )
+
+    def search_mountains(self, query: str, limit: int = 10) -> List[str]:
+        """검색 결과를 산 이름 기준으로 중복 제거 (코스·위치 매칭은 해당 산으로)"""
+        names: List[str] = []
+        for hit in self.search(query, limit=limit * 3):
+            if hit.mountain_name not in names:
+                names.append(hit.mountain_name)
+            if len(names) >= limit:
+                break
+        return names
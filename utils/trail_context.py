@@ -0,0 +1,226 @@
+# utils/trail_context.py
+"""
+05_chat용 등산로 정보
+
+등산로별 표 행(LLM에 넣을 코스/산 정보)과 검색용 텍스트, 검색 가산 특성을 함께 만들어
+질문마다 관련 코스만 골라 표 형식으로 프롬프트에 넣을 수 있게 합니다. (utils/retrieval.py 참고)
+산별 정보(설명·위치·상위 키워드)는 산마다 한 번만 계산해 등산로에 조인하고,
+결과는 데이터 버전(입력 파일 내용 해시)별로 디스크에 캐시합니다.
+
+    python -m utils.trail_context   # 생성/캐시 로드 시간, 토큰 수 출력
+"""
+import hashlib
+import logging
+import pickle
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.keywords import KEYWORDS_PATH, load_keyword_index
+from utils.name_matcher import get_matcher
+from utils.perf import record, timed
+from utils.prompt_encoding import encode_table, estimate_tokens
+from utils.retrieval import trail_features
+
+logger = logging.getLogger(__name__)
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT_DIR / "data"
+CACHE_DIR = ROOT_DIR / ".cache" / "trail_context"
+
+# 클러스터 설명 매핑
+CLUSTER_MAP = {
+    0: "계절매력(꽃, 단풍, 설경 등)",
+    2: "탁 트인 전망, 사진 명소",
+    3: "가족 동반, 편안한 인프라",
+    4: "숲길, 힐링, 피톤치드",
+    5: "오지, 숨은 명소, 한적함"
+}
+
+CONTEXT_HEADER = "아래는 네가 참고해야 할 **대한민국 100대 명산 등산로 데이터베이스**야. 이 정보에 기반해서만 답변해.\n\n"
+
+# 표 형식(render)에서 쓰는 짧은 테마 이름
+CLUSTER_SHORT = {0: "계절", 2: "전망/사진", 3: "가족/인프라", 4: "숲/힐링", 5: "오지/한적"}
+
+MOUNTAIN_HEADER = ("산", "위치", "키워드", "설명")
+COURSE_HEADER = ("산", "코스", "테마", "특출", "난이도", "시간", "km", "교통", "정류장", "주차", "주차장")
+COMPACT_LEGEND = (
+    "표는 '|' 구분, 첫 줄은 열 이름, '-'는 정보 없음. "
+    "시간=예상시간(h:mm), km=총거리, 교통/주차=대중교통/주차 접근성 점수(0~10), 특출=특출매력.\n"
+    "코스 표의 '산' 열과 산 정보 표의 '산' 열이 같은 행끼리만 연결해서 읽어."
+)
+
+
+@dataclass
+class TrailContext:
+    search_texts: List[str]             # 등산로별 검색용 텍스트
+    names: List[str]                    # 데이터 ID (산이름_코스명)
+    mountains: np.ndarray               # 등산로별 산 이름
+    features: Dict[str, np.ndarray] = field(default_factory=dict)
+    course_rows: List[tuple] = field(default_factory=list)              # COURSE_HEADER 순서
+    mountain_rows: Dict[str, tuple] = field(default_factory=dict)       # 산 이름 → MOUNTAIN_HEADER 순서
+    version: str = ""                   # 데이터 내용 버전 (data_version, 캐시 키로 사용)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def render(self, ids: List[int]) -> str:
+        """
+        선택된 등산로를 표 형식으로 (산 정보는 산마다 한 번, 코스는 한 줄씩)
+
+        코스마다 라벨을 반복하지 않아 입력 토큰이 적습니다.
+        """
+        names = list(dict.fromkeys(self.mountains[i] for i in ids))
+        return "\n".join([
+            CONTEXT_HEADER.strip(),
+            COMPACT_LEGEND,
+            "## 산 정보",
+            encode_table(MOUNTAIN_HEADER, (self.mountain_rows[n] for n in names)),
+            "## 코스",
+            encode_table(COURSE_HEADER, (self.course_rows[i] for i in ids)),
+        ])
+
+    def mountain_mask(self, query: str) -> Optional[np.ndarray]:
+        """질문에 산 이름이 있으면 그 산의 코스만 True인 배열 (없으면 None)"""
+        names = get_matcher(tuple(sorted(set(self.mountains)))).extract(query)
+        if not names:
+            return None
+        return np.isin(self.mountains, names)
+
+
+# 캐시 형식이 바뀌면 올림
+_CACHE_VERSION = 3
+
+_DURATION = re.compile(r"(?:(\d+)\s*시간)?\s*(?:(\d+)\s*분)?")
+
+
+def compact_duration(text) -> str:
+    """'3시간 16분' → '3:16' (형식이 다르면 그대로)"""
+    m = _DURATION.fullmatch(str(text).strip())
+    if not m or not (m.group(1) or m.group(2)):
+        return str(text)
+    return f"{int(m.group(1) or 0)}:{int(m.group(2) or 0):02d}"
+
+
+def _mountain_table(df_trails: pd.DataFrame, df_mountains: pd.DataFrame) -> pd.DataFrame:
+    """산별 설명·위치·상위 키워드 (산마다 한 번만 계산)"""
+    keyword_index = load_keyword_index()
+    mountains = (
+        df_mountains[['mountain_name', 'description', 'location']]
+        .drop_duplicates('mountain_name')
+        .rename(columns={'mountain_name': '산이름', 'description': 'desc', 'location': 'loc'})
+    )
+    names = pd.Series(df_trails['산이름'].unique(), name='산이름')
+    table = names.to_frame().merge(mountains, on='산이름', how='left')
+    # 산 정보가 없는 등산로는 기존과 같이 "설명 없음"/빈 위치
+    missing = table['desc'].isna() & table['loc'].isna()
+    table.loc[missing, 'desc'] = "설명 없음"
+    table.loc[missing, 'loc'] = ""
+    table['keywords'] = [", ".join(keyword_index.top_keywords(n, 5)) for n in table['산이름']]
+    return table
+
+
+def build_trail_context(df_trails: pd.DataFrame, df_mountains: pd.DataFrame) -> TrailContext:
+    """등산로·산 데이터로 표 행/검색 텍스트/특성 생성 (산 정보는 조인 한 번으로 붙임)"""
+    df = df_trails.merge(_mountain_table(df_trails, df_mountains), on='산이름', how='left')
+    cluster_desc = df['Cluster'].map(CLUSTER_MAP).fillna("복합 매력")
+
+    # 검색용 텍스트: 라벨 없이 값만
+    search_texts = [
+        " ".join(str(v) for v in values)
+        for values in zip(
+            df['산이름'], df['코스명'], df['loc'], cluster_desc, df['특출매력'], df['난이도'], df['세부난이도'],
+            df['정류장명'], df['주차장명'], df['keywords'], df['desc'],
+        )
+    ]
+
+    course_rows = list(zip(
+        df['산이름'], df['코스명'], df['Cluster'].map(CLUSTER_SHORT).fillna("복합"), df['특출매력'],
+        df['세부난이도'], df['예상시간'].map(compact_duration), df['총거리_km'].tolist(),
+        df['정류장_접근성점수'].tolist(), df['정류장명'], df['주차장_접근성점수'].tolist(), df['주차장명'],
+    ))
+    mountain_rows = {
+        name: (name, loc, keywords, desc)
+        for name, loc, keywords, desc in zip(df['산이름'], df['loc'], df['keywords'], df['desc'])
+    }
+
+    return TrailContext(
+        search_texts=search_texts,
+        names=(df['산이름'].astype(str) + "_" + df['코스명'].astype(str)).tolist(),
+        mountains=df['산이름'].astype(str).to_numpy(),
+        features=trail_features(df_trails),
+        course_rows=course_rows,
+        mountain_rows=mountain_rows,
+    )
+
+
+def data_version(data_dir: Path = DATA_DIR) -> str:
+    """입력 데이터 파일 내용 + 표/검색 텍스트 형식 기준 버전 해시"""
+    h = hashlib.sha1(
+        f"{_CACHE_VERSION}|{COURSE_HEADER}|{MOUNTAIN_HEADER}|{sorted(CLUSTER_MAP.items())}|{sorted(CLUSTER_SHORT.items())}"
+        .encode("utf-8")
+    )
+    for path in (data_dir / "100mountains_dashboard.csv", data_dir / "mountain.csv", KEYWORDS_PATH):
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def load_trail_context(data_dir: Path = DATA_DIR, use_cache: bool = True) -> TrailContext:
+    """
+    data 폴더의 CSV로 컨텍스트 생성 (데이터 버전별 디스크 캐시)
+
+    빌드 시간은 perf("trail_context_build")와 로그에 남깁니다.
+    """
+    version = data_version(data_dir)
+    cache_path = CACHE_DIR / f"{version}.pkl"
+
+    if use_cache and cache_path.exists():
+        try:
+            with timed("trail_context_load"):
+                with open(cache_path, "rb") as f:
+                    return TrailContext(**{**pickle.load(f), "version": version})
+        except (OSError, pickle.UnpicklingError, EOFError, TypeError) as e:
+            logger.warning("컨텍스트 캐시 로드 실패, 다시 생성: %s", e)
+
+    start = time.perf_counter()
+    ctx = build_trail_context(
+        pd.read_csv(data_dir / "100mountains_dashboard.csv"),
+        pd.read_csv(data_dir / "mountain.csv"),
+    )
+    ctx.version = version
+    elapsed = (time.perf_counter() - start) * 1000
+    record("trail_context_build", elapsed)
+    logger.info("등산로 컨텍스트 생성: 코스 %d개, %.0fms (버전 %s)", len(ctx), elapsed, version)
+
+    if use_cache:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                # 클래스 대신 필드만 저장 (모듈 경로가 바뀌어도 읽을 수 있게)
+                pickle.dump(vars(ctx), f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            # 읽기 전용 배포 환경에서는 매번 생성
+            logger.warning("컨텍스트 캐시 저장 실패: %s", e)
+    return ctx
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    cold = load_trail_context(use_cache=False)
+    cold_ms = (time.perf_counter() - start) * 1000
+    load_trail_context()
+    start = time.perf_counter()
+    load_trail_context()
+    warm_ms = (time.perf_counter() - start) * 1000
+    full = cold.render(list(range(len(cold))))
+    print(f"생성 {cold_ms:.0f}ms, 캐시 로드 {warm_ms:.1f}ms")
+    print(f"표 형식 전체 {len(full):,}자, 약 {estimate_tokens(full):,} 토큰, "
+          f"코스당 평균 약 {estimate_tokens(full) // max(len(cold), 1)} 토큰")
@@ -6,25 +6,42 @@ import gpxpy
 import folium
 import re 
 from streamlit_folium import st_folium
+from utils.perf import timed
 
+
+def _state_keys(course_name):
+    """코스별 위젯 상태 키 (코스를 바꾸면 이전 코스의 카테고리/POI 선택이 따라오지 않음)"""
+    return f"infra_category_radio_{course_name}", f"infra_list_{course_name}"
+
+
+@st.fragment
 def show_trail_detail(selected_row, df_infra):
     """
     등산로 상세 정보 + 지도 + 인프라 표시 함수
     
+    프래그먼트로 동작하므로 패널 안의 상호작용(카테고리 라디오, POI 선택)은
+    페이지 전체가 아니라 이 패널만 다시 실행합니다.
+    
     Parameters:
     - selected_row: 선택된 등산로 데이터 (pandas Series)
     - df_infra: 관광 인프라 데이터프레임
     """
-    
+    with timed("trail_detail_panel"):
+        _render_trail_detail(selected_row, df_infra)
+
+
+def _render_trail_detail(selected_row, df_infra):
+    """상세 패널 본문 렌더링"""
     mt_name = selected_row['산이름']
     course_name = selected_row['코스명']
+    radio_key, list_key = _state_keys(course_name)
     
     st.subheader(f"🥾 {course_name}")
     
     # 인프라 데이터 필터링
     pin_location = None
     pin_popup = None
-    current_category = st.session_state.get('infra_category_radio', '음식점')
+    current_category = st.session_state.get(radio_key, '음식점')
     infra_display = pd.DataFrame()
     
     if not df_infra.empty:
@@ -35,8 +52,8 @@ def show_trail_detail(selected_row, df_infra):
         
         infra_display = infra_filtered[infra_filtered['category'] == current_category].reset_index(drop=True)
         
-        if 'infra_list' in st.session_state and st.session_state.infra_list['selection']['rows']:
-            sel_idx = st.session_state.infra_list['selection']['rows'][0]
+        if list_key in st.session_state and st.session_state[list_key]['selection']['rows']:
+            sel_idx = st.session_state[list_key]['selection']['rows'][0]
             if sel_idx < len(infra_display):
                 sel_infra_row = infra_display.iloc[sel_idx]
                 pin_location = [sel_infra_row['lat'], sel_infra_row['lng']]
@@ -53,7 +70,7 @@ def show_trail_detail(selected_row, df_infra):
     
     # 관광 인프라 리스트
     if not infra_display.empty:
-        _render_infra_list(infra_display, current_category, pin_popup)
+        _render_infra_list(infra_display, current_category, pin_popup, radio_key, list_key)
     else:
         st.info(f"선택하신 '{course_name}' 주변에는 해당 카테고리의 시설 정보가 없습니다.")
 
@@ -120,7 +137,12 @@ def _render_trail_map(mt_name, course_name, pin_location=None, pin_popup=None):
                         icon=folium.Icon(color='orange', icon='star')
                     ).add_to(m)
                 
-                st_folium(m, width=700, height=400)
+                # 지도 이동/확대는 앱에서 쓰지 않으므로 재실행을 일으키지 않도록 반환값 없음
+                st_folium(
+                    m, width=700, height=400,
+                    key=f"trail_map_{course_name}",
+                    returned_objects=[]
+                )
             else:
                 st.warning("GPX 경로 없음")
         except Exception as e:
@@ -169,19 +191,19 @@ def _render_trail_info(selected_row):
             st.markdown(f"**{b_name}** <span style='color:grey; font-size:0.8em'>({int(b_dist)}m)</span>", unsafe_allow_html=True)
 
 
-def _render_infra_list(infra_display, current_category, pin_popup):
+def _render_infra_list(infra_display, current_category, pin_popup, radio_key, list_key):
     """관광 인프라 리스트 렌더링"""
     categories = ["음식점", "카페", "숙박", "관광명소"]
     
     def reset_infra_selection():
-        if 'infra_list' in st.session_state:
-            del st.session_state['infra_list']
+        if list_key in st.session_state:
+            del st.session_state[list_key]
     
     st.radio(
         "카테고리 선택",
         categories,
         index=categories.index(current_category) if current_category in categories else 0,
-        key="infra_category_radio",
+        key=radio_key,
         horizontal=True,
         on_change=reset_infra_selection,
         label_visibility="collapsed"
@@ -207,7 +229,7 @@ def _render_infra_list(infra_display, current_category, pin_popup):
     
     st.dataframe(
         infra_display[cols_to_show],
-        key="infra_list",
+        key=list_key,
         on_select="rerun",
         selection_mode="single-row",
         width='stretch',
@@ -0,0 +1,141 @@
+# utils/trail_facets.py
+"""
+맞춤 등산로 조회(03_trail) 필터 위젯용 패싯 카운트 엔진
+
+등산로 데이터를 한 번만 비트셋(값별 boolean 마스크)으로 색인해두고,
+현재 선택 조건에서 난이도/클러스터/인프라 구간별 결과 개수를 한 번에 계산합니다.
+각 패싯의 개수는 "자기 자신의 조건을 뺀 나머지 조건"을 기준으로 셉니다.
+(예: 난이도별 개수 = 클러스터·인프라·주차장 조건만 적용했을 때 해당 난이도의 코스 수)
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 관광인프라점수(0~10)를 1점 단위 10개 구간으로 나눔 (10점은 마지막 구간에 포함)
+INFRA_BUCKETS = list(range(10))
+
+
+class TrailFacetIndex:
+    """등산로 데이터프레임 위에 만든 패싯 비트셋 인덱스"""
+
+    def __init__(self, df: pd.DataFrame, difficulty_levels: Sequence[str]):
+        """
+        Args:
+            df: 등산로 데이터프레임 (난이도, Cluster, 관광인프라점수, 주차장거리_m 컬럼 필요)
+            difficulty_levels: 난이도 순서 리스트 (예: ['입문', '초급', ...])
+        """
+        self.size = len(df)
+        self.difficulty_levels = list(difficulty_levels)
+
+        level_pos = {level: i for i, level in enumerate(self.difficulty_levels)}
+        self.difficulty_codes = (
+            df['난이도'].map(level_pos).fillna(-1).astype(int).to_numpy()
+        )
+        self.cluster_codes = df['Cluster'].fillna(-1).astype(int).to_numpy()
+        self.infra = df['관광인프라점수'].astype(float).to_numpy()
+        self.park_dist = df['주차장거리_m'].astype(float).to_numpy()
+        self.infra_buckets = np.clip(np.floor(self.infra), 0, len(INFRA_BUCKETS) - 1).astype(int)
+
+        # 값별 비트셋 (난이도 / 클러스터)
+        self.difficulty_bits = {
+            level: self.difficulty_codes == i for i, level in enumerate(self.difficulty_levels)
+        }
+        self.cluster_bits = {
+            int(c): self.cluster_codes == c for c in np.unique(self.cluster_codes) if c >= 0
+        }
+        # -1(주차장 데이터 없음)은 주차장 조건이 있을 때 항상 제외
+        self.has_parking = self.park_dist != -1
+
+    # -------------------------------------------------------------------------
+    # 개별 조건 마스크
+    # -------------------------------------------------------------------------
+    def _difficulty_mask(self, levels: Sequence[str]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        for level in levels:
+            bits = self.difficulty_bits.get(level)
+            if bits is not None:
+                mask |= bits
+        return mask
+
+    def _cluster_mask(self, cluster: Optional[int]) -> np.ndarray:
+        if cluster is None:
+            return np.ones(self.size, dtype=bool)
+        bits = self.cluster_bits.get(int(cluster))
+        if bits is None:
+            return np.zeros(self.size, dtype=bool)
+        return bits
+
+    def _infra_mask(self, infra_range: Tuple[float, float]) -> np.ndarray:
+        return (self.infra >= infra_range[0]) & (self.infra <= infra_range[1])
+
+    def _park_mask(self, park_dist_max: float) -> np.ndarray:
+        return self.has_parking & (self.park_dist <= park_dist_max)
+
+    # -------------------------------------------------------------------------
+    # 공개 API
+    # -------------------------------------------------------------------------
+    def mask(
+        self,
+        levels: Sequence[str],
+        infra_range: Tuple[float, float],
+        park_dist_max: float,
+        cluster: Optional[int] = None,
+    ) -> np.ndarray:
+        """현재 선택 조건을 모두 만족하는 행의 boolean 마스크"""
+        return (
+            self._difficulty_mask(levels)
+            & self._infra_mask(infra_range)
+            & self._park_mask(park_dist_max)
+            & self._cluster_mask(cluster)
+        )
+
+    def facet_counts(
+        self,
+        levels: Sequence[str],
+        infra_range: Tuple[float, float],
+        park_dist_max: float,
+        cluster: Optional[int] = None,
+    ) -> Dict[str, object]:
+        """
+        현재 선택 조건 기준 패싯별 개수 계산
+
+        Returns:
+            {
+                "total": 전체 조건 만족 개수,
+                "difficulty": {난이도: 개수},
+                "cluster": {클러스터 ID: 개수},
+                "infra": {인프라 구간 하한(0~9): 개수},
+            }
+        """
+        diff_m = self._difficulty_mask(levels)
+        infra_m = self._infra_mask(infra_range)
+        park_m = self._park_mask(park_dist_max)
+        cluster_m = self._cluster_mask(cluster)
+
+        base = park_m  # 주차장 조건은 모든 패싯에 공통 적용
+
+        # 난이도 패싯: 난이도 조건 제외
+        others = base & infra_m & cluster_m
+        diff_counts = np.bincount(
+            self.difficulty_codes[others & (self.difficulty_codes >= 0)],
+            minlength=len(self.difficulty_levels),
+        )
+
+        # 클러스터 패싯: 클러스터 조건 제외
+        others = base & diff_m & infra_m
+        cluster_counts = {c: int(np.count_nonzero(bits & others)) for c, bits in self.cluster_bits.items()}
+
+        # 인프라 패싯: 인프라 조건 제외
+        others = base & diff_m & cluster_m
+        infra_counts = np.bincount(self.infra_buckets[others], minlength=len(INFRA_BUCKETS))
+
+        return {
+            "total": int(np.count_nonzero(diff_m & infra_m & park_m & cluster_m)),
+            "difficulty": {
+                level: int(diff_counts[i]) for i, level in enumerate(self.difficulty_levels)
+            },
+            "cluster": cluster_counts,
+            "infra": {b: int(infra_counts[b]) for b in INFRA_BUCKETS},
+        }
@@ -1,7 +1,19 @@
 # utils/translator.py
-from typing import Dict, Any
-from utils.llm_prompts import TRANSLATE_SYSTEM_PROMPT, make_translate_user_prompt
+import logging
+from typing import Dict, Any, Optional, Tuple
+from utils.llm_prompts import (
+    TRANSLATE_SYSTEM_PROMPT,
+    make_translate_user_prompt,
+    ROUTE_TRANSLATE_SYSTEM_PROMPT,
+    make_route_translate_user_prompt,
+)
 from utils.llm_client import GeminiClient, parse_json_strict
+from utils.intent_classifier import classify_intent_with_llm, log_llm_label
+from utils.perf import timed
+from utils.plan_parser import PLAN_CONFIDENCE_THRESHOLD, parse_plan
+from utils.router import CONFIDENCE_THRESHOLD, route_intent_with_confidence
+
+logger = logging.getLogger(__name__)
 
 
 REQUIRED_KEYS = {
@@ -9,6 +21,13 @@ REQUIRED_KEYS = {
     "unavailable_needs", "clarifying_questions", "notes_for_ui"
 }
 
+VALID_INTENTS = {"recommend", "refine", "explain", "question", "other"}
+
+# 추천 엔진 파라미터(plan)가 필요한 의도
+PLAN_INTENTS = {"recommend", "refine"}
+
+UNAVAILABLE_NOTE = "AI 응답이 불안정해 기본 기준으로 추천합니다."
+
 
 def translate_plan(
     client: GeminiClient, 
@@ -28,24 +47,120 @@ def translate_plan(
     Returns:
         변환된 파라미터 딕셔너리
     """
+    # 자주 쓰이는 표현은 규칙으로 바로 변환 (확신도가 낮을 때만 LLM 호출)
+    with timed("plan_rule"):
+        rule_plan, confidence = parse_plan(user_message, intent, last_plan)
+    if confidence >= PLAN_CONFIDENCE_THRESHOLD:
+        return _normalize_plan(rule_plan, intent)
+
+    if not client.is_available():
+        if confidence > 0:
+            rule_plan["notes_for_ui"] = UNAVAILABLE_NOTE
+            return _normalize_plan(rule_plan, intent)
+        return _normalize_plan(_fallback_plan(intent, UNAVAILABLE_NOTE), intent)
+
     try:
         raw = client.complete_text(
             system_prompt=TRANSLATE_SYSTEM_PROMPT,
             user_prompt=make_translate_user_prompt(user_message, intent, last_plan),
+            temperature=0.0,
         )
         
         plan = parse_json_strict(raw)
         
     except Exception as e:
-        print(f"Translation 파싱 오류: {e}")
+        logger.warning("Translation 파싱 오류: %s", e)
         plan = _fallback_plan(intent)
     
     # 필수 키 검증
     if not REQUIRED_KEYS.issubset(plan.keys()):
         missing = REQUIRED_KEYS - set(plan.keys())
-        print(f"필수 키 누락: {missing}")
+        logger.warning("필수 키 누락: %s", missing)
         plan = _fallback_plan(intent)
     
+    return _normalize_plan(plan, intent)
+
+
+def route_and_translate(
+    client: GeminiClient,
+    user_message: str,
+    has_previous_results: bool = False,
+    last_plan: Dict[str, Any] = None
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    의도 분류 + 파라미터 변환을 한 번의 LLM 호출로 수행
+
+    응답을 파싱하지 못하거나 의도/필수 키가 맞지 않으면
+    기존 2단계 경로(classify_intent_with_llm → translate_plan)로 대체합니다.
+
+    Args:
+        client: Gemini API 클라이언트
+        user_message: 사용자 입력 메시지
+        has_previous_results: 이전 추천 결과가 있는지 여부
+        last_plan: 이전 추천 파라미터 (refine일 때 사용)
+
+    Returns:
+        (의도, plan) - recommend/refine이 아니면 plan은 None
+    """
+    try:
+        raw = client.complete_text(
+            system_prompt=ROUTE_TRANSLATE_SYSTEM_PROMPT,
+            user_prompt=make_route_translate_user_prompt(user_message, has_previous_results, last_plan),
+            temperature=0.0,
+        )
+        result = parse_json_strict(raw)
+        intent = str(result.get("intent", "")).strip().lower()
+        plan = result.get("plan")
+
+        if intent not in VALID_INTENTS:
+            raise ValueError(f"잘못된 intent: {intent}")
+        log_llm_label(client, user_message, intent, has_previous_results)
+        if intent not in PLAN_INTENTS:
+            return intent, None
+        if not isinstance(plan, dict) or not REQUIRED_KEYS.issubset(plan.keys()):
+            raise ValueError("plan 필수 키 누락")
+        return intent, _normalize_plan(plan, intent)
+
+    except Exception as e:
+        logger.warning("통합 분류/변환 실패, 2단계 호출로 대체: %s", e)
+
+    intent = classify_intent_with_llm(client, user_message, has_previous_results=has_previous_results)
+    if intent not in PLAN_INTENTS:
+        return intent, None
+    return intent, translate_plan(client, user_message, intent, last_plan if intent == "refine" else None)
+
+
+def classify_and_translate(
+    client: GeminiClient,
+    user_message: str,
+    has_previous_results: bool = False,
+    last_plan: Dict[str, Any] = None
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    한 턴의 의도와 plan 결정
+
+    - 규칙 확신도가 높으면: 규칙 의도 + (필요 시) translate_plan 1회
+    - 애매하면: route_and_translate 통합 호출 1회
+    - LLM 서킷 브레이커가 열려 있으면: 규칙 의도 + 기본 plan (LLM 호출 없음)
+
+    Returns:
+        (의도, plan) - recommend/refine이 아니면 plan은 None
+    """
+    with timed("intent_rule"):
+        intent, confidence = route_intent_with_confidence(user_message, has_previous_results)
+
+    if confidence >= CONFIDENCE_THRESHOLD or not client.is_available():
+        if intent not in PLAN_INTENTS:
+            return intent, None
+        with timed("translate_plan"):
+            return intent, translate_plan(client, user_message, intent, last_plan if intent == "refine" else None)
+
+    with timed("route_and_translate"):
+        return route_and_translate(client, user_message, has_previous_results, last_plan)
+
+
+def _normalize_plan(plan: Dict[str, Any], intent: str) -> Dict[str, Any]:
+    """plan 기본값 채우기 및 길이 제한"""
     # 안전장치: intent 강제
     plan["intent"] = intent
     
@@ -53,6 +168,7 @@ def translate_plan(
     plan["clarifying_questions"] = (plan.get("clarifying_questions") or [])[:2]
     plan["unavailable_needs"] = plan.get("unavailable_needs") or []
     plan["notes_for_ui"] = plan.get("notes_for_ui") or ""
+    plan["keywords"] = [str(k) for k in (plan.get("keywords") or [])][:5]
     
     # constraints 기본값
     if not plan.get("constraints"):
@@ -65,8 +181,11 @@ def translate_plan(
     return plan
 
 
-def _fallback_plan(intent: str) -> Dict[str, Any]:
-    """파싱 실패 시 기본 플랜 반환"""
+def _fallback_plan(
+    intent: str,
+    notes_for_ui: str = "번역 결과를 파싱하지 못해 기본 기준으로 진행합니다."
+) -> Dict[str, Any]:
+    """파싱 실패 또는 LLM 사용 불가 시 기본 플랜 반환"""
     return {
         "intent": intent,
         "cluster_preference": "any",
@@ -81,7 +200,8 @@ def _fallback_plan(intent: str) -> Dict[str, Any]:
             "altitude_max_m": None
         },
         "exclude": {"mountains": [], "trails": []},
+        "keywords": [],
         "unavailable_needs": [],
         "clarifying_questions": [],
-        "notes_for_ui": "번역 결과를 파싱하지 못해 기본 기준으로 진행합니다."
+        "notes_for_ui": notes_for_ui
     }
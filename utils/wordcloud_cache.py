@@ -0,0 +1,180 @@
+# utils/wordcloud_cache.py
+"""
+산별 워드클라우드 이미지 캐시
+
+워드클라우드는 키워드 빈도(JSON)와 렌더링 옵션이 같으면 항상 같은 결과이므로,
+(키워드 데이터 + 옵션) 해시를 키로 WebP 이미지를 디스크에 저장해두고
+페이지에서는 메모리 LRU → 디스크 → 즉석 생성 순서로 가져옵니다.
+한글 폰트가 없으면 글자가 네모로 나오므로 생성하지 않고, 실패는 캐시하지 않습니다.
+
+미리 전체 생성 (배포 전 빌드 단계):
+    python -m utils.wordcloud_cache
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import platform
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+CACHE_DIR = ROOT_DIR / ".cache" / "wordcloud"
+MASK_PATH = ROOT_DIR / "images" / "mountain_mask_back.png"
+KEYWORDS_PATH = ROOT_DIR / "data" / "mountain_keywords.json"
+
+TOP_N = 65
+
+# 렌더링 옵션 (바뀌면 해시가 바뀌어 캐시가 자동으로 무효화됨)
+RENDER_PARAMS = {
+    "background_color": "#ffffff",
+    "width": 1000,
+    "height": 800,
+    "max_words": TOP_N,
+    "prefer_horizontal": 0.9,
+    "collocations": False,
+    "colormap": "gist_earth",
+    "relative_scaling": 0.5,
+    "min_font_size": 12,
+    "random_state": 42,
+}
+WEBP_QUALITY = 85
+
+
+class FontNotFoundError(FileNotFoundError):
+    """워드클라우드를 그릴 한글 폰트가 없음"""
+
+
+def get_font_path() -> Optional[str]:
+    """운영체제별 한글 폰트 경로 (없으면 None)"""
+    if platform.system() == 'Windows':
+        font_path = 'C:/Windows/Fonts/malgun.ttf'
+    elif platform.system() == 'Darwin': # Mac
+        font_path = "/System/Library/Fonts/AppleSDGothicNeo.ttc"
+    else: # Linux (Streamlit Cloud) - packages.txt의 fonts-nanum
+        font_path = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
+
+    if not os.path.exists(font_path):
+        logger.warning("폰트 경로를 찾을 수 없음: %s", font_path)
+        return None
+    return font_path
+
+
+@lru_cache(maxsize=1)
+def _load_mask() -> np.ndarray:
+    return np.array(Image.open(MASK_PATH).convert("RGB"))
+
+
+def top_keywords(freq: Dict[str, float], top_n: int = TOP_N) -> Dict[str, float]:
+    """빈도 상위 top_n개 키워드"""
+    return dict(sorted(freq.items(), key=lambda x: x[1], reverse=True)[:top_n])
+
+
+def keyword_hash(freq_top: Dict[str, float]) -> str:
+    """키워드 빈도 + 렌더링 옵션 기준 캐시 키"""
+    payload = json.dumps(
+        {"freq": freq_top, "params": RENDER_PARAMS, "quality": WEBP_QUALITY},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _cache_path(mountain_name: str, digest: str) -> Path:
+    return CACHE_DIR / f"{mountain_name}_{digest}.webp"
+
+
+def render_wordcloud(freq_top: Dict[str, float], font_path: str) -> bytes:
+    """워드클라우드를 그려 WebP 바이트로 반환"""
+    from wordcloud import WordCloud
+
+    wc = WordCloud(
+        font_path=font_path,
+        mask=_load_mask(),
+        **RENDER_PARAMS,
+    ).generate_from_frequencies(freq_top)
+
+    buf = io.BytesIO()
+    wc.to_image().save(buf, format="WEBP", quality=WEBP_QUALITY, method=6)
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=32)
+def _get_cached(mountain_name: str, digest: str, freq_items: tuple) -> bytes:
+    """
+    메모리 LRU → 디스크 → 즉석 생성 (생성 결과는 디스크에 저장)
+
+    실패는 예외로 알려 lru_cache에 남지 않게 합니다.
+
+    Raises:
+        FontNotFoundError: 캐시가 없고 한글 폰트도 없을 때
+    """
+    path = _cache_path(mountain_name, digest)
+    if path.exists():
+        return path.read_bytes()
+
+    font_path = get_font_path()
+    if font_path is None:
+        raise FontNotFoundError("한글 폰트가 없어 워드클라우드를 생성하지 않음")
+
+    data = render_wordcloud(dict(freq_items), font_path)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+    except OSError as e:
+        # 읽기 전용 배포 환경에서도 메모리 캐시로는 동작
+        logger.warning("워드클라우드 캐시 저장 실패: %s", e)
+    return data
+
+
+def get_wordcloud_image(mountain_name: str, freq: Dict[str, float], top_n: int = TOP_N) -> Optional[bytes]:
+    """
+    산의 워드클라우드 이미지(WebP 바이트) 반환
+
+    Args:
+        mountain_name: 산 이름
+        freq: 키워드 빈도 딕셔너리
+        top_n: 사용할 상위 키워드 수
+
+    Returns:
+        WebP 이미지 바이트, 키워드/폰트가 없으면 None
+    """
+    if not freq:
+        return None
+    freq_top = top_keywords(freq, top_n)
+    try:
+        return _get_cached(mountain_name, keyword_hash(freq_top), tuple(freq_top.items()))
+    except FontNotFoundError:
+        return None
+
+
+def build_all(keywords_path: Path = KEYWORDS_PATH) -> None:
+    """전체 산 워드클라우드를 미리 생성 (이미 있는 것은 건너뜀)"""
+    with open(keywords_path, "r", encoding="utf-8") as f:
+        keywords = json.load(f)
+
+    built = skipped = 0
+    for name, freq in keywords.items():
+        if not freq:
+            continue
+        freq_top = top_keywords(freq)
+        if _cache_path(name, keyword_hash(freq_top)).exists():
+            skipped += 1
+            continue
+        if get_wordcloud_image(name, freq) is not None:
+            built += 1
+
+    print(f"워드클라우드 생성 {built}개, 기존 캐시 사용 {skipped}개 → {CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    build_all()